@@ -1,23 +1,33 @@
 import sys
 import time
 import logging
+import importlib
+import threading
 from io import StringIO
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QLineEdit, QPushButton, QTextBrowser,
                            QLabel, QTextEdit, QMessageBox, QProgressBar, 
                            QFrame, QSizePolicy, QTabWidget, QGroupBox, 
                            QGridLayout, QCheckBox, QSlider, QSpinBox,
-                           QSplitter, QScrollArea)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QPropertyAnimation, QEasingCurve
-from PyQt6.QtGui import QFont, QPalette, QColor, QTextCursor, QIcon
+                           QSplitter, QScrollArea, QGraphicsDropShadowEffect,
+                           QPlainTextEdit)
+from PyQt6.QtCore import (Qt, QThread, QObject, QMetaObject, pyqtSignal, pyqtSlot, QTimer,
+                          QRunnable, QThreadPool, QPropertyAnimation, QEasingCurve)
+from PyQt6.QtGui import QFont, QPalette, QColor, QTextCursor, QIcon, QTextCharFormat, QTextFormat
 import markdown2
 import json
+import html
+import numpy as np
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from types import SimpleNamespace
+from styles import GLOBAL_QSS, WARNING_DIALOG_QSS, ERROR_DIALOG_QSS, REPORT_CSS
 
 # 导入股票分析器并智能识别版本
 try:
-    # 导入分析器（支持多种可能的类名）
-    from stock_analyzer import *
+    # 导入分析器模块（不使用通配符导入，避免污染本模块命名空间）
+    _analyzer_module = importlib.import_module('stock_analyzer')
     
     # 智能识别分析器类和版本
     ANALYZER_CLASS = None
@@ -31,13 +41,12 @@ try:
     ]
     
     for class_name, version in possible_classes:
-        try:
-            ANALYZER_CLASS = globals()[class_name]
+        cls = getattr(_analyzer_module, class_name, None)
+        if cls is not None:
+            ANALYZER_CLASS = cls
             ANALYZER_VERSION = version
             print(f"✅ 成功导入分析器: {class_name}")
             break
-        except KeyError:
-            continue
     
     if ANALYZER_CLASS is None:
         raise ImportError("未找到合适的分析器类")
@@ -51,45 +60,197 @@ except ImportError:
     print("   - StockAnalyzer (基础版)")
     sys.exit(1)
 
+# 分析器类名与版本标识只计算一次，报告/导出/设置对话框直接复用
+_ANALYZER_CLASS_NAME = ANALYZER_CLASS.__name__
+_ANALYZER_TAG = f"{ANALYZER_VERSION} | {_ANALYZER_CLASS_NAME}"
+
+# 分析器功能探测表：(功能层级, 方法名)
+_FEATURE_METHODS = (
+    ('enhanced', 'get_comprehensive_fundamental_data'),
+    ('enhanced', 'get_comprehensive_news_data'),
+    ('enhanced', 'calculate_advanced_sentiment_analysis'),
+    ('enhanced', '_calculate_core_financial_indicators'),
+    ('standard', 'get_fundamental_data'),
+    ('standard', 'get_news_data'),
+    ('standard', 'calculate_news_sentiment'),
+    ('standard', 'get_sentiment_analysis'),
+    ('basic', 'get_stock_data'),
+    ('basic', 'calculate_technical_indicators'),
+    ('basic', 'analyze_stock'),
+)
+
+# 需要探测的其他属性
+_PROBED_ATTRIBUTES = ('analysis_params', 'api_keys', 'set_streaming_config')
+
+def probe_analyzer_capabilities(analyzer):
+    """一次性探测分析器支持的功能，返回布尔标志集合"""
+    names = [method for _, method in _FEATURE_METHODS] + list(_PROBED_ATTRIBUTES)
+    available = frozenset(name for name in names if hasattr(analyzer, name))
+    return SimpleNamespace(
+        available=available,
+        has_streaming='set_streaming_config' in available,
+        has_comprehensive_fund='get_comprehensive_fundamental_data' in available,
+        has_comprehensive_news='get_comprehensive_news_data' in available,
+        has_advanced_sentiment='calculate_advanced_sentiment_analysis' in available,
+        has_api_keys='api_keys' in available,
+        has_analysis_params='analysis_params' in available,
+    )
+
+# Markdown转换器只创建一次，扩展语法的正则不必每次渲染都重新编译
+_MD = markdown2.Markdown(extras=['tables', 'fenced-code-blocks'])
+
+# 报告中的四个评分维度（批量汇总矩阵的列顺序）
+_SCORE_KEYS = ('comprehensive', 'technical', 'fundamental', 'sentiment')
+
+# 分档表：升序排列的下限（含）及对应的 len(下限)+1 个档位名称
+_RATING_TIERS = ((40, 60, 80), ('较差', '一般', '良好', '优秀'))
+_FINANCIAL_TIERS = ((10, 15, 20), ('需改善', '一般', '良好', '优秀'))
+_NEWS_TIERS = ((10, 20, 50), ('稀少', '一般', '充足', '丰富'))
+
+def _tier(value, tiers):
+    """在分档表中二分查找value所在的档位"""
+    thresholds, labels = tiers
+    return labels[bisect_right(thresholds, value)]
+
+def _rate(score):
+    """评分评级"""
+    return _tier(score, _RATING_TIERS)
+
+def _financial_tier(count):
+    """财务指标数量评估"""
+    return _tier(count, _FINANCIAL_TIERS)
+
+def _news_tier(count):
+    """新闻数据量评估"""
+    return _tier(count, _NEWS_TIERS)
+
+def _rsi_state(rsi):
+    """RSI所处区间（30-70为正常）"""
+    if rsi > 70:
+        return '超买'
+    if rsi < 30:
+        return '超卖'
+    return '正常'
+
+def _bb_position_state(position):
+    """布林带位置描述"""
+    if position > 0.8:
+        return '上轨附近'
+    if position < 0.2:
+        return '下轨附近'
+    return '中位运行'
+
+def _build_summary_html(ranked):
+    """直接生成批量汇总表格的HTML（结构化数据无需再经Markdown解析）"""
+    esc = html.escape
+    parts = [f"<p><b>分析数量：</b> {len(ranked)} 只股票</p>",
+             "<h2>📋 分析汇总</h2>",
+             '<table class="summary"><tr>'
+             "<th>排名</th><th>股票代码</th><th>股票名称</th><th>综合得分</th>"
+             "<th>技术面</th><th>基本面</th><th>情绪面</th><th>投资建议</th></tr>"]
+    for i, rec in enumerate(ranked, 1):
+        scores = rec['scores']
+        parts.append(f"<tr><td>{i}</td><td>{esc(rec['stock_code'])}</td>"
+                     f"<td>{esc(rec.get('stock_name', rec['stock_code']))}</td>"
+                     f"<td>{scores['comprehensive']:.1f}</td><td>{scores['technical']:.1f}</td>"
+                     f"<td>{scores['fundamental']:.1f}</td><td>{scores['sentiment']:.1f}</td>"
+                     f"<td>{esc(rec['recommendation'])}</td></tr>")
+    parts.append("</table>")
+    return "".join(parts)
+
 class LogHandler(logging.Handler):
-    """自定义日志处理器，将日志输出到GUI"""
-    def __init__(self, log_signal):
-        super().__init__()
-        self.log_signal = log_signal
-        
+    """自定义日志处理器，将日志批量输出到GUI"""
+    # 日志缓冲区的最长冲刷间隔（毫秒）
+    FLUSH_INTERVAL_MS = 50
+
+    def __init__(self, log_batch_signal, parent=None, level=logging.INFO):
+        # 低于level的记录在Logger.callHandlers中即被丢弃，不会进入format
+        super().__init__(level)
+        self.log_batch_signal = log_batch_signal
+        # 信号所属的对象，用于检查是否有槽函数连接到该信号
+        self._signal_owner = parent
+        self._buf = []
+        self._buf_lock = threading.Lock()
+        self._scheduled = False
+        # 冲刷器驻留在GUI线程，由它启动定时器
+        self._flusher = _LogFlusher(self, parent)
+        
+    def _has_subscriber(self):
+        """日志信号是否已连接到槽函数（无法确定时按已连接处理）"""
+        owner = self._signal_owner
+        return owner is None or owner.receivers(self.log_batch_signal) > 0
+
     def emit(self, record):
         try:
+            # 没有界面订阅日志时不格式化、不缓冲
+            if not self._has_subscriber():
+                return
             msg = self.format(record)
             # 根据日志级别确定颜色
-            if record.levelno >= logging.ERROR:
+            levelno = record.levelno
+            if levelno >= logging.ERROR:
                 log_type = "error"
-            elif record.levelno >= logging.WARNING:
+            elif levelno >= logging.WARNING:
                 log_type = "warning"
-            elif "✓" in msg:
-                log_type = "success"
-            elif "正在" in msg or "开始" in msg:
-                log_type = "info"
             else:
-                log_type = "normal"
+                # 只有INFO及以下级别需要按内容区分，且只扫描消息正文而非整行
+                text = record.message
+                if "✓" in text:
+                    log_type = "success"
+                elif "正在" in text or "开始" in text:
+                    log_type = "info"
+                else:
+                    log_type = "normal"
             
-            self.log_signal.emit(msg, log_type)
+            with self._buf_lock:
+                self._buf.append((msg, log_type))
+                if self._scheduled:
+                    return
+                self._scheduled = True
+            QMetaObject.invokeMethod(self._flusher, "schedule", Qt.ConnectionType.QueuedConnection)
         except Exception:
             pass
 
+    def flush(self):
+        """立即把缓冲区中的日志发送到GUI"""
+        # 在锁内发送，保证多个线程同时冲刷时各批日志的先后顺序不被打乱
+        with self._buf_lock:
+            items, self._buf = self._buf, []
+            self._scheduled = False
+            if items:
+                try:
+                    self.log_batch_signal.emit(items)
+                except Exception:
+                    pass
+
+class _LogFlusher(QObject):
+    """在GUI线程中定时冲刷LogHandler的缓冲区"""
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self._handler = handler
+
+    @pyqtSlot()
+    def schedule(self):
+        QTimer.singleShot(LogHandler.FLUSH_INTERVAL_MS, self.flush)
+
+    @pyqtSlot()
+    def flush(self):
+        self._handler.flush()
+
 class ModernFrame(QFrame):
     """现代化的面板组件"""
     def __init__(self, parent=None, elevated=False):
         super().__init__(parent)
         self.setFrameStyle(QFrame.Shape.StyledPanel | QFrame.Shadow.Raised)
-        shadow_style = "0 4px 8px rgba(0,0,0,0.1)" if elevated else "0 2px 4px rgba(0,0,0,0.05)"
-        self.setStyleSheet(f"""
-            ModernFrame {{
-                background-color: #ffffff;
-                border-radius: 12px;
-                border: 1px solid #e3f2fd;
-                box-shadow: {shadow_style};
-            }}
-        """)
+        self.setProperty("elevated", elevated)
+        
+        # Qt样式表不支持box-shadow，仅对需要突出的面板使用阴影效果
+        if elevated:
+            shadow = QGraphicsDropShadowEffect(self)
+            shadow.setBlurRadius(16)
+            shadow.setOffset(0, 4)
+            shadow.setColor(QColor(0, 0, 0, 25))
+            self.setGraphicsEffect(shadow)
 
 class ModernButton(QPushButton):
     """现代化的按钮组件"""
@@ -97,184 +258,109 @@ class ModernButton(QPushButton):
         super().__init__(text, parent)
         self.setMinimumHeight(44)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
-        
-        if button_type == "primary":
-            self.setStyleSheet("""
-                QPushButton {
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 12px 24px;
-                    font-weight: 600;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background: linear-gradient(135deg, #5a6fd8 0%, #6a4190 100%);
-                    transform: translateY(-1px);
-                }
-                QPushButton:pressed {
-                    background: linear-gradient(135deg, #4e5bc6 0%, #5e377e 100%);
-                    transform: translateY(0px);
-                }
-                QPushButton:disabled {
-                    background: #cccccc;
-                    color: #666666;
-                }
-            """)
-        elif button_type == "secondary":
-            self.setStyleSheet("""
-                QPushButton {
-                    background-color: #f8f9fa;
-                    color: #495057;
-                    border: 2px solid #e9ecef;
-                    border-radius: 8px;
-                    padding: 12px 24px;
-                    font-weight: 600;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background-color: #e9ecef;
-                    border-color: #adb5bd;
-                    color: #212529;
-                }
-                QPushButton:pressed {
-                    background-color: #dee2e6;
-                }
-                QPushButton:disabled {
-                    color: #6c757d;
-                    border-color: #dee2e6;
-                }
-            """)
-        elif button_type == "success":
-            self.setStyleSheet("""
-                QPushButton {
-                    background: linear-gradient(135deg, #56ab2f 0%, #a8e6cf 100%);
-                    color: white;
-                    border: none;
-                    border-radius: 8px;
-                    padding: 12px 24px;
-                    font-weight: 600;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background: linear-gradient(135deg, #4e9a2a 0%, #96d4b5 100%);
-                }
-            """)
+        # 样式由全局样式表 QPushButton#primary / #secondary / #success 提供
+        self.setObjectName(button_type)
 
 class ModernLineEdit(QLineEdit):
     """现代化的输入框组件"""
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(44)
-        self.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                padding: 12px 16px;
-                background-color: white;
-                font-size: 14px;
-                selection-background-color: #cce0ff;
-            }
-            QLineEdit:focus {
-                border-color: #667eea;
-                background-color: #f8f9ff;
-            }
-            QLineEdit:hover {
-                border-color: #adb5bd;
-            }
-        """)
 
 class ModernTextEdit(QTextEdit):
     """现代化的多行文本输入框组件"""
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                padding: 12px;
-                background-color: white;
-                font-size: 14px;
-                selection-background-color: #cce0ff;
-                line-height: 1.5;
-            }
-            QTextEdit:focus {
-                border-color: #667eea;
-                background-color: #f8f9ff;
-            }
-            QTextEdit:hover {
-                border-color: #adb5bd;
-            }
-        """)
 
 class ModernProgressBar(QProgressBar):
     """现代化的进度条组件"""
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet("""
-            QProgressBar {
-                border: none;
-                border-radius: 6px;
-                background-color: #e9ecef;
-                height: 12px;
-                text-align: center;
-                color: #495057;
-                font-weight: 600;
-            }
-            QProgressBar::chunk {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                border-radius: 6px;
-            }
-        """)
 
-class StreamingDisplay(QTextEdit):
-    """流式显示组件，支持彩色日志显示"""
+class StreamingDisplay(QPlainTextEdit):
+    """流式显示组件，支持彩色日志显示（基于QPlainTextEdit，追加开销与已有行数无关）"""
+    # 不同类型日志的前缀
+    _PREFIXES = {
+        "warning": "⚠️ ",
+        "error": "❌ ",
+        "info": "📋 ",
+    }
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                padding: 16px;
-                background-color: #f8f9fa;
-                font-family: 'Consolas', 'Monaco', monospace;
-                font-size: 13px;
-                line-height: 1.4;
-            }
-        """)
         self.setReadOnly(True)
+
+        # 限制日志行数，超出后自动丢弃最早的内容，避免长时间运行时文档无限增长
+        self.setMaximumBlockCount(2000)
+        self.setUndoRedoEnabled(False)
+
+        # 预先构建各类型的字符格式，追加时直接复用，避免逐行解析HTML
+        self._default_fmt = QTextCharFormat()
+        self._fmts = {
+            "header": self._make_format("#667eea", QFont.Weight.Bold, pixel_size=14),
+            "important": self._make_format("#e74c3c", QFont.Weight.Bold),
+            "success": self._make_format("#27ae60", QFont.Weight.Bold),
+            "warning": self._make_format("#f39c12", QFont.Weight.Bold),
+            "error": self._make_format("#e74c3c", QFont.Weight.Bold),
+            "info": self._make_format("#3498db", QFont.Weight.Medium),
+        }
         
+        # 待显示的日志队列，由定时器合并后一次性写入，避免每条日志都触发重绘
+        self._pending = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(40)
+        self._flush_timer.timeout.connect(self._flush)
+
+    @staticmethod
+    def _make_format(color, weight, pixel_size=None):
+        """构建日志字符格式"""
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        fmt.setFontWeight(weight)
+        if pixel_size:
+            fmt.setProperty(QTextFormat.Property.FontPixelSize, pixel_size)
+        return fmt
+        
+    def _insert_line(self, cursor, text, text_type):
+        """按类型格式插入一行文本"""
+        text = self._PREFIXES.get(text_type, "") + text
+        if not text.endswith('\n'):
+            text += '\n'
+        cursor.insertText(text, self._fmts.get(text_type, self._default_fmt))
+
     def append_streaming_text(self, text, text_type="normal"):
         """添加流式文本"""
+        self._pending.append((text, text_type))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def append_batch(self, items):
+        """批量添加日志，items为 (文本, 类型) 列表"""
+        self._pending.extend(items)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush(self):
+        """把队列中的日志一次性写入并滚动到底部，整批只触发一次重绘"""
+        if not self._pending:
+            return
+        items, self._pending = self._pending, []
+        
         cursor = self.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
-        
-        # 根据文本类型设置样式
-        if text_type == "header":
-            cursor.insertHtml(f'<p style="color: #667eea; font-weight: bold; font-size: 14px; margin: 8px 0;">{text}</p>')
-        elif text_type == "important":
-            cursor.insertHtml(f'<span style="color: #e74c3c; font-weight: bold;">{text}</span>')
-        elif text_type == "success":
-            cursor.insertHtml(f'<span style="color: #27ae60; font-weight: bold;">{text}</span>')
-        elif text_type == "warning":
-            cursor.insertHtml(f'<span style="color: #f39c12; font-weight: bold;">⚠️ {text}</span>')
-        elif text_type == "error":
-            cursor.insertHtml(f'<span style="color: #e74c3c; font-weight: bold;">❌ {text}</span>')
-        elif text_type == "info":
-            cursor.insertHtml(f'<span style="color: #3498db; font-weight: 500;">📋 {text}</span>')
-        else:
-            cursor.insertText(text)
-        
-        # 添加换行
-        if not text.endswith('\n'):
-            cursor.insertText('\n')
+        cursor.beginEditBlock()
+        for text, text_type in items:
+            self._insert_line(cursor, text, text_type)
+        cursor.endEditBlock()
         
         # 自动滚动到底部
+        self.setTextCursor(cursor)
         self.ensureCursorVisible()
         
     def clear_log(self):
         """清空日志"""
+        self._pending.clear()
         self.clear()
         self.append_streaming_text("📋 日志已清空", "info")
 
@@ -284,18 +370,22 @@ class AnalysisWorker(QThread):
     error = pyqtSignal(str)
     progress = pyqtSignal(int)
     log_message = pyqtSignal(str, str)  # 日志消息和类型
+    log_batch = pyqtSignal(list)  # 分析器日志批量推送 [(消息, 类型), ...]
 
-    def __init__(self, analyzer, stock_code, enable_streaming=True):
+    def __init__(self, analyzer, stock_code, enable_streaming=True, caps=None):
         super().__init__()
         self.analyzer = analyzer
         self.stock_code = stock_code
         self.enable_streaming = enable_streaming
+        self.caps = caps or probe_analyzer_capabilities(analyzer)
+        
+        # 日志处理器在GUI线程中创建，以便其冲刷定时器运行在GUI线程
+        self.log_handler = LogHandler(self.log_batch, parent=self)
+        self.log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
 
     def run(self):
         try:
-            # 设置日志处理器
-            log_handler = LogHandler(self.log_message)
-            log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            log_handler = self.log_handler
             
             # 添加日志处理器到分析器的logger
             self.analyzer.logger.addHandler(log_handler)
@@ -306,7 +396,7 @@ class AnalysisWorker(QThread):
             self.progress.emit(10)
             
             # 设置流式显示配置（如果分析器支持）
-            if hasattr(self.analyzer, 'set_streaming_config'):
+            if self.caps.has_streaming:
                 if self.enable_streaming:
                     self.analyzer.set_streaming_config(
                         enabled=True,
@@ -317,7 +407,11 @@ class AnalysisWorker(QThread):
             
             # 执行实际分析
             try:
-                report = self.analyzer.analyze_stock(self.stock_code, enable_streaming=False)
+                try:
+                    report = self.analyzer.analyze_stock(self.stock_code, enable_streaming=False)
+                finally:
+                    # 先推送分析过程中缓冲的日志，保证显示顺序
+                    log_handler.flush()
                 self.progress.emit(100)
                 self.log_message.emit("🎉 股票分析完成！", "success")
                 
@@ -356,50 +450,84 @@ class AnalysisWorker(QThread):
             self.error.emit(f"工作线程错误: {str(e)}")
 
 class BatchAnalysisWorker(QThread):
-    """批量分析工作线程"""
+    """批量分析工作线程（内部使用线程池并发分析）"""
     finished = pyqtSignal(list)
     error = pyqtSignal(str)
     progress = pyqtSignal(int)
     current_stock = pyqtSignal(str)
     log_message = pyqtSignal(str, str)  # 日志消息和类型
+    log_batch = pyqtSignal(list)  # 分析器日志批量推送 [(消息, 类型), ...]
+    partial_report = pyqtSignal(dict)  # 单只股票分析完成即推送
 
-    def __init__(self, analyzer, stock_list):
+    def __init__(self, analyzer, stock_list, caps=None, max_workers=4):
         super().__init__()
         self.analyzer = analyzer
         self.stock_list = stock_list
+        self.caps = caps or probe_analyzer_capabilities(analyzer)
+        self.max_workers = max(1, max_workers)
+        # 线程池中正在分析的股票（按提交顺序）
+        self._in_flight = []
+        self._in_flight_lock = threading.Lock()
+        
+        # 日志处理器在GUI线程中创建，以便其冲刷定时器运行在GUI线程
+        self.log_handler = LogHandler(self.log_batch, parent=self)
+        self.log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+    def _analyze_one(self, stock_code):
+        """在线程池中分析单只股票"""
+        with self._in_flight_lock:
+            self._in_flight.append(stock_code)
+            self.current_stock.emit(f"正在分析: {', '.join(self._in_flight)}")
+        self.log_message.emit(f"📈 开始分析股票: {stock_code}", "info")
+        try:
+            return self.analyzer.analyze_stock(stock_code, enable_streaming=False)
+        finally:
+            self.log_handler.flush()
+            with self._in_flight_lock:
+                self._in_flight.remove(stock_code)
 
     def run(self):
         try:
-            # 设置日志处理器
-            log_handler = LogHandler(self.log_message)
-            log_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            # 设置日志处理器（整个线程池共用一个）
+            log_handler = self.log_handler
             self.analyzer.logger.addHandler(log_handler)
             self.analyzer.logger.setLevel(logging.INFO)
             
             results = []
             total = len(self.stock_list)
+            workers = min(self.max_workers, total) or 1
             
-            self.log_message.emit(f"📊 开始批量分析 {total} 只股票", "header")
+            self.log_message.emit(f"📊 开始批量分析 {total} 只股票（{workers} 个并发线程）", "header")
             
             # 设置为非流式模式以提高批量处理效率
-            if hasattr(self.analyzer, 'set_streaming_config'):
+            if self.caps.has_streaming:
                 self.analyzer.set_streaming_config(enabled=False)
             
-            for i, stock_code in enumerate(self.stock_list):
-                try:
-                    self.current_stock.emit(f"正在分析: {stock_code} ({i+1}/{total})")
-                    self.log_message.emit(f"📈 开始分析第 {i+1} 只股票: {stock_code}", "info")
-                    
-                    report = self.analyzer.analyze_stock(stock_code, enable_streaming=False)
-                    results.append(report)
-                    
-                    self.log_message.emit(f"✓ {stock_code} 分析完成，得分: {report['scores']['comprehensive']:.1f}", "success")
-                    self.progress.emit(int((i + 1) / total * 100))
-                    
-                except Exception as e:
-                    self.log_message.emit(f"❌ {stock_code} 分析失败: {str(e)}", "error")
-                    # 继续处理下一只股票
-                    continue
+            # 数据获取以网络I/O为主，多线程并发可显著缩短总耗时
+            done = 0
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._analyze_one, stock_code): (index, stock_code)
+                    for index, stock_code in enumerate(self.stock_list)
+                }
+                for future in as_completed(futures):
+                    index, stock_code = futures[future]
+                    done += 1
+                    try:
+                        report = future.result()
+                        results.append((index, report))
+                        self.partial_report.emit(report)
+                        self.log_message.emit(f"✓ {stock_code} 分析完成，得分: {report['scores']['comprehensive']:.1f}", "success")
+                    except Exception as e:
+                        # 单只股票失败不影响其他股票
+                        self.log_message.emit(f"❌ {stock_code} 分析失败: {str(e)}", "error")
+                    with self._in_flight_lock:
+                        running = f"，正在分析: {', '.join(self._in_flight)}" if self._in_flight else ""
+                    self.current_stock.emit(f"已完成: {done}/{total}{running}")
+                    self.progress.emit(int(done / total * 100))
+            
+            # 按输入顺序返回结果
+            results = [report for _, report in sorted(results, key=lambda item: item[0])]
                 
             self.log_message.emit(f"🎉 批量分析完成！成功分析 {len(results)}/{total} 只股票", "success")
             
@@ -416,29 +544,83 @@ class BatchAnalysisWorker(QThread):
                 pass
             self.error.emit(str(e))
 
+class _ProbeSignals(QObject):
+    """DependencyProbe的信号载体（QRunnable不是QObject）"""
+    log_message = pyqtSignal(str, str)  # 日志消息和类型
+    missing_dependency = pyqtSignal(str, str)  # 对话框标题和内容
+
+class DependencyProbe(QRunnable):
+    """后台检查依赖库及akshare数据源连通性"""
+    def __init__(self):
+        super().__init__()
+        self.signals = _ProbeSignals()
+
+    def run(self):
+        log = self.signals.log_message.emit
+        try:
+            import akshare
+            log(f"✅ akshare {akshare.__version__} 数据源连接正常", "success")
+            
+            # 测试akshare基本功能
+            try:
+                test_data = akshare.tool_trade_date_hist_sina()
+                if not test_data.empty:
+                    log("✅ akshare API测试成功", "success")
+                else:
+                    log("⚠️ akshare API响应为空，可能网络不稳定", "warning")
+            except Exception as e:
+                log(f"⚠️ akshare API测试失败: {str(e)[:50]}...", "warning")
+                
+        except ImportError:
+            log("❌ akshare 未安装，数据获取将受限", "error")
+            self.signals.missing_dependency.emit("依赖缺失", "akshare库未安装，请运行：pip install akshare")
+        
+        try:
+            import jieba
+            log("✅ jieba 中文分词工具就绪", "success")
+        except ImportError:
+            log("⚠️ jieba 未安装，情绪分析将使用简化模式", "warning")
+        
+        try:
+            import pandas as pd
+            import numpy as np
+            log(f"✅ 数据处理库就绪 (pandas {pd.__version__})", "success")
+        except ImportError:
+            log("❌ pandas/numpy 未安装", "error")
+
+class _RenderSignals(QObject):
+    """HtmlRenderJob的信号载体"""
+    rendered = pyqtSignal(str)
+
+class HtmlRenderJob(QRunnable):
+    """在后台线程生成HTML（默认由Markdown转换），setHtml/append仍由GUI线程完成"""
+    def __init__(self, source, render=_MD.convert):
+        super().__init__()
+        self.source = source
+        self.render = render
+        self.signals = _RenderSignals()
+
+    def run(self):
+        self.signals.rendered.emit(self.render(self.source))
+
 class EnhancedScoreCard(QFrame):
     """增强版评分卡片组件"""
+    _BAND_THRESHOLDS = ((80, "excellent"), (60, "good"), (40, "fair"))
+
+    @classmethod
+    def band_for(cls, score):
+        """根据分数确定所属区间"""
+        for threshold, band in cls._BAND_THRESHOLDS:
+            if score >= threshold:
+                return band
+        return "poor"
+
     def __init__(self, title, score, max_score=100, additional_info="", parent=None):
         super().__init__(parent)
         self.setFixedSize(140, 120)
         
-        # 根据分数设置渐变颜色
-        if score >= 80:
-            gradient = "linear-gradient(135deg, #56ab2f 0%, #a8e6cf 100%)"  # 绿色 - 优秀
-        elif score >= 60:
-            gradient = "linear-gradient(135deg, #667eea 0%, #764ba2 100%)"  # 蓝色 - 良好
-        elif score >= 40:
-            gradient = "linear-gradient(135deg, #f093fb 0%, #f5576c 100%)"  # 粉色 - 一般
-        else:
-            gradient = "linear-gradient(135deg, #ff4b2b 0%, #ff416c 100%)"  # 红色 - 较差
-            
-        self.setStyleSheet(f"""
-            QFrame {{
-                background: {gradient};
-                border-radius: 12px;
-                border: none;
-            }}
-        """)
+        # 根据分数选择渐变颜色（全局样式表 EnhancedScoreCard[band=...]）
+        self.setProperty("band", self.band_for(score))
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(12, 12, 12, 12)
@@ -446,98 +628,75 @@ class EnhancedScoreCard(QFrame):
         
         # 标题
         title_label = QLabel(title)
-        title_label.setStyleSheet("""
-            QLabel {
-                color: white;
-                font-size: 12px;
-                font-weight: 600;
-                background: transparent;
-            }
-        """)
+        title_label.setObjectName("card_title")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
         
         # 分数
-        score_label = QLabel(f"{score:.1f}")
-        score_label.setStyleSheet("""
-            QLabel {
-                color: white;
-                font-size: 24px;
-                font-weight: bold;
-                background: transparent;
-            }
-        """)
-        score_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(score_label)
+        self._score = score
+        self.score_label = QLabel(f"{score:.1f}")
+        self.score_label.setObjectName("card_score")
+        self.score_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.score_label)
         
         # 满分标识
         max_label = QLabel(f"/{max_score}")
-        max_label.setStyleSheet("""
-            QLabel {
-                color: rgba(255,255,255,0.8);
-                font-size: 10px;
-                background: transparent;
-            }
-        """)
+        max_label.setObjectName("card_max")
         max_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(max_label)
         
         # 附加信息
-        if additional_info:
-            info_label = QLabel(additional_info)
-            info_label.setStyleSheet("""
-                QLabel {
-                    color: rgba(255,255,255,0.9);
-                    font-size: 9px;
-                    background: transparent;
-                }
-            """)
-            info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            info_label.setWordWrap(True)
-            layout.addWidget(info_label)
+        self.info_label = QLabel(additional_info)
+        self.info_label.setObjectName("card_info")
+        self.info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.info_label.setWordWrap(True)
+        self.info_label.setVisible(bool(additional_info))
+        layout.addWidget(self.info_label)
+
+    def set_score(self, score, additional_info=""):
+        """更新分数，只改动发生变化的部分"""
+        if score != self._score:
+            self._score = score
+            self.score_label.setText(f"{score:.1f}")
+            band = self.band_for(score)
+            if band != self.property("band"):
+                # 动态属性变化后需重新polish才能应用新的样式规则
+                self.setProperty("band", band)
+                self.style().unpolish(self)
+                self.style().polish(self)
+        if additional_info != self.info_label.text():
+            self.info_label.setText(additional_info)
+            self.info_label.setVisible(bool(additional_info))
 
 class DataQualityIndicator(QFrame):
     """数据质量指示器"""
     def __init__(self, title, value, unit="", parent=None):
         super().__init__(parent)
         self.setFixedSize(100, 60)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: rgba(255,255,255,0.9);
-                border-radius: 8px;
-                border: 1px solid #e9ecef;
-            }
-        """)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(8, 8, 8, 8)
         layout.setSpacing(2)
         
         # 数值
-        value_label = QLabel(f"{value}{unit}")
-        value_label.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                font-size: 16px;
-                font-weight: bold;
-                background: transparent;
-            }
-        """)
-        value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(value_label)
+        self.unit = unit
+        self.value_label = QLabel(f"{value}{unit}")
+        self.value_label.setObjectName("indicator_value")
+        self.value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.value_label)
         
         # 标题
         title_label = QLabel(title)
-        title_label.setStyleSheet("""
-            QLabel {
-                color: #6c757d;
-                font-size: 10px;
-                background: transparent;
-            }
-        """)
+        title_label.setObjectName("indicator_title")
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title_label)
 
+    def set_value(self, value):
+        """更新数值"""
+        text = f"{value}{self.unit}"
+        if text != self.value_label.text():
+            self.value_label.setText(text)
+
 class ModernStockAnalyzerGUI(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -545,6 +704,13 @@ class ModernStockAnalyzerGUI(QMainWindow):
         # 初始化日志显示（会在init_ui中创建）
         self.log_display = None
         
+        # 全局样式表只设置一次，各组件通过选择器匹配
+        QApplication.instance().setStyleSheet(GLOBAL_QSS)
+        
+        # 报告渲染线程池只用一个线程：结果按提交顺序返回，共享的_MD也不会被并发调用
+        self._render_pool = QThreadPool(self)
+        self._render_pool.setMaxThreadCount(1)
+        
         # 初始化UI
         self.init_ui()
         self.adjust_size_and_position()
@@ -560,6 +726,9 @@ class ModernStockAnalyzerGUI(QMainWindow):
             # 创建分析器实例
             self.analyzer = ANALYZER_CLASS()
             
+            # 一次性探测分析器功能，后续直接读取标志
+            self.caps = probe_analyzer_capabilities(self.analyzer)
+            
             # 智能检测分析器功能水平
             detected_features = self.detect_analyzer_features()
             actual_version = self.determine_actual_version(detected_features)
@@ -568,16 +737,20 @@ class ModernStockAnalyzerGUI(QMainWindow):
             self.log_display.append_streaming_text(f"🔍 检测到功能: {', '.join(detected_features)}", "info")
             
             # 更新全局版本变量和界面
-            global ANALYZER_VERSION
+            global ANALYZER_VERSION, _ANALYZER_TAG
             ANALYZER_VERSION = actual_version
+            _ANALYZER_TAG = f"{ANALYZER_VERSION} | {_ANALYZER_CLASS_NAME}"
+            
+            # 分析器功能在会话内不会变化，配置对话框文本只生成一次
+            self._config_dialog_msg = self._build_config_msg(detected_features)
             
             # 更新界面标题
             self.update_title_version(actual_version)
             
             self.log_display.append_streaming_text("📊 正在检查系统环境...", "info")
             
-            # 检查依赖
-            self.check_dependencies()
+            # 检查依赖（窗口显示后在后台执行，结果通过日志返回）
+            QTimer.singleShot(0, self.check_dependencies)
             
             # 检查分析器特定功能
             self.check_analyzer_capabilities()
@@ -611,53 +784,33 @@ class ModernStockAnalyzerGUI(QMainWindow):
     def detect_analyzer_features(self):
         """智能检测分析器功能"""
         features = []
+        caps = self.caps
         
-        # 检测增强版功能
-        enhanced_methods = [
-            'get_comprehensive_fundamental_data',
-            'get_comprehensive_news_data',
-            'calculate_advanced_sentiment_analysis',
-            '_calculate_core_financial_indicators'
-        ]
+        # 统计增强版 / 标准版 / 基础功能的方法数量
+        counts = {'enhanced': 0, 'standard': 0, 'basic': 0}
+        for tier, method in _FEATURE_METHODS:
+            if method in caps.available:
+                counts[tier] += 1
         
-        # 检测标准版功能
-        standard_methods = [
-            'get_fundamental_data',
-            'get_news_data',
-            'calculate_news_sentiment',
-            'get_sentiment_analysis'
-        ]
-        
-        # 检测基础功能
-        basic_methods = [
-            'get_stock_data',
-            'calculate_technical_indicators',
-            'analyze_stock'
-        ]
-        
-        enhanced_count = sum(1 for method in enhanced_methods if hasattr(self.analyzer, method))
-        standard_count = sum(1 for method in standard_methods if hasattr(self.analyzer, method))
-        basic_count = sum(1 for method in basic_methods if hasattr(self.analyzer, method))
-        
-        if enhanced_count >= 3:
+        if counts['enhanced'] >= 3:
             features.append("增强版功能")
-        elif standard_count >= 3:
+        elif counts['standard'] >= 3:
             features.append("标准版功能")
-        elif basic_count >= 2:
+        elif counts['basic'] >= 2:
             features.append("基础功能")
         
         # 检测特定功能
-        if hasattr(self.analyzer, 'analysis_params'):
+        if caps.has_analysis_params:
             params = self.analyzer.analysis_params
             if params.get('financial_indicators_count', 0) >= 20:
                 features.append("25项财务指标")
             if params.get('max_news_count', 0) >= 100:
                 features.append("综合新闻分析")
         
-        if hasattr(self.analyzer, 'api_keys'):
+        if caps.has_api_keys:
             features.append("AI分析支持")
             
-        if hasattr(self.analyzer, 'set_streaming_config'):
+        if caps.has_streaming:
             features.append("流式推理")
             
         return features
@@ -676,52 +829,29 @@ class ModernStockAnalyzerGUI(QMainWindow):
             return "Custom Version"
 
     def check_dependencies(self):
-        """检查依赖库"""
-        try:
-            import akshare
-            self.log_display.append_streaming_text(f"✅ akshare {akshare.__version__} 数据源连接正常", "success")
-            
-            # 测试akshare基本功能
-            try:
-                test_data = akshare.tool_trade_date_hist_sina()
-                if not test_data.empty:
-                    self.log_display.append_streaming_text("✅ akshare API测试成功", "success")
-                else:
-                    self.log_display.append_streaming_text("⚠️ akshare API响应为空，可能网络不稳定", "warning")
-            except Exception as e:
-                self.log_display.append_streaming_text(f"⚠️ akshare API测试失败: {str(e)[:50]}...", "warning")
-                
-        except ImportError:
-            self.log_display.append_streaming_text("❌ akshare 未安装，数据获取将受限", "error")
-            QMessageBox.warning(self, "依赖缺失", "akshare库未安装，请运行：pip install akshare")
-        
-        try:
-            import jieba
-            self.log_display.append_streaming_text("✅ jieba 中文分词工具就绪", "success")
-        except ImportError:
-            self.log_display.append_streaming_text("⚠️ jieba 未安装，情绪分析将使用简化模式", "warning")
-        
-        try:
-            import pandas as pd
-            import numpy as np
-            self.log_display.append_streaming_text(f"✅ 数据处理库就绪 (pandas {pd.__version__})", "success")
-        except ImportError:
-            self.log_display.append_streaming_text("❌ pandas/numpy 未安装", "error")
+        """检查依赖库（在后台线程执行，避免网络请求阻塞界面）"""
+        self._dep_probe = DependencyProbe()
+        self._dep_probe.signals.log_message.connect(self.log_display.append_streaming_text)
+        self._dep_probe.signals.missing_dependency.connect(
+            lambda title, message: QMessageBox.warning(self, title, message))
+        QThreadPool.globalInstance().start(self._dep_probe)
 
     def check_analyzer_capabilities(self):
         """检查分析器特定功能"""
+        caps = self.caps
+        
         # 检查增强版功能
-        if hasattr(self.analyzer, 'get_comprehensive_fundamental_data'):
+        if caps.has_comprehensive_fund:
             self.log_display.append_streaming_text("✅ 25项财务指标分析功能就绪", "success")
         
-        if hasattr(self.analyzer, 'get_comprehensive_news_data'):
+        if caps.has_comprehensive_news:
             self.log_display.append_streaming_text("✅ 综合新闻数据获取功能就绪", "success")
         
-        if hasattr(self.analyzer, 'calculate_advanced_sentiment_analysis'):
+        if caps.has_advanced_sentiment:
             self.log_display.append_streaming_text("✅ 高级情绪分析功能就绪", "success")
         
         # 检查AI配置
-        if hasattr(self.analyzer, 'api_keys'):
+        if caps.has_api_keys:
             ai_available = any(key.strip() for key in self.analyzer.api_keys.values() if isinstance(key, str))
             if ai_available:
                 self.log_display.append_streaming_text("✅ AI分析功能已配置", "success")
@@ -729,7 +859,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
                 self.log_display.append_streaming_text("ℹ️ 未配置AI API，将使用内置高级分析", "info")
         
         # 显示配置信息
-        if hasattr(self.analyzer, 'analysis_params'):
+        if caps.has_analysis_params:
             params = self.analyzer.analysis_params
             financial_count = params.get('financial_indicators_count', 'N/A')
             news_count = params.get('max_news_count', 'N/A')
@@ -748,7 +878,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
         
         available_methods = []
         for method, description in method_compatibility.items():
-            if hasattr(self.analyzer, method):
+            if method in caps.available:
                 available_methods.append(description)
         
         if available_methods:
@@ -772,11 +902,6 @@ class ModernStockAnalyzerGUI(QMainWindow):
 
     def init_ui(self):
         self.setWindowTitle('现代股票分析系统 - 加载中...')
-        self.setStyleSheet("""
-            QMainWindow {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            }
-        """)
 
         # 创建中央部件和主布局
         central_widget = QWidget()
@@ -812,27 +937,14 @@ class ModernStockAnalyzerGUI(QMainWindow):
         layout.setContentsMargins(24, 16, 24, 16)
         
         title_label = QLabel('🚀 现代股票分析系统')
-        title_label.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                font-size: 26px;
-                font-weight: bold;
-                background: transparent;
-            }
-        """)
+        title_label.setObjectName("app_title")
         layout.addWidget(title_label)
         
         layout.addStretch()
         
         # 版本信息（动态更新）
-        self.version_label = QLabel(f"基于{ANALYZER_CLASS.__name__}")
-        self.version_label.setStyleSheet("""
-            QLabel {
-                color: #6c757d;
-                font-size: 12px;
-                background: transparent;
-            }
-        """)
+        self.version_label = QLabel(f"基于{_ANALYZER_CLASS_NAME}")
+        self.version_label.setObjectName("version_label")
         layout.addWidget(self.version_label)
         
         # 配置按钮
@@ -845,7 +957,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
     def update_title_version(self, version):
         """更新标题栏版本信息"""
         if hasattr(self, 'version_label'):
-            self.version_label.setText(f"{version} | {ANALYZER_CLASS.__name__}")
+            self.version_label.setText(f"{version} | {_ANALYZER_CLASS_NAME}")
             self.setWindowTitle(f'现代股票分析系统 - {version}')
 
     def create_input_section(self):
@@ -856,37 +968,18 @@ class ModernStockAnalyzerGUI(QMainWindow):
         
         # 创建标签页
         tab_widget = QTabWidget()
-        tab_widget.setStyleSheet("""
-            QTabWidget::pane {
-                border: none;
-                background-color: white;
-                border-radius: 8px;
-            }
-            QTabBar::tab {
-                background: #f8f9fa;
-                border: 1px solid #dee2e6;
-                padding: 12px 24px;
-                margin: 2px;
-                border-radius: 6px;
-                font-weight: 600;
-            }
-            QTabBar::tab:selected {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                border-color: #667eea;
-            }
-            QTabBar::tab:hover {
-                background: #e9ecef;
-            }
-        """)
+        tab_widget.setObjectName("input_tabs")
         
         # 单只股票分析标签页
         single_tab = self.create_single_stock_tab()
         tab_widget.addTab(single_tab, "📈 单只分析")
         
-        # 批量分析标签页
-        batch_tab = self.create_batch_stock_tab()
-        tab_widget.addTab(batch_tab, "📊 批量分析")
+        # 批量分析标签页：先放空容器，首次切换到该页时再创建内容
+        self._batch_tab_container = QWidget()
+        QVBoxLayout(self._batch_tab_container).setContentsMargins(0, 0, 0, 0)
+        self._batch_tab_built = False
+        tab_widget.addTab(self._batch_tab_container, "📊 批量分析")
+        tab_widget.currentChanged.connect(self._on_input_tab_changed)
         
         layout.addWidget(tab_widget)
         
@@ -898,14 +991,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
         # 日志标题和控制按钮
         log_header = QHBoxLayout()
         log_label = QLabel('📋 分析日志')
-        log_label.setStyleSheet("""
-            QLabel {
-                color: #495057;
-                font-size: 16px;
-                font-weight: bold;
-                background: transparent;
-            }
-        """)
+        log_label.setObjectName("log_title")
         log_header.addWidget(log_label)
         log_header.addStretch()
         
@@ -936,23 +1022,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
 
         # 股票代码输入
         input_group = QGroupBox("股票代码")
-        input_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                color: #495057;
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                margin-top: 12px;
-                padding-top: 12px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 12px;
-                padding: 0 8px 0 8px;
-                background-color: white;
-            }
-        """)
+        input_group.setProperty("role", "input")
         input_layout = QVBoxLayout(input_group)
         
         self.single_stock_input = ModernLineEdit()
@@ -963,28 +1033,12 @@ class ModernStockAnalyzerGUI(QMainWindow):
 
         # 分析选项
         options_group = QGroupBox("分析选项")
-        options_group.setStyleSheet(input_group.styleSheet())
+        options_group.setProperty("role", "input")
         options_layout = QVBoxLayout(options_group)
         
         self.enable_streaming_cb = QCheckBox("启用流式推理显示")
         self.enable_streaming_cb.setChecked(True)
-        self.enable_streaming_cb.setStyleSheet("""
-            QCheckBox {
-                font-size: 14px;
-                color: #495057;
-                spacing: 8px;
-            }
-            QCheckBox::indicator {
-                width: 18px;
-                height: 18px;
-                border-radius: 3px;
-                border: 2px solid #adb5bd;
-            }
-            QCheckBox::indicator:checked {
-                background-color: #667eea;
-                border-color: #667eea;
-            }
-        """)
+        self.enable_streaming_cb.setObjectName("enable_streaming_cb")
         options_layout.addWidget(self.enable_streaming_cb)
         
         layout.addWidget(options_group)
@@ -1002,6 +1056,12 @@ class ModernStockAnalyzerGUI(QMainWindow):
         layout.addStretch()
         return widget
 
+    def _on_input_tab_changed(self, index):
+        """首次切换到批量分析页时创建其内容"""
+        if index == 1 and not self._batch_tab_built:
+            self._batch_tab_built = True
+            self._batch_tab_container.layout().addWidget(self.create_batch_stock_tab())
+
     def create_batch_stock_tab(self):
         """创建批量分析标签页"""
         widget = QWidget()
@@ -1011,23 +1071,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
 
         # 股票代码输入
         input_group = QGroupBox("股票代码列表")
-        input_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                font-size: 14px;
-                color: #495057;
-                border: 2px solid #e9ecef;
-                border-radius: 8px;
-                margin-top: 12px;
-                padding-top: 12px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 12px;
-                padding: 0 8px 0 8px;
-                background-color: white;
-            }
-        """)
+        input_group.setProperty("role", "input")
         input_layout = QVBoxLayout(input_group)
         
         self.batch_stock_input = ModernTextEdit()
@@ -1037,6 +1081,28 @@ class ModernStockAnalyzerGUI(QMainWindow):
         
         layout.addWidget(input_group)
 
+        # 并发设置
+        options_group = QGroupBox("并发设置")
+        options_group.setProperty("role", "input")
+        options_layout = QHBoxLayout(options_group)
+        
+        workers_label = QLabel("并发线程数")
+        options_layout.addWidget(workers_label)
+        
+        self.batch_workers_spin = QSpinBox()
+        self.batch_workers_spin.setRange(1, 16)
+        # 默认值取分析器配置 analysis_params.concurrency，与命令行批量分析一致
+        workers = 4
+        params = getattr(getattr(self, 'analyzer', None), 'analysis_params', None)
+        if isinstance(params, dict):
+            workers = int(params.get('concurrency', workers))
+        self.batch_workers_spin.setValue(workers)
+        self.batch_workers_spin.setToolTip("同时分析的股票数量，可根据数据接口/AI接口的限流情况调整")
+        options_layout.addWidget(self.batch_workers_spin)
+        options_layout.addStretch()
+        
+        layout.addWidget(options_group)
+
         # 批量分析按钮
         self.batch_analyze_btn = ModernButton('📊 批量深度分析', button_type="success")
         self.batch_analyze_btn.clicked.connect(self.analyze_multiple_stocks)
@@ -1049,14 +1115,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
         
         # 当前分析股票显示
         self.current_stock_label = QLabel()
-        self.current_stock_label.setStyleSheet("""
-            QLabel {
-                color: #6c757d;
-                font-size: 12px;
-                font-style: italic;
-                background: transparent;
-            }
-        """)
+        self.current_stock_label.setObjectName("current_stock_label")
         self.current_stock_label.setVisible(False)
         layout.addWidget(self.current_stock_label)
 
@@ -1075,14 +1134,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
         result_title_layout.setContentsMargins(20, 12, 20, 12)
         
         result_label = QLabel('📋 分析结果')
-        result_label.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                font-size: 20px;
-                font-weight: bold;
-                background: transparent;
-            }
-        """)
+        result_label.setObjectName("result_title")
         result_title_layout.addWidget(result_label)
         result_title_layout.addStretch()
         
@@ -1097,6 +1149,16 @@ class ModernStockAnalyzerGUI(QMainWindow):
         self.score_frame = ModernFrame()
         self.score_layout = QHBoxLayout(self.score_frame)
         self.score_layout.setContentsMargins(20, 20, 20, 20)
+        # 评分卡片只创建一次，之后的分析只更新数值
+        self._score_cards = {
+            'comprehensive': EnhancedScoreCard("综合得分", 0),
+            'technical': EnhancedScoreCard("技术分析", 0),
+            'fundamental': EnhancedScoreCard("基本面", 0),
+            'sentiment': EnhancedScoreCard("市场情绪", 0),
+        }
+        for card in self._score_cards.values():
+            self.score_layout.addWidget(card)
+        self.score_layout.addStretch()
         self.score_frame.setVisible(False)
         layout.addWidget(self.score_frame)
         
@@ -1104,22 +1166,26 @@ class ModernStockAnalyzerGUI(QMainWindow):
         self.data_quality_frame = ModernFrame()
         self.data_quality_layout = QHBoxLayout(self.data_quality_frame)
         self.data_quality_layout.setContentsMargins(20, 12, 20, 12)
+        quality_label = QLabel('📊 数据质量指标')
+        quality_label.setObjectName("quality_title")
+        self.data_quality_layout.addWidget(quality_label)
+        self._quality_indicators = {
+            'financial': DataQualityIndicator("财务指标", 0, "项"),
+            'news': DataQualityIndicator("新闻数据", 0, "条"),
+            'completeness': DataQualityIndicator("完整度", "", ""),
+        }
+        for indicator in self._quality_indicators.values():
+            self.data_quality_layout.addWidget(indicator)
+        self.data_quality_layout.addStretch()
         self.data_quality_frame.setVisible(False)
         layout.addWidget(self.data_quality_frame)
         
         # 结果显示浏览器
         self.result_browser = QTextBrowser()
         self.result_browser.setOpenExternalLinks(True)
-        self.result_browser.setStyleSheet("""
-            QTextBrowser {
-                border: 2px solid #e9ecef;
-                border-radius: 12px;
-                padding: 20px;
-                background-color: white;
-                font-size: 14px;
-                line-height: 1.6;
-            }
-        """)
+        self.result_browser.setObjectName("result_browser")
+        # 报告内容（富文本）的样式，对之后的setHtml/insertHtml都生效
+        self.result_browser.document().setDefaultStyleSheet(REPORT_CSS)
         layout.addWidget(self.result_browser)
         
         return widget
@@ -1133,7 +1199,14 @@ class ModernStockAnalyzerGUI(QMainWindow):
         financial_count = data_quality.get('financial_indicators_count', 0)
         news_count = report.get('sentiment_analysis', {}).get('total_analyzed', 0)
         
-        md = f"""# 📈 股票分析报告 ({ANALYZER_VERSION})
+        scores = report['scores']
+        technical_rating = _rate(scores['technical'])
+        fundamental_rating = _rate(scores['fundamental'])
+        sentiment_rating = _rate(scores['sentiment'])
+        technical = report['technical_analysis']
+        
+        parts = []
+        parts.append(f"""# 📈 股票分析报告 ({ANALYZER_VERSION})
 
 ## 🏢 基本信息
 | 项目 | 值 |
@@ -1148,58 +1221,58 @@ class ModernStockAnalyzerGUI(QMainWindow):
 
 ## 📊 综合评分
 
-### 🎯 总体评分：{report['scores']['comprehensive']:.1f}/100
+### 🎯 总体评分：{scores['comprehensive']:.1f}/100
 
 | 维度 | 得分 | 权重 | 评级 |
 |------|------|------|------|
-| **技术分析** | {report['scores']['technical']:.1f}/100 | {report['analysis_weights']['technical']*100:.0f}% | {'优秀' if report['scores']['technical'] >= 80 else '良好' if report['scores']['technical'] >= 60 else '一般' if report['scores']['technical'] >= 40 else '较差'} |
-| **基本面分析** | {report['scores']['fundamental']:.1f}/100 | {report['analysis_weights']['fundamental']*100:.0f}% | {'优秀' if report['scores']['fundamental'] >= 80 else '良好' if report['scores']['fundamental'] >= 60 else '一般' if report['scores']['fundamental'] >= 40 else '较差'} |
-| **情绪分析** | {report['scores']['sentiment']:.1f}/100 | {report['analysis_weights']['sentiment']*100:.0f}% | {'优秀' if report['scores']['sentiment'] >= 80 else '良好' if report['scores']['sentiment'] >= 60 else '一般' if report['scores']['sentiment'] >= 40 else '较差'} |
+| **技术分析** | {scores['technical']:.1f}/100 | {report['analysis_weights']['technical']*100:.0f}% | {technical_rating} |
+| **基本面分析** | {scores['fundamental']:.1f}/100 | {report['analysis_weights']['fundamental']*100:.0f}% | {fundamental_rating} |
+| **情绪分析** | {scores['sentiment']:.1f}/100 | {report['analysis_weights']['sentiment']*100:.0f}% | {sentiment_rating} |
 
 ## 📋 数据质量
 | 项目 | 数量 | 质量评估 |
 |------|------|----------|
-| **财务指标** | {financial_count} 项 | {'优秀' if financial_count >= 20 else '良好' if financial_count >= 15 else '一般' if financial_count >= 10 else '需改善'} |
-| **新闻数据** | {news_count} 条 | {'丰富' if news_count >= 50 else '充足' if news_count >= 20 else '一般' if news_count >= 10 else '稀少'} |
+| **财务指标** | {financial_count} 项 | {_financial_tier(financial_count)} |
+| **新闻数据** | {news_count} 条 | {_news_tier(news_count)} |
 | **分析完整度** | - | {data_quality.get('analysis_completeness', '部分')} |
 
 ## 🔧 技术面分析
 | 指标 | 值 | 状态 | 说明 |
 |------|-----|------|------|
-| **均线趋势** | - | {report['technical_analysis']['ma_trend']} | 多头排列看涨，空头排列看跌 |
-| **RSI指标** | {report['technical_analysis']['rsi']:.1f} | {'超买' if report['technical_analysis']['rsi'] > 70 else '超卖' if report['technical_analysis']['rsi'] < 30 else '正常'} | 30-70为正常区间 |
-| **MACD信号** | - | {report['technical_analysis']['macd_signal']} | 金叉看涨，死叉看跌 |
-| **成交量状态** | - | {report['technical_analysis']['volume_status']} | 放量配合价格变动更有效 |
-| **布林带位置** | {report['technical_analysis']['bb_position']:.2f} | {'上轨附近' if report['technical_analysis']['bb_position'] > 0.8 else '下轨附近' if report['technical_analysis']['bb_position'] < 0.2 else '中位运行'} | 上轨阻力，下轨支撑 |
+| **均线趋势** | - | {technical['ma_trend']} | 多头排列看涨，空头排列看跌 |
+| **RSI指标** | {technical['rsi']:.1f} | {_rsi_state(technical['rsi'])} | 30-70为正常区间 |
+| **MACD信号** | - | {technical['macd_signal']} | 金叉看涨，死叉看跌 |
+| **成交量状态** | - | {technical['volume_status']} | 放量配合价格变动更有效 |
+| **布林带位置** | {technical['bb_position']:.2f} | {_bb_position_state(technical['bb_position'])} | 上轨阻力，下轨支撑 |
 
 ## 💰 基本面分析
 
-**基本面得分：{report['scores']['fundamental']:.1f}/100**
+**基本面得分：{scores['fundamental']:.1f}/100**
 
 ### 📈 核心财务指标
-"""
+""")
 
         # 添加财务指标详情（如果有的话）
         fundamental_data = report.get('fundamental_data', {})
         financial_indicators = fundamental_data.get('financial_indicators', {})
         
         if financial_indicators:
-            md += "\n| 指标名称 | 数值 |\n|----------|------|\n"
+            parts.append("\n| 指标名称 | 数值 |\n|----------|------|\n")
             # 显示前10个重要的财务指标
             count = 0
             for key, value in financial_indicators.items():
                 if count >= 10:
                     break
                 if isinstance(value, (int, float)) and value != 0:
-                    md += f"| {key} | {value} |\n"
+                    parts.append(f"| {key} | {value} |\n")
                     count += 1
         else:
-            md += "\n基本面数据包含了公司的财务状况、估值水平、盈利能力等关键指标的综合评估。\n"
+            parts.append("\n基本面数据包含了公司的财务状况、估值水平、盈利能力等关键指标的综合评估。\n")
 
         # 继续添加其他部分
         sentiment_analysis = report.get('sentiment_analysis', {})
         
-        md += f"""
+        parts.append(f"""
 
 ## 📰 市场情绪分析
 
@@ -1212,21 +1285,21 @@ class ModernStockAnalyzerGUI(QMainWindow):
 | **负面新闻比例** | {sentiment_analysis.get('negative_ratio', 0):.1%} | 消极情绪新闻占比 |
 
 ### 📊 新闻数据分布
-"""
+""")
         
         # 添加新闻分布信息
         if 'news_summary' in sentiment_analysis:
             news_summary = sentiment_analysis['news_summary']
-            md += f"""
+            parts.append(f"""
 | 新闻类型 | 数量 |
 |----------|------|
 | 公司新闻 | {news_summary.get('company_news_count', 0)} 条 |
 | 公司公告 | {news_summary.get('announcements_count', 0)} 条 |
 | 研究报告 | {news_summary.get('research_reports_count', 0)} 条 |
 | 行业新闻 | {news_summary.get('industry_news_count', 0)} 条 |
-"""
+""")
 
-        md += f"""
+        parts.append(f"""
 
 ## 🎯 投资建议
 
@@ -1239,10 +1312,10 @@ class ModernStockAnalyzerGUI(QMainWindow):
 ---
 *报告生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*  
 *分析器版本：{ANALYZER_VERSION}*  
-*分析器类：{ANALYZER_CLASS.__name__}*  
+*分析器类：{_ANALYZER_CLASS_NAME}*  
 *数据来源：多维度综合分析*
-"""
-        return md
+""")
+        return "".join(parts)
 
     def clear_log(self):
         """清空日志显示"""
@@ -1261,11 +1334,12 @@ class ModernStockAnalyzerGUI(QMainWindow):
 
         enable_streaming = self.enable_streaming_cb.isChecked()
         
-        self.worker = AnalysisWorker(self.analyzer, stock_code, enable_streaming)
+        self.worker = AnalysisWorker(self.analyzer, stock_code, enable_streaming, caps=self.caps)
         self.worker.finished.connect(self.handle_single_analysis_result)
         self.worker.error.connect(self.handle_analysis_error)
         self.worker.progress.connect(self.progress_bar.setValue)
         self.worker.log_message.connect(self.log_display.append_streaming_text)
+        self.worker.log_batch.connect(self.log_display.append_batch)
         
         self.worker.start()
 
@@ -1285,12 +1359,17 @@ class ModernStockAnalyzerGUI(QMainWindow):
         self.current_stock_label.setVisible(True)
         self.batch_progress_bar.setValue(0)
 
-        self.batch_worker = BatchAnalysisWorker(self.analyzer, stock_list)
+        self.batch_worker = BatchAnalysisWorker(self.analyzer, stock_list, caps=self.caps,
+                                                max_workers=self.batch_workers_spin.value())
         self.batch_worker.finished.connect(self.handle_batch_analysis_result)
         self.batch_worker.error.connect(self.handle_analysis_error)
         self.batch_worker.progress.connect(self.batch_progress_bar.setValue)
         self.batch_worker.current_stock.connect(self.current_stock_label.setText)
         self.batch_worker.log_message.connect(self.log_display.append_streaming_text)
+        self.batch_worker.log_batch.connect(self.log_display.append_batch)
+        self.batch_worker.partial_report.connect(self.handle_batch_partial_report)
+        
+        self.start_batch_report()
         self.batch_worker.start()
 
     def handle_single_analysis_result(self, report):
@@ -1303,8 +1382,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
         
         # 更新结果显示
         markdown_text = self.format_enhanced_report(report)
-        html_content = markdown2.markdown(markdown_text, extras=['tables', 'fenced-code-blocks'])
-        self.result_browser.setHtml(html_content)
+        self.render_markdown(markdown_text, self.result_browser.setHtml)
         
         self.analyze_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
@@ -1312,26 +1390,63 @@ class ModernStockAnalyzerGUI(QMainWindow):
         # 存储最新报告用于导出
         self.latest_report = report
 
+    def render_markdown(self, markdown_text, slot):
+        """后台转换Markdown，完成后在GUI线程以HTML调用slot"""
+        self.render_html(_MD.convert, markdown_text, slot)
+
+    def render_html(self, render, source, slot):
+        """后台调用render(source)生成HTML，完成后在GUI线程调用slot"""
+        job = HtmlRenderJob(source, render)
+        job.signals.rendered.connect(slot)
+        self._render_pool.start(job)
+
+    def start_batch_report(self):
+        """写入批量报告头部，之后每只股票的详细分析逐只追加"""
+        header = (f"# 📊 批量股票分析报告\n\n"
+                  f"**分析时间：** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+                  f"**分析器版本：** {ANALYZER_VERSION}\n\n"
+                  f"**分析器类：** {_ANALYZER_CLASS_NAME}\n\n")
+        self.render_markdown(header, self._show_batch_header)
+        self.render_markdown("## 📈 详细分析\n", self._append_report_section)
+
+    def _show_batch_header(self, html_content):
+        """显示批量报告头部"""
+        self.result_browser.setHtml(html_content)
+        # 记录汇总表格的插入位置（头部之后）
+        self._batch_summary_pos = self.result_browser.document().characterCount() - 1
+
+    def handle_batch_partial_report(self, report):
+        """单只股票分析完成后，仅渲染这一只的报告并追加到结果区"""
+        markdown_text = self.format_enhanced_report(report, False) + "\n---\n"
+        self.render_markdown(markdown_text, self._append_report_section)
+
+    def _append_report_section(self, html_content):
+        """在结果区末尾插入一段HTML：不移动视图，只布局新增的段落"""
+        cursor = QTextCursor(self.result_browser.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        cursor.insertBlock()
+        cursor.insertHtml(html_content)
+        cursor.endEditBlock()
+
     def handle_batch_analysis_result(self, recommendations):
         """处理批量分析结果"""
         if not recommendations:
             self.show_warning('没有成功分析的股票')
             return
             
-        # 计算平均分数
-        avg_scores = {
-            'comprehensive': sum(r['scores']['comprehensive'] for r in recommendations) / len(recommendations),
-            'technical': sum(r['scores']['technical'] for r in recommendations) / len(recommendations),
-            'fundamental': sum(r['scores']['fundamental'] for r in recommendations) / len(recommendations),
-            'sentiment': sum(r['scores']['sentiment'] for r in recommendations) / len(recommendations)
-        }
+        # 评分整理为 (N, 4) 矩阵，按列求平均
+        n = len(recommendations)
+        score_matrix = np.fromiter(
+            (r['scores'][key] for r in recommendations for key in _SCORE_KEYS),
+            dtype=np.float64, count=n * len(_SCORE_KEYS)).reshape(n, len(_SCORE_KEYS))
+        avg_scores = dict(zip(_SCORE_KEYS, score_matrix.mean(axis=0).tolist()))
+        avg_financial = np.mean([r.get('data_quality', {}).get('financial_indicators_count', 0) for r in recommendations])
+        avg_news = np.mean([r.get('sentiment_analysis', {}).get('total_analyzed', 0) for r in recommendations])
         
         self.update_score_cards(avg_scores)
         
         # 更新数据质量指示器（批量）
-        avg_financial = sum(r.get('data_quality', {}).get('financial_indicators_count', 0) for r in recommendations) / len(recommendations)
-        avg_news = sum(r.get('sentiment_analysis', {}).get('total_analyzed', 0) for r in recommendations) / len(recommendations)
-        
         batch_data_quality = {
             'data_quality': {
                 'financial_indicators_count': int(avg_financial),
@@ -1343,30 +1458,10 @@ class ModernStockAnalyzerGUI(QMainWindow):
         }
         self.update_data_quality_indicators(batch_data_quality)
         
-        # 生成批量报告
-        markdown_text = f"# 📊 批量股票分析报告\n\n"
-        markdown_text += f"**分析时间：** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        markdown_text += f"**分析数量：** {len(recommendations)} 只股票\n\n"
-        markdown_text += f"**分析器版本：** {ANALYZER_VERSION}\n\n"
-        markdown_text += f"**分析器类：** {ANALYZER_CLASS.__name__}\n\n"
-        
-        # 添加汇总表格
-        markdown_text += "## 📋 分析汇总\n\n"
-        markdown_text += "| 排名 | 股票代码 | 股票名称 | 综合得分 | 技术面 | 基本面 | 情绪面 | 投资建议 |\n"
-        markdown_text += "|------|----------|----------|----------|--------|--------|--------|----------|\n"
-        
-        for i, rec in enumerate(sorted(recommendations, key=lambda x: x['scores']['comprehensive'], reverse=True), 1):
-            stock_name = rec.get('stock_name', rec['stock_code'])
-            markdown_text += f"| {i} | {rec['stock_code']} | {stock_name} | {rec['scores']['comprehensive']:.1f} | {rec['scores']['technical']:.1f} | {rec['scores']['fundamental']:.1f} | {rec['scores']['sentiment']:.1f} | {rec['recommendation']} |\n"
-        
-        # 添加详细分析
-        markdown_text += "\n## 📈 详细分析\n\n"
-        for rec in recommendations:
-            markdown_text += self.format_enhanced_report(rec, False)
-            markdown_text += "\n---\n\n"
-            
-        html_content = markdown2.markdown(markdown_text, extras=['tables', 'fenced-code-blocks'])
-        self.result_browser.setHtml(html_content)
+        # 在报告头部插入汇总表格（详细分析已在分析过程中逐只追加）
+        # 按综合得分（第0列）降序排名，同分保持原顺序
+        ranked = [recommendations[i] for i in np.argsort(-score_matrix[:, 0], kind='stable')]
+        self.render_html(_build_summary_html, ranked, self._insert_batch_summary)
         
         self.batch_analyze_btn.setEnabled(True)
         self.batch_progress_bar.setVisible(False)
@@ -1375,37 +1470,28 @@ class ModernStockAnalyzerGUI(QMainWindow):
         # 存储最新批量报告用于导出
         self.latest_batch_report = recommendations
 
+    def _insert_batch_summary(self, html_content):
+        """在批量报告头部之后插入汇总表格"""
+        cursor = QTextCursor(self.result_browser.document())
+        cursor.setPosition(self._batch_summary_pos)
+        cursor.insertBlock()
+        cursor.insertHtml(html_content)
+        self.result_browser.moveCursor(QTextCursor.MoveOperation.Start)
+
     def update_score_cards(self, scores):
-        """更新评分卡片"""
-        # 清空现有卡片
-        for i in reversed(range(self.score_layout.count())): 
-            self.score_layout.itemAt(i).widget().setParent(None)
-        
-        # 创建新的增强版评分卡片
-        comprehensive_card = EnhancedScoreCard("综合得分", scores['comprehensive'], 
-                                             additional_info=self.get_score_description(scores['comprehensive']))
-        technical_card = EnhancedScoreCard("技术分析", scores['technical'],
-                                         additional_info=self.get_score_description(scores['technical']))
-        fundamental_card = EnhancedScoreCard("基本面", scores['fundamental'],
-                                           additional_info=self.get_score_description(scores['fundamental']))
-        sentiment_card = EnhancedScoreCard("市场情绪", scores['sentiment'],
-                                         additional_info=self.get_score_description(scores['sentiment']))
-        
-        self.score_layout.addWidget(comprehensive_card)
-        self.score_layout.addWidget(technical_card)
-        self.score_layout.addWidget(fundamental_card)
-        self.score_layout.addWidget(sentiment_card)
-        self.score_layout.addStretch()
+        """更新评分卡片（复用已有卡片，不再重建控件）"""
+        # 暂停重绘，全部卡片更新完后只重绘一次
+        self.score_frame.setUpdatesEnabled(False)
+        try:
+            for key, card in self._score_cards.items():
+                card.set_score(scores[key], additional_info=self.get_score_description(scores[key]))
+        finally:
+            self.score_frame.setUpdatesEnabled(True)
         
         self.score_frame.setVisible(True)
 
     def update_data_quality_indicators(self, report):
         """更新数据质量指示器"""
-        # 清空现有指示器
-        for i in reversed(range(self.data_quality_layout.count())): 
-            self.data_quality_layout.itemAt(i).widget().setParent(None)
-        
-        # 创建数据质量指示器
         data_quality = report.get('data_quality', {})
         sentiment_analysis = report.get('sentiment_analysis', {})
         
@@ -1413,50 +1499,29 @@ class ModernStockAnalyzerGUI(QMainWindow):
         news_count = sentiment_analysis.get('total_analyzed', 0)
         completeness = data_quality.get('analysis_completeness', '部分')
         
-        # 添加标签
-        quality_label = QLabel('📊 数据质量指标')
-        quality_label.setStyleSheet("""
-            QLabel {
-                color: #495057;
-                font-size: 14px;
-                font-weight: bold;
-                background: transparent;
-                margin-right: 20px;
-            }
-        """)
-        self.data_quality_layout.addWidget(quality_label)
-        
-        # 添加指示器
-        financial_indicator = DataQualityIndicator("财务指标", financial_count, "项")
-        news_indicator = DataQualityIndicator("新闻数据", news_count, "条")
-        completeness_indicator = DataQualityIndicator("完整度", completeness[:2], "")
-        
-        self.data_quality_layout.addWidget(financial_indicator)
-        self.data_quality_layout.addWidget(news_indicator)
-        self.data_quality_layout.addWidget(completeness_indicator)
-        self.data_quality_layout.addStretch()
+        self.data_quality_frame.setUpdatesEnabled(False)
+        try:
+            self._quality_indicators['financial'].set_value(financial_count)
+            self._quality_indicators['news'].set_value(news_count)
+            self._quality_indicators['completeness'].set_value(completeness[:2])
+        finally:
+            self.data_quality_frame.setUpdatesEnabled(True)
         
         self.data_quality_frame.setVisible(True)
 
     def get_score_description(self, score):
         """获取分数描述"""
-        if score >= 80:
-            return "优秀"
-        elif score >= 60:
-            return "良好"
-        elif score >= 40:
-            return "一般"
-        else:
-            return "较差"
+        return _rate(score)
 
     def handle_analysis_error(self, error_message):
         """处理分析错误"""
         self.show_error(f'分析过程中出现错误：{error_message}')
         self.analyze_btn.setEnabled(True)
-        self.batch_analyze_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
-        self.batch_progress_bar.setVisible(False)
-        self.current_stock_label.setVisible(False)
+        if self._batch_tab_built:
+            self.batch_analyze_btn.setEnabled(True)
+            self.batch_progress_bar.setVisible(False)
+            self.current_stock_label.setVisible(False)
 
     def export_report(self):
         """导出报告"""
@@ -1468,7 +1533,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
             if hasattr(self, 'latest_report'):
                 # 导出单个报告
                 filename = f"stock_analysis_{self.latest_report['stock_code']}_{timestamp}.md"
-                content = self.format_enhanced_report(self.latest_report)
+                chunks = [self.format_enhanced_report(self.latest_report)]
                 report_type = f"单个股票({self.latest_report['stock_code']})"
                 
                 # 添加详细的数据统计
@@ -1479,10 +1544,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
             elif hasattr(self, 'latest_batch_report'):
                 # 导出批量报告
                 filename = f"batch_analysis_{timestamp}.md"
-                content = f"# 批量股票分析报告 - {ANALYZER_VERSION}\n\n"
-                for rec in self.latest_batch_report:
-                    content += self.format_enhanced_report(rec, False)
-                    content += "\n---\n\n"
+                chunks = self._iter_batch_export(self.latest_batch_report)
                 report_type = f"批量分析({len(self.latest_batch_report)}只股票)"
                 
                 # 计算统计信息
@@ -1494,35 +1556,41 @@ class ModernStockAnalyzerGUI(QMainWindow):
                 self.show_warning('没有可导出的报告')
                 return
             
+            # 逐段写入文件，边写边累计大小，不在内存中拼出整份报告
+            size = 0
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(content)
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk.encode("utf-8"))
             
             self.log_display.append_streaming_text(f"✅ {report_type}报告导出成功: {filename}", "success")
             
-            file_size = len(content.encode("utf-8"))/1024
+            file_size = size/1024
             
             QMessageBox.information(self, '导出成功', 
                                   f'分析报告已导出！\n\n'
                                   f'📄 文件名：{filename}\n'
                                   f'📊 报告类型：{report_type}\n'
                                   f'📏 文件大小：{file_size:.1f} KB\n'
-                                  f'🔧 分析器：{ANALYZER_VERSION} | {ANALYZER_CLASS.__name__}')
+                                  f'🔧 分析器：{_ANALYZER_TAG}')
             
         except Exception as e:
             error_msg = f'导出失败：{str(e)}'
             self.log_display.append_streaming_text(f"❌ {error_msg}", "error")
             self.show_error(error_msg)
 
-    def show_config_dialog(self):
-        """显示配置对话框"""
-        self.log_display.append_streaming_text("⚙️ 打开配置对话框", "info")
-        
-        # 获取分析器功能信息
-        features = self.detect_analyzer_features() if hasattr(self, 'analyzer') else ['基础功能']
-        
-        config_msg = f'''🔧 {ANALYZER_VERSION} 配置管理
+    def _iter_batch_export(self, recommendations):
+        """逐段生成批量导出内容"""
+        yield f"# 批量股票分析报告 - {ANALYZER_VERSION}\n\n"
+        for rec in recommendations:
+            yield self.format_enhanced_report(rec, False)
+            yield "\n---\n\n"
+
+    def _build_config_msg(self, features):
+        """生成配置对话框文本"""
+        return f'''🔧 {ANALYZER_VERSION} 配置管理
 
-当前分析器：{ANALYZER_CLASS.__name__}
+当前分析器：{_ANALYZER_CLASS_NAME}
 检测功能：{', '.join(features)}
 
 📋 可配置项目：
@@ -1545,6 +1613,13 @@ class ModernStockAnalyzerGUI(QMainWindow):
 📁 文件位置：
 • 分析器：stock_analyzer.py
 • 配置文件：config.json (可选)'''
+
+    def show_config_dialog(self):
+        """显示配置对话框"""
+        self.log_display.append_streaming_text("⚙️ 打开配置对话框", "info")
+        
+        # 分析器初始化失败时没有缓存的文本
+        config_msg = getattr(self, '_config_dialog_msg', None) or self._build_config_msg(['基础功能'])
         
         QMessageBox.information(self, '系统配置', config_msg)
 
@@ -1555,29 +1630,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
         warning.setWindowTitle('⚠️ 警告')
         warning.setText(message)
         warning.setStandardButtons(QMessageBox.StandardButton.Ok)
-        warning.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-                border-radius: 8px;
-            }
-            QMessageBox QLabel {
-                color: #2c3e50;
-                min-width: 200px;
-                font-size: 14px;
-            }
-            QPushButton {
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                min-width: 80px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #5a6fd8 0%, #6a4190 100%);
-            }
-        """)
+        warning.setStyleSheet(WARNING_DIALOG_QSS)
         warning.exec()
 
     def show_error(self, message):
@@ -1587,29 +1640,7 @@ class ModernStockAnalyzerGUI(QMainWindow):
         error.setWindowTitle('❌ 错误')
         error.setText(message)
         error.setStandardButtons(QMessageBox.StandardButton.Ok)
-        error.setStyleSheet("""
-            QMessageBox {
-                background-color: white;
-                border-radius: 8px;
-            }
-            QMessageBox QLabel {
-                color: #e74c3c;
-                min-width: 200px;
-                font-size: 14px;
-            }
-            QPushButton {
-                background: linear-gradient(135deg, #e74c3c 0%, #c0392b 100%);
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                min-width: 80px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background: linear-gradient(135deg, #c0392b 0%, #a93226 100%);
-            }
-        """)
+        error.setStyleSheet(ERROR_DIALOG_QSS)
         error.exec()
 
 def main():
@@ -1635,7 +1666,7 @@ def main():
     print(f"   - Python版本: {sys.version}")
     print(f"   - PyQt6版本: {QApplication.applicationVersion()}")
     print(f"   - 分析器文件: stock_analyzer.py")
-    print(f"   - 分析器类: {ANALYZER_CLASS.__name__}")
+    print(f"   - 分析器类: {_ANALYZER_CLASS_NAME}")
     print(f"   - 预设版本: {ANALYZER_VERSION}")
     print("   - 实际功能: 将在初始化时检测")
     
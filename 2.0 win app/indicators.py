@@ -0,0 +1,145 @@
+"""
+技术指标与评分计算内核
+指标内核输入为float64的numpy数组，只计算最新值，语义与对应的pandas写法一致（见各函数说明）。
+安装了numba时以@njit编译（cache=True，编译结果缓存到磁盘），否则按普通Python函数运行。
+编译后的内核执行时释放GIL（nogil=True），批量分析的多个线程可以在多个CPU核心上同时计算。
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """未安装numba时的占位装饰器，直接返回原函数"""
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def rsi_last(values, window=14):
+    """最后一个RSI值：涨跌幅用最近 window 日求和（min_periods=1），无法计算时为nan；一次循环且不分配数组"""
+    n = len(values)
+    if n == 0:
+        return np.nan
+    last = n - 1
+    start = last - window + 1 if last >= window else 0
+    gain_sum = 0.0
+    loss_sum = 0.0
+    for j in range(max(start, 1), n):
+        delta = values[j] - values[j - 1]
+        if delta > 0:
+            gain_sum += delta
+        elif delta < 0:
+            loss_sum -= delta
+    if loss_sum > 0.0:
+        return 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+    if gain_sum > 0.0:
+        return 100.0
+    return np.nan
+
+
+@njit(cache=True, nogil=True)
+def _tail_mean(values, window):
+    """最后 window 个值的均值（跳过缺失值），等价于 Series.rolling(window, min_periods=1).mean() 的最后一项"""
+    n = len(values)
+    total = 0.0
+    count = 0
+    for i in range(max(n - window, 0), n):
+        value = values[i]
+        if value == value:
+            total += value
+            count += 1
+    return total / count if count > 0 else np.nan
+
+
+@njit(cache=True, nogil=True)
+def _tail_std(values, window):
+    """最后 window 个值的样本标准差，等价于 Series.rolling(window, min_periods=1).std() 的最后一项"""
+    n = len(values)
+    total = 0.0
+    total_sq = 0.0
+    count = 0
+    for i in range(max(n - window, 0), n):
+        value = values[i]
+        if value == value:
+            total += value
+            total_sq += value * value
+            count += 1
+    if count < 2:
+        return np.nan
+    variance = (total_sq - total * total / count) / (count - 1)
+    return np.sqrt(variance) if variance > 0.0 else 0.0
+
+
+@njit(cache=True, nogil=True)
+def _ewm_step(weighted, old_wt, value, old_wt_factor):
+    """指数加权平均 Series.ewm(span=span, min_periods=1).mean()（adjust=True）的单步递推，返回更新后的 (weighted, old_wt)"""
+    is_observation = value == value
+    if weighted == weighted:
+        old_wt *= old_wt_factor
+        if is_observation:
+            if weighted != value:
+                weighted = (old_wt * weighted + value) / (old_wt + 1.0)
+            old_wt += 1.0
+    elif is_observation:
+        weighted = value
+    return weighted, old_wt
+
+
+@njit(cache=True, nogil=True)
+def technical_snapshot(close, volume):
+    """一次计算技术分析用到的全部最新值
+    
+    返回 (ma5, ma10, ma20, rsi, macd柱当前值, macd柱前一值, 布林上轨, 布林下轨, 20日均量)，
+    各值与对应pandas写法（rolling均值/标准差、ewm、RSI）序列的最后一项一致。
+    EMA只需沿收盘价扫一遍，均线、布林带和均量只涉及最后20个值。
+    """
+    n = len(close)
+    hist_now = np.nan
+    hist_prev = np.nan
+    if n > 0:
+        # MACD的快线、慢线和信号线在同一次循环中递推；沿用adjust=True的递推，
+        # 改为adjust=False会改变序列开头附近的MACD值和买卖信号
+        fast_factor = 1.0 - 2.0 / 13.0
+        slow_factor = 1.0 - 2.0 / 27.0
+        signal_factor = 1.0 - 2.0 / 10.0
+        fast = close[0]
+        slow = close[0]
+        fast_wt = 1.0
+        slow_wt = 1.0
+        signal = fast - slow
+        signal_wt = 1.0
+        hist_now = (fast - slow) - signal
+        for i in range(1, n):
+            fast, fast_wt = _ewm_step(fast, fast_wt, close[i], fast_factor)
+            slow, slow_wt = _ewm_step(slow, slow_wt, close[i], slow_factor)
+            macd = fast - slow
+            signal, signal_wt = _ewm_step(signal, signal_wt, macd, signal_factor)
+            hist_prev = hist_now
+            hist_now = macd - signal
+
+    bb_middle = _tail_mean(close, 20)
+    bb_std = _tail_std(close, 20)
+    return (_tail_mean(close, 5), _tail_mean(close, 10), _tail_mean(close, 20),
+            rsi_last(close, 14), hist_now, hist_prev,
+            bb_middle + 2 * bb_std, bb_middle - 2 * bb_std,
+            _tail_mean(volume, 20))
+
+
+@njit(cache=True, nogil=True)
+def sentiment_score(overall_sentiment, confidence_score, total_analyzed):
+    """情绪面得分：情绪值从[-1,1]映射到[0,100]，再按置信度和新闻数量加分，结果限制在[0,100]"""
+    base_score = (overall_sentiment + 1) * 50
+    confidence_adjustment = confidence_score * 10
+    news_adjustment = min(total_analyzed / 100, 1.0) * 10
+    return max(0.0, min(100.0, base_score + confidence_adjustment + news_adjustment))
+
+
+@njit(cache=True, nogil=True)
+def comprehensive_score(technical, fundamental, sentiment,
+                        technical_weight, fundamental_weight, sentiment_weight):
+    """综合得分：三项得分加权求和，结果限制在[0,100]"""
+    total = (technical * technical_weight +
+             fundamental * fundamental_weight +
+             sentiment * sentiment_weight)
+    return max(0.0, min(100.0, total))
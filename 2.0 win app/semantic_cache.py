@@ -0,0 +1,143 @@
+"""
+AI分析提示词的语义缓存
+精确匹配缓存无法命中只有少量字段不同的提示词（例如同一只股票当天重复分析时价格略有变化）。
+这里把提示词的数据部分编码为归一化句向量，用faiss内积索引查找最相似的历史提示词，
+作用域（股票代码和日期）完全一致、相似度达到阈值且未过期时直接复用其AI分析结果。
+所有提示词共用的分析要求不参与编码，否则句向量模型的有限输入长度会被相同的文字占满。
+需要安装faiss和sentence-transformers，未安装时 is_available() 返回False，由调用方跳过语义缓存。
+"""
+
+import logging
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# 多语言句向量模型，支持中文提示词
+DEFAULT_MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+logger = logging.getLogger(__name__)
+
+
+def is_available():
+    """语义缓存所需的依赖是否都已安装"""
+    return faiss is not None and SentenceTransformer is not None
+
+
+class SemanticPromptCache:
+    """基于句向量相似度的AI分析结果缓存（线程安全）"""
+
+    def __init__(self, index_path, threshold=0.95, ttl=6 * 3600, max_entries=512,
+                 save_every=20, model_name=DEFAULT_MODEL_NAME):
+        self.index_path = index_path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_every = save_every
+        self.model_name = model_name
+
+        # 模型加载需要数秒，第一次查询时才加载
+        self._model = None
+        self._index = None
+        # 与索引中的向量一一对应的 [作用域, AI分析结果, 写入时间 time.time()]
+        self._entries = []
+        self._unsaved = 0
+        self._lock = threading.Lock()
+
+    def _encode(self, text):
+        """把文本编码为L2归一化的float32行向量"""
+        with self._lock:
+            if self._model is None:
+                self._model = SentenceTransformer(self.model_name)
+        embedding = self._model.encode([text], normalize_embeddings=True)
+        return np.ascontiguousarray(embedding, dtype=np.float32)
+
+    def _ensure_index(self, dimension):
+        """首次使用时从磁盘恢复索引，没有可用的持久化数据时新建空索引"""
+        if self._index is not None:
+            return
+        meta_path = f"{self.index_path}.json"
+        if os.path.exists(self.index_path) and os.path.exists(meta_path):
+            try:
+                index = faiss.read_index(self.index_path)
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+                if index.d == dimension and index.ntotal == len(entries):
+                    self._index = index
+                    self._entries = entries
+                    return
+            except Exception as e:
+                logger.warning("读取语义缓存索引失败 %s: %s", self.index_path, e)
+        self._index = faiss.IndexFlatIP(dimension)
+        self._entries = []
+
+    def get(self, text, scope, ttl=None):
+        """返回同一作用域内相似文本的缓存结果，没有命中时返回 (None, 向量)，向量可直接传给 put
+        
+        scope 是必须完全一致的字符串（如股票代码和日期），相似度只在同一作用域的条目之间比较；
+        ttl 为本次查询的有效期（秒），默认使用构造时的 ttl
+        """
+        if ttl is None:
+            ttl = self.ttl
+        embedding = self._encode(text)
+        with self._lock:
+            self._ensure_index(embedding.shape[1])
+            if self._index.ntotal == 0:
+                return None, embedding
+            # 按相似度从高到低检查，跳过其他作用域的条目
+            scores, ids = self._index.search(embedding, self._index.ntotal)
+            now = time.time()
+            for score, position in zip(scores[0], ids[0]):
+                if position < 0 or score < self.threshold:
+                    break
+                entry_scope, response, created = self._entries[position]
+                if entry_scope == scope and now - created < ttl:
+                    return response, embedding
+        return None, embedding
+
+    def put(self, embedding, response, scope):
+        """写入一条结果，超出条目上限时淘汰最早写入的一半"""
+        with self._lock:
+            self._ensure_index(embedding.shape[1])
+            if self._index.ntotal >= self.max_entries:
+                drop = self._index.ntotal // 2
+                kept = self._index.reconstruct_n(drop, self._index.ntotal - drop)
+                self._index.reset()
+                self._index.add(kept)
+                del self._entries[:drop]
+            self._index.add(embedding)
+            self._entries.append([scope, response, time.time()])
+            self._unsaved += 1
+            if self._unsaved >= self.save_every:
+                self._save()
+
+    def save(self):
+        """把尚未持久化的条目写入磁盘，程序退出前调用，避免短时间运行时写入的结果丢失"""
+        with self._lock:
+            if self._unsaved and self._index is not None:
+                self._save()
+
+    def _save(self):
+        """持久化索引和结果，调用方需持有锁"""
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+            faiss.write_index(self._index, self.index_path)
+            tmp_path = f"{self.index_path}.json.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, f"{self.index_path}.json")
+            self._unsaved = 0
+        except Exception as e:
+            logger.warning("写入语义缓存索引失败 %s: %s", self.index_path, e)
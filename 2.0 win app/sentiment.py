@@ -0,0 +1,60 @@
+"""
+新闻情绪词匹配
+情绪词典在模块加载时构建一次。安装了pyahocorasick时用Aho-Corasick自动机一次扫描文本，
+同时找出所有正面/负面词；否则用预编译的正则表达式一次扫描。两种方式都按"出现过的不同情绪词个数"计数。
+"""
+
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# 正面情绪词
+POSITIVE_WORDS = frozenset({
+    '上涨', '涨停', '利好', '突破', '增长', '盈利', '收益', '回升', '强势', '看好',
+    '买入', '推荐', '优秀', '领先', '创新', '发展', '机会', '潜力', '稳定', '改善',
+    '提升', '超预期', '积极', '乐观', '向好', '受益', '龙头', '热点', '爆发', '翻倍',
+    '业绩', '增收', '扩张', '合作', '签约', '中标', '获得', '成功', '完成', '达成'
+})
+
+# 负面情绪词
+NEGATIVE_WORDS = frozenset({
+    '下跌', '跌停', '利空', '破位', '下滑', '亏损', '风险', '回调', '弱势', '看空',
+    '卖出', '减持', '较差', '落后', '滞后', '困难', '危机', '担忧', '悲观', '恶化',
+    '下降', '低于预期', '消极', '压力', '套牢', '被套', '暴跌', '崩盘', '踩雷', '退市',
+    '违规', '处罚', '调查', '停牌', '债务', '违约', '诉讼', '纠纷', '问题'
+})
+
+
+def _build_automaton():
+    """构建同时包含正面/负面词的自动机，值为情绪词本身"""
+    automaton = ahocorasick.Automaton()
+    for word in POSITIVE_WORDS | NEGATIVE_WORDS:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATON = _build_automaton() if ahocorasick is not None else None
+
+# 所有情绪词的首字符：文本中一个都不含时不可能匹配到情绪词，可以跳过完整扫描
+_FIRST_CHARS = frozenset(word[0] for word in POSITIVE_WORDS | NEGATIVE_WORDS)
+
+# 未安装pyahocorasick时使用：零宽前瞻让每个位置都尝试匹配，重叠的情绪词也能全部找到
+# （词典中没有互为前缀的词，同一位置最多匹配一个词）
+_WORD_PATTERN = re.compile('(?=({}))'.format('|'.join(
+    re.escape(word) for word in sorted(POSITIVE_WORDS | NEGATIVE_WORDS, key=len, reverse=True))))
+
+
+def count_sentiment_words(text):
+    """返回文本中出现的 (不同正面词个数, 不同负面词个数)，同一个词出现多次只计一次"""
+    if _FIRST_CHARS.isdisjoint(text):
+        return 0, 0
+    if _AUTOMATON is not None:
+        matched = {word for _, word in _AUTOMATON.iter(text)}
+    else:
+        matched = set(_WORD_PATTERN.findall(text))
+    positive_count = len(matched & POSITIVE_WORDS)
+    return positive_count, len(matched) - positive_count
@@ -3,6 +3,9 @@
 支持25项财务指标、详细新闻分析、技术分析、情绪分析和AI增强分析
 """
 
+import atexit
+import copy
+import hashlib
 import os
 import sys
 import logging
@@ -10,10 +13,74 @@ import warnings
 import pandas as pd
 import numpy as np
 import json
-from datetime import datetime, timedelta
+import math
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import time
 import re
+import threading
+from collections import OrderedDict, deque
+from contextlib import closing
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 价格数据的磁盘缓存使用parquet格式；未安装pyarrow时价格数据只缓存在内存中
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# akshare 只在模块加载时导入一次；未安装时各数据获取方法按获取失败处理
+try:
+    import akshare as ak
+except ImportError:
+    ak = None
+
+# AI服务的SDK同样只导入一次；未安装的服务调用时直接跳过
+try:
+    import openai
+except ImportError:
+    openai = None
+
+# openai>=1.0 的客户端基于httpx；安装了h2时启用HTTP/2
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+try:
+    import zhipuai
+except ImportError:
+    zhipuai = None
+
+# 提示词token计数 - 可选；未安装时按字符数估算
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+import indicators
+import semantic_cache
+import sentiment
 
 # 忽略警告
 warnings.filterwarnings('ignore')
@@ -28,9 +95,556 @@ logging.basicConfig(
     ]
 )
 
+# 已解析的配置缓存，键为 (配置文件绝对路径, 修改时间)，文件未变化时直接复用
+_CONFIG_CACHE: Dict[Tuple[str, int], dict] = {}
+
+# 25项核心财务指标
+_CORE_KEYS = (
+    # 1-5: 盈利能力指标
+    '净利润率', '净资产收益率', '总资产收益率', '毛利率', '营业利润率',
+    # 6-10: 偿债能力指标
+    '流动比率', '速动比率', '资产负债率', '产权比率', '利息保障倍数',
+    # 11-15: 营运能力指标
+    '总资产周转率', '存货周转率', '应收账款周转率', '流动资产周转率', '固定资产周转率',
+    # 16-20: 发展能力指标
+    '营收同比增长率', '净利润同比增长率', '总资产增长率', '净资产增长率', '经营现金流增长率',
+    # 21-25: 市场表现指标
+    '市盈率', '市净率', '市销率', 'PEG比率', '股息收益率',
+)
+
+# 计算衍生指标所需的基础数据（营业收入、净利润、总资产、股东权益）
+_DERIVED_BASE_KEYS = ('营业收入', '净利润', '总资产', '股东权益')
+
+
+# 默认配置模板，使用时深拷贝并填入创建时间
+_DEFAULT_CONFIG_TEMPLATE = {
+    "api_keys": {
+        "openai": "",
+        "anthropic": "",
+        "zhipu": "",
+        "notes": "请填入您的API密钥"
+    },
+    "ai": {
+        "model_preference": "openai",
+        "models": {
+            "openai": "gpt-4o-mini",
+            "anthropic": "claude-3-haiku-20240307",
+            "zhipu": "chatglm_turbo"
+        },
+        "max_tokens": 6000,
+        "temperature": 0.7,
+        "semantic_cache_enabled": False,
+        "semantic_cache_threshold": 0.95,
+        "fallback_delay": None,
+        "limits": {
+            "timeout": 120,
+            "max_retries": 2,
+            "tokens_per_minute": 0
+        },
+        "api_base_urls": {
+            "openai": "https://api.openai.com/v1",
+            "notes": "如使用中转API，修改上述URL"
+        }
+    },
+    "analysis_weights": {
+        "technical": 0.4,
+        "fundamental": 0.4,
+        "sentiment": 0.2,
+        "notes": "权重总和应为1.0"
+    },
+    "cache": {
+        "price_hours": 1,
+        "fundamental_hours": 6,
+        "news_hours": 2,
+        "price_max_entries": 512,
+        "fundamental_max_entries": 256,
+        "news_max_entries": 128,
+        "ai_max_entries": 128,
+        "disk_dir": ".cache",
+        "report_cache_enabled": False
+    },
+    "streaming": {
+        "enabled": True,
+        "show_thinking": True,
+        "delay": 0.1
+    },
+    "analysis_params": {
+        "max_news_count": 200,
+        "technical_period_days": 365,
+        "financial_indicators_count": 25,
+        "concurrency": 4
+    },
+    "logging": {
+        "level": "INFO",
+        "file": "stock_analyzer.log"
+    },
+    "data_sources": {
+        "akshare_token": "",
+        "backup_sources": ["akshare"]
+    },
+    "ui": {
+        "theme": "default",
+        "language": "zh_CN",
+        "window_size": [1200, 800]
+    },
+    "_metadata": {
+        "version": "3.0.0",
+        "created": "",
+        "description": "增强版AI股票分析系统配置文件"
+    }
+}
+
+
+# 温度不高于该值（输出基本确定）时，AI分析结果按基本面数据的缓存有效期复用
+_AI_CACHE_MAX_TEMPERATURE = 0.3
+# 温度更高时AI分析结果只在该秒数内复用，避免短时间内重复分析同一只股票时重复调用AI服务
+_AI_HIGH_TEMPERATURE_CACHE_TTL = 600
+# 首选AI服务超过该秒数仍未返回时，并发发起备用服务；None表示只在首选服务失败后才发起
+# （完整的分析通常需要数十秒，设置过短会让正常请求也同时调用备用服务并重复计费）
+_AI_FALLBACK_DELAY = None
+# AI请求默认的超时秒数和失败重试次数（可在配置 ai.limits 中调整），避免连接卡住时分析流程无限等待
+_AI_REQUEST_TIMEOUT = 120.0
+_AI_MAX_RETRIES = 2
+# 自行重试的AI请求的退避等待（秒）：第n次重试前随机等待 [0, min(上限, 基数 * 2^n)]
+_AI_RETRY_BASE_DELAY = 1.0
+_AI_RETRY_MAX_DELAY = 8.0
+# 智谱AI表示并发/频率超限的错误码，可以稍后重试；鉴权、参数错误等不重试
+_ZHIPU_RETRYABLE_CODES = frozenset({1302, 1303, 1305})
+# OpenAI客户端连接池：保持的空闲长连接数和最大连接数，批量分析时多个线程共享
+_AI_HTTP_KEEPALIVE_CONNECTIONS = 20
+_AI_HTTP_MAX_CONNECTIONS = 100
+# 提示词超过该token数时改用精简版（只保留关键财务指标和更少的新闻）
+_AI_PROMPT_TOKEN_BUDGET = 4000
+# 精简提示词保留的关键财务指标
+_KEY_FINANCIAL_INDICATORS = frozenset({
+    '净资产收益率', '净利润率', '毛利率', '资产负债率', '流动比率', '营收同比增长率',
+    '净利润同比增长率', '经营现金流增长率', '市盈率', '市净率', 'PEG比率', '股息收益率',
+})
+# 各AI服务默认模型的上下文窗口（token），可在配置 ai.context_windows 中覆盖，用于限制 max_tokens
+_AI_CONTEXT_WINDOWS = {'openai': 128000, 'anthropic': 200000, 'zhipu': 32000}
+# 上下文窗口中为系统提示词和消息格式预留的token数
+_AI_CONTEXT_RESERVE = 128
+# AI服务在日志中的名称
+_AI_PROVIDER_NAMES = {'openai': 'OpenAI', 'anthropic': 'Claude', 'zhipu': '智谱AI'}
+
+# 情绪分析的新闻类型，按收集顺序排列，下标用于分组累加
+_SENTIMENT_TYPES = ('company_news', 'announcement', 'research_report', 'industry_news')
+# 与 _SENTIMENT_TYPES 一一对应的 (新闻数据键, 与标题拼接的字段, 权重)，公告权重更高
+_SENTIMENT_SOURCES = (
+    ('company_news', 'content', 1.0),
+    ('announcements', 'content', 1.2),
+    ('research_reports', 'rating', 0.9),
+    ('industry_news', 'content', 0.7),
+)
+
+
+# 技术分析评分表：信号 -> 得分增减，未列出的信号不加减分
+_MA_TREND_DELTA = {'多头排列': 20, '空头排列': -20}
+_MACD_SIGNAL_DELTA = {'金叉向上': 15, '死叉向下': -15}
+_VOLUME_STATUS_DELTA = {'放量上涨': 10, '放量下跌': -10}
+
+
+def _rsi_delta(rsi):
+    """RSI得分增减：正常区间+10，超卖+5，超买-5"""
+    if 30 <= rsi <= 70:
+        return 10
+    if rsi < 30:
+        return 5
+    if rsi > 70:
+        return -5
+    return 0
+
+
+def _bb_delta(bb_position):
+    """布林带位置得分增减：中轨区间+5，靠近下轨+10，靠近上轨-5"""
+    if 0.2 <= bb_position <= 0.8:
+        return 5
+    if bb_position < 0.2:
+        return 10
+    if bb_position > 0.8:
+        return -5
+    return 0
+
+
+# akshare历史行情按返回列数对应的标准列名
+_COLUMN_MAPS = {
+    # 包含code列的完整格式
+    13: ('date', 'code', 'open', 'close', 'high', 'low', 'volume', 'turnover', 'amplitude', 'change_pct', 'change_amount', 'turnover_rate', 'extra'),
+    # 包含code列
+    12: ('date', 'code', 'open', 'close', 'high', 'low', 'volume', 'turnover', 'amplitude', 'change_pct', 'change_amount', 'turnover_rate'),
+    # 不包含code列的标准格式
+    11: ('date', 'open', 'close', 'high', 'low', 'volume', 'turnover', 'amplitude', 'change_pct', 'change_amount', 'turnover_rate'),
+    # 简化格式
+    10: ('date', 'open', 'close', 'high', 'low', 'volume', 'turnover', 'amplitude', 'change_pct', 'change_amount'),
+}
+
+# 基本面数据各数据源共用的线程池大小，限制批量分析时同时发出的akshare请求数
+_FUNDAMENTAL_FETCH_WORKERS = 16
+# 一只股票的基本面数据最多等待的秒数（akshare请求本身没有超时），超时的数据项按获取失败处理
+_FUNDAMENTAL_FETCH_TIMEOUT = 30.0
+_FUNDAMENTAL_EXECUTOR = ThreadPoolExecutor(max_workers=_FUNDAMENTAL_FETCH_WORKERS)
+
+# 股票代码 -> 行业板块索引的有效期（秒），板块成分股变化很慢
+_INDUSTRY_INDEX_TTL = 24 * 3600
+# 部分行业获取失败时，不完整的索引只在内存中保留该秒数，之后重新构建
+_INDUSTRY_INDEX_PARTIAL_TTL = 10 * 60
+# 并发获取行业成分股的线程数
+_INDUSTRY_INDEX_WORKERS = 8
+_INDUSTRY_INDEX_LOCK = threading.Lock()
+
+# 股票名称缓存的有效期（秒）和条目数上限，名称几乎不会变化
+_STOCK_NAME_TTL = 24 * 3600
+_STOCK_NAME_CACHE_MAX = 4096
+
+
+class _TokenRateLimiter:
+    """按最近60秒内请求的token总数限速（线程安全），超出每分钟上限时等待最早的请求滑出窗口"""
+
+    def __init__(self, tokens_per_minute):
+        self.tokens_per_minute = tokens_per_minute
+        # (请求时间 time.monotonic(), token数)
+        self._requests = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens):
+        """登记一次请求，必要时阻塞等待；单次请求超过上限时在窗口为空后放行"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._requests and now - self._requests[0][0] >= 60:
+                    self._requests.popleft()
+                used = sum(count for _, count in self._requests)
+                if not self._requests or used + tokens <= self.tokens_per_minute:
+                    self._requests.append((now, tokens))
+                    return
+                wait_seconds = 60 - (now - self._requests[0][0])
+            time.sleep(wait_seconds)
+
+
+# 新闻条目使用 __slots__ 数据类，字段固定，比通用dict更省内存
+@dataclass
+class NewsItem:
+    """公司新闻 / 行业新闻条目"""
+    __slots__ = ('title', 'content', 'date', 'source', 'url', 'relevance_score')
+    title: str
+    content: str
+    date: str
+    source: str
+    url: str
+    relevance_score: float
+
+
+@dataclass
+class AnnouncementItem:
+    """公司公告条目"""
+    __slots__ = ('title', 'content', 'date', 'type', 'relevance_score')
+    title: str
+    content: str
+    date: str
+    type: str
+    relevance_score: float
+
+
+@dataclass
+class ResearchReportItem:
+    """研究报告条目"""
+    __slots__ = ('title', 'institution', 'rating', 'target_price', 'date', 'relevance_score')
+    title: str
+    institution: str
+    rating: str
+    target_price: str
+    date: str
+    relevance_score: float
+
+
+# 磁盘缓存中可以出现的数据类，按类名还原
+_CACHE_DATACLASSES = {cls.__name__: cls for cls in (NewsItem, AnnouncementItem, ResearchReportItem)}
+# 数据为DataFrame、按parquet格式保存的磁盘缓存类别，其余类别按JSON保存
+_DATAFRAME_CACHE_KINDS = frozenset({'price'})
+
+
+def _cache_json_default(obj):
+    """把JSON不支持的缓存数据转为带类型标记的字典，由 _cache_json_object_hook 还原"""
+    if isinstance(obj, tuple(_CACHE_DATACLASSES.values())):
+        return {'__dataclass__': type(obj).__name__, 'values': [getattr(obj, name) for name in obj.__slots__]}
+    if isinstance(obj, datetime):
+        return {'__datetime__': obj.isoformat()}
+    if isinstance(obj, date):
+        return {'__date__': obj.isoformat()}
+    if isinstance(obj, (np.generic, np.ndarray)):
+        return obj.tolist()
+    raise TypeError(f"无法写入磁盘缓存的数据类型: {type(obj).__name__}")
+
+
+def _cache_json_object_hook(obj):
+    """还原 _cache_json_default 写入的类型标记"""
+    if '__dataclass__' in obj:
+        return _CACHE_DATACLASSES[obj['__dataclass__']](*obj['values'])
+    if '__datetime__' in obj:
+        return pd.Timestamp(obj['__datetime__'])
+    if '__date__' in obj:
+        return date.fromisoformat(obj['__date__'])
+    return obj
+
+
+def _dump_cache_json(data):
+    """缓存数据序列化为JSON文本，读取缓存时只解析数据，不会执行代码"""
+    return json.dumps(data, ensure_ascii=False, default=_cache_json_default)
+
+
+def _load_cache_json(text):
+    """解析 _dump_cache_json 写入的JSON文本"""
+    return json.loads(text, object_hook=_cache_json_object_hook)
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    """tiktoken编码器，只加载一次；未安装或加载失败（如无法下载词表）时返回None"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding('o200k_base')
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=64)
+def _count_tokens(text):
+    """文本的token数：有tiktoken时精确计数，否则按字符数估算（中文大约一个字一个token）"""
+    encoding = _token_encoding()
+    if encoding is None:
+        return len(text)
+    return len(encoding.encode(text))
+
+
+def _prompt_data_section(prompt):
+    """提示词中逐股票的数据部分（去掉所有股票共用的开头和分析要求），用于语义缓存的相似度比较"""
+    _, _, data = prompt.partition('**股票基本信息：**')
+    return data.partition('**分析要求：**')[0] or prompt
+
+
+class _TransientAIError(Exception):
+    """AI服务返回的可重试错误（如限流）"""
+
+
+def _empty_sentiment_result(sentiment_trend):
+    """没有可分析新闻或分析失败时的情绪分析结果
+    
+    结果保持为dict：它会与新闻数据合并后写入报告，界面和提示词都按键读取
+    """
+    return {
+        'overall_sentiment': 0.0,
+        'sentiment_by_type': {},
+        'sentiment_trend': sentiment_trend,
+        'confidence_score': 0.0,
+        'total_analyzed': 0
+    }
+
+
+def _str_column(df, position, default):
+    """按位置取整列并转为字符串列表，列不存在时用默认值填充"""
+    if position < df.shape[1]:
+        # 不用astype(str)：新版pandas中它会保留缺失值而不是转为'nan'
+        return [str(value) for value in df.iloc[:, position].tolist()]
+    return [default] * len(df)
+
+
+def _row_to_dict(df, position):
+    """取第position行转为字典，等价于 df.iloc[position].to_dict()，不再逐个元素装箱"""
+    return dict(zip(df.columns.tolist(), df.iloc[position].to_numpy().tolist()))
+
+
+def _df_to_records(df, n):
+    """取前n行转为字典列表，等价于 df.head(n).to_dict('records')，按列整体取值更快"""
+    head = df.head(n)
+    columns = head.columns.tolist()
+    values = [head.iloc[:, i].tolist() for i in range(len(columns))]
+    return [dict(zip(columns, row)) for row in zip(*values)]
+
+
+# AI分析的系统提示词，所有股票共用
+_AI_SYSTEM_PROMPT = "你是一位资深的股票分析师，具有丰富的市场经验和深厚的金融知识。请提供专业、客观、有深度的股票分析。"
+
+# 增强版AI分析提示词模板，由 _build_enhanced_ai_analysis_prompt 用 str.format 填充
+_ENHANCED_PROMPT_TEMPLATE = """请作为一位资深的股票分析师，基于以下详细数据对股票进行深度分析：
+
+**股票基本信息：**
+- 股票代码：{stock_code}
+- 股票名称：{stock_name}
+- 当前价格：{current_price:.2f}元
+- 涨跌幅：{price_change:.2f}%
+- 成交量比率：{volume_ratio:.2f}
+- 波动率：{volatility:.2f}%
+
+**技术分析详情：**
+- 均线趋势：{ma_trend}
+- RSI指标：{rsi:.1f}
+- MACD信号：{macd_signal}
+- 布林带位置：{bb_position:.2f}
+- 成交量状态：{volume_status}
+
+{financial_text}
+
+**估值指标：**
+{valuation_text}
+
+**业绩预告：**
+共{performance_forecast_count}条业绩预告
+{performance_forecast_text}
+
+**分红配股：**
+共{dividend_count}条分红配股信息
+{dividend_text}
+
+**股东结构：**
+前10大股东信息：{shareholders_count}条
+机构持股：{institutional_holdings_count}条
+
+{news_text}
+
+{research_text}
+
+**市场情绪分析：**
+- 整体情绪得分：{overall_sentiment:.3f}
+- 情绪趋势：{sentiment_trend}
+- 置信度：{confidence_score:.2f}
+- 各类新闻情绪：{sentiment_by_type}
+
+**综合评分：**
+- 技术面得分：{technical_score:.1f}/100
+- 基本面得分：{fundamental_score:.1f}/100
+- 情绪面得分：{sentiment_score:.1f}/100
+- 综合得分：{comprehensive_score:.1f}/100
+
+**分析要求：**
+
+请基于以上详细数据，从以下维度进行深度分析：
+
+1. **财务健康度深度解读**：
+   - 基于25项财务指标，全面评估公司财务状况
+   - 识别财务优势和风险点
+   - 与行业平均水平对比分析
+   - 预测未来财务发展趋势
+
+2. **技术面精准分析**：
+   - 结合多个技术指标，判断短中长期趋势
+   - 识别关键支撑位和阻力位
+   - 分析成交量与价格的配合关系
+   - 评估当前位置的风险收益比
+
+3. **市场情绪深度挖掘**：
+   - 分析公司新闻、公告、研报的影响
+   - 评估市场对公司的整体预期
+   - 识别情绪拐点和催化剂
+   - 判断情绪对股价的推动或拖累作用
+
+4. **基本面价值判断**：
+   - 评估公司内在价值和成长潜力
+   - 分析行业地位和竞争优势
+   - 评估业绩预告和分红政策
+   - 判断当前估值的合理性
+
+5. **综合投资策略**：
+   - 给出明确的买卖建议和理由
+   - 设定目标价位和止损点
+   - 制定分批操作策略
+   - 评估投资时间周期
+
+6. **风险机会识别**：
+   - 列出主要投资风险和应对措施
+   - 识别潜在催化剂和成长机会
+   - 分析宏观环境和政策影响
+   - 提供动态调整建议
+
+请用专业、客观的语言进行分析，确保逻辑清晰、数据支撑充分、结论明确可执行。"""
+
+# 规则分析（AI备用方案）各段落的模板，由 _advanced_rule_based_analysis 用 str.format 填充
+_RULE_COMPREHENSIVE_TEMPLATE = """## 📊 综合评估
+
+基于技术面、基本面和市场情绪的综合分析，{stock_name}({stock_code})的综合得分为{comprehensive_score:.1f}分。
+
+- 技术面得分：{technical_score:.1f}/100
+- 基本面得分：{fundamental_score:.1f}/100  
+- 情绪面得分：{sentiment_score:.1f}/100"""
+
+_RULE_FINANCIAL_TEMPLATE = """## 💰 财务健康度分析
+
+获取到{indicator_count}项财务指标，主要指标如下：
+
+{key_metrics}
+
+财务健康度评估：{health}"""
+
+_RULE_TECHNICAL_TEMPLATE = """## 📈 技术面分析
+
+当前技术指标显示：
+- 均线趋势：{ma_trend}
+- RSI指标：{rsi:.1f}
+- MACD信号：{macd_signal}
+- 成交量状态：{volume_status}
+
+技术面评估：{assessment}"""
+
+_RULE_SENTIMENT_TEMPLATE = """## 📰 市场情绪分析
+
+基于{total_analyzed}条新闻的分析：
+- 整体情绪：{sentiment_trend}
+- 情绪得分：{overall_sentiment:.3f}
+- 置信度：{confidence_score:.2%}
+
+新闻分布：
+- 公司新闻：{company_news_count}条
+- 公司公告：{announcements_count}条  
+- 研究报告：{research_reports_count}条"""
+
+_RULE_STRATEGY_TEMPLATE = """## 🎯 投资策略建议
+
+**投资建议：{recommendation}**
+
+根据综合分析，建议如下：
+
+{strategy}
+
+操作建议：
+- 买入时机：技术面突破关键位置时
+- 止损位置：跌破重要技术支撑
+- 持有周期：中长期为主"""
+
+# 完整的规则分析报告模板，由各段落模板在模块加载时拼接一次，每次分析只需一次格式化；
+# 没有财务指标时使用省略财务段落的版本
+_RULE_ANALYSIS_TEMPLATE = "\n\n".join((
+    _RULE_COMPREHENSIVE_TEMPLATE, _RULE_FINANCIAL_TEMPLATE, _RULE_TECHNICAL_TEMPLATE,
+    _RULE_SENTIMENT_TEMPLATE, _RULE_STRATEGY_TEMPLATE,
+))
+_RULE_ANALYSIS_NO_FINANCIAL_TEMPLATE = "\n\n".join((
+    _RULE_COMPREHENSIVE_TEMPLATE, _RULE_TECHNICAL_TEMPLATE,
+    _RULE_SENTIMENT_TEMPLATE, _RULE_STRATEGY_TEMPLATE,
+))
+
+# 得分分级：(最低得分, 评价)，从高到低排列，低于所有档位时使用对应的默认评价
+_FINANCIAL_HEALTH_LEVELS = ((70, '优秀'), (50, '良好'))
+_TECHNICAL_ASSESSMENT_LEVELS = ((70, '强势'), (50, '中性'))
+_STRATEGY_LEVELS = (
+    (80, '**积极配置**：各项指标表现优异，可适当加大仓位。'),
+    (60, '**谨慎买入**：整体表现良好，但需要关注风险点。'),
+    (40, '**观望为主**：当前风险收益比一般，建议等待更好时机。'),
+)
+
+
+def _score_label(score, levels, default):
+    """返回得分所在档位的评价"""
+    for threshold, label in levels:
+        if score >= threshold:
+            return label
+    return default
+
+
 class EnhancedStockAnalyzer:
     """增强版综合股票分析器"""
     
+    # 所有实例共享的行业索引: (构建时间 time.monotonic(), {股票代码: 板块名称})
+    _INDUSTRY_INDEX: Optional[Tuple[float, Dict[str, str]]] = None
+    
     def __init__(self, config_file='config.json'):
         """初始化分析器"""
         self.logger = logging.getLogger(__name__)
@@ -44,10 +658,33 @@ class EnhancedStockAnalyzer:
         self.cache_duration = timedelta(hours=cache_config.get('price_hours', 1))
         self.fundamental_cache_duration = timedelta(hours=cache_config.get('fundamental_hours', 6))
         self.news_cache_duration = timedelta(hours=cache_config.get('news_hours', 2))
+        # 缓存时间戳使用time.monotonic()，有效期预先换算为秒
+        self._price_cache_ttl = self.cache_duration.total_seconds()
+        self._fundamental_cache_ttl = self.fundamental_cache_duration.total_seconds()
+        self._news_cache_ttl = self.news_cache_duration.total_seconds()
+        
+        # 内存缓存按LRU淘汰，条目数上限可配置（新闻数据体积较大，上限更小）
+        self.price_cache = OrderedDict()
+        self.fundamental_cache = OrderedDict()
+        self.news_cache = OrderedDict()
+        self.name_cache = OrderedDict()
+        # 技术分析结果按 (股票代码, 最后一根K线) 缓存，行情没有更新时重复分析直接复用
+        self.technical_cache = OrderedDict()
+        self._price_cache_max = cache_config.get('price_max_entries', 512)
+        self._fundamental_cache_max = cache_config.get('fundamental_max_entries', 256)
+        self._news_cache_max = cache_config.get('news_max_entries', 128)
+        # 相同提示词的AI分析结果，有效期与基本面数据一致
+        self.ai_cache = OrderedDict()
+        self._ai_cache_max = cache_config.get('ai_max_entries', 128)
+        # 批量分析时多个线程共用同一个分析器，OrderedDict的调整顺序/淘汰需要加锁
+        self._cache_lock = threading.Lock()
         
-        self.price_cache = {}
-        self.fundamental_cache = {}
-        self.news_cache = {}
+        # 磁盘缓存目录（进程重启后仍可复用未过期的数据），相对路径以配置文件所在目录为基准，不随工作目录变化
+        self.disk_cache_dir = os.path.join(
+            os.path.dirname(os.path.abspath(self.config_file)), cache_config.get('disk_dir', '.cache'))
+        # 完整分析报告按 (股票代码, 日期, 配置摘要) 缓存在SQLite中，同一天相同配置的重复分析直接复用（默认关闭）
+        self.report_cache_enabled = cache_config.get('report_cache_enabled', False)
+        self.report_cache_path = os.path.join(self.disk_cache_dir, 'analysis_reports.db')
         
         # 分析权重配置
         weights = self.config.get('analysis_weights', {})
@@ -78,9 +715,37 @@ class EnhancedStockAnalyzer:
         self.analysis_params = {
             'max_news_count': params.get('max_news_count', 200),
             'technical_period_days': params.get('technical_period_days', 365),
-            'financial_indicators_count': params.get('financial_indicators_count', 25)
+            'financial_indicators_count': params.get('financial_indicators_count', 25),
+            'concurrency': params.get('concurrency', 4)
         }
         
+        # 语义缓存：相似度足够高的提示词复用已有的AI分析结果（默认关闭）
+        self.semantic_cache = None
+        if ai_config.get('semantic_cache_enabled', False):
+            if semantic_cache.is_available():
+                self.semantic_cache = semantic_cache.SemanticPromptCache(
+                    os.path.join(self.disk_cache_dir, 'semantic', 'prompts.faiss'),
+                    threshold=ai_config.get('semantic_cache_threshold', 0.95),
+                    ttl=self._fundamental_cache_ttl,
+                    max_entries=self._ai_cache_max
+                )
+                # 累计写入一定条数才落盘，退出前把剩余的条目写入磁盘
+                atexit.register(self.semantic_cache.save)
+            else:
+                self.logger.warning("未安装faiss或sentence-transformers，语义缓存不可用")
+        
+        # AI请求按每分钟token数限速（0表示不限速），多个线程并发分析时共用
+        tokens_per_minute = ai_config.get('limits', {}).get('tokens_per_minute', 0)
+        self._ai_rate_limiter = _TokenRateLimiter(tokens_per_minute) if tokens_per_minute > 0 else None
+        
+        # AI客户端按服务缓存复用（保持连接池），避免每次请求重新创建
+        self._ai_clients = {}
+        self._ai_clients_lock = threading.Lock()
+        
+        # 正在进行的AI请求 {提示词缓存键: Future}，相同提示词的并发请求共享同一个结果
+        self._ai_inflight = {}
+        self._ai_inflight_lock = threading.Lock()
+        
         # API密钥配置
         self.api_keys = self.config.get('api_keys', {})
         
@@ -91,105 +756,66 @@ class EnhancedStockAnalyzer:
         """加载JSON配置文件"""
         try:
             if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                self.logger.info(f"✅ 成功加载配置文件: {self.config_file}")
+                cache_key = (os.path.abspath(self.config_file), os.stat(self.config_file).st_mtime_ns)
+                config = _CONFIG_CACHE.get(cache_key)
+                if config is not None:
+                    return config
+                
+                # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，格式错误处理保持不变
+                if orjson is not None:
+                    with open(self.config_file, 'rb') as f:
+                        config = orjson.loads(f.read())
+                else:
+                    with open(self.config_file, 'r', encoding='utf-8') as f:
+                        config = json.load(f)
+                _CONFIG_CACHE[cache_key] = config
+                self.logger.info("✅ 成功加载配置文件: %s", self.config_file)
                 return config
             else:
-                self.logger.warning(f"⚠️ 配置文件 {self.config_file} 不存在，使用默认配置")
+                self.logger.warning("⚠️ 配置文件 %s 不存在，使用默认配置", self.config_file)
                 default_config = self._get_default_config()
                 self._save_config(default_config)
                 return default_config
                 
         except json.JSONDecodeError as e:
-            self.logger.error(f"❌ 配置文件格式错误: {e}")
+            self.logger.error("❌ 配置文件格式错误: %s", e)
             self.logger.info("使用默认配置并备份错误文件")
             
             if os.path.exists(self.config_file):
                 backup_name = f"{self.config_file}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
                 os.rename(self.config_file, backup_name)
-                self.logger.info(f"错误配置文件已备份为: {backup_name}")
+                self.logger.info("错误配置文件已备份为: %s", backup_name)
             
             default_config = self._get_default_config()
             self._save_config(default_config)
             return default_config
             
         except Exception as e:
-            self.logger.error(f"❌ 加载配置文件失败: {e}")
+            self.logger.error("❌ 加载配置文件失败: %s", e)
             return self._get_default_config()
 
     def _get_default_config(self):
         """获取默认配置"""
-        return {
-            "api_keys": {
-                "openai": "",
-                "anthropic": "",
-                "zhipu": "",
-                "notes": "请填入您的API密钥"
-            },
-            "ai": {
-                "model_preference": "openai",
-                "models": {
-                    "openai": "gpt-4o-mini",
-                    "anthropic": "claude-3-haiku-20240307",
-                    "zhipu": "chatglm_turbo"
-                },
-                "max_tokens": 6000,
-                "temperature": 0.7,
-                "api_base_urls": {
-                    "openai": "https://api.openai.com/v1",
-                    "notes": "如使用中转API，修改上述URL"
-                }
-            },
-            "analysis_weights": {
-                "technical": 0.4,
-                "fundamental": 0.4,
-                "sentiment": 0.2,
-                "notes": "权重总和应为1.0"
-            },
-            "cache": {
-                "price_hours": 1,
-                "fundamental_hours": 6,
-                "news_hours": 2
-            },
-            "streaming": {
-                "enabled": True,
-                "show_thinking": True,
-                "delay": 0.1
-            },
-            "analysis_params": {
-                "max_news_count": 200,
-                "technical_period_days": 365,
-                "financial_indicators_count": 25
-            },
-            "logging": {
-                "level": "INFO",
-                "file": "stock_analyzer.log"
-            },
-            "data_sources": {
-                "akshare_token": "",
-                "backup_sources": ["akshare"]
-            },
-            "ui": {
-                "theme": "default",
-                "language": "zh_CN",
-                "window_size": [1200, 800]
-            },
-            "_metadata": {
-                "version": "3.0.0",
-                "created": datetime.now().isoformat(),
-                "description": "增强版AI股票分析系统配置文件"
-            }
-        }
+        config = copy.deepcopy(_DEFAULT_CONFIG_TEMPLATE)
+        config["_metadata"]["created"] = datetime.now().isoformat()
+        return config
 
     def _save_config(self, config):
-        """保存配置到文件"""
+        """配置文件不存在时写入配置（首次运行，或损坏的文件已被备份改名），已有的配置文件不会被覆盖"""
+        if os.path.exists(self.config_file):
+            return
+        
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=4)
-            self.logger.info(f"✅ 配置文件已保存: {self.config_file}")
+            # 两种写法都使用2空格缩进，文件格式不随是否安装orjson变化
+            if orjson is not None:
+                with open(self.config_file, 'wb') as f:
+                    f.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.config_file, 'w', encoding='utf-8') as f:
+                    json.dump(config, f, ensure_ascii=False, indent=2)
+            self.logger.info("✅ 配置文件已保存: %s", self.config_file)
         except Exception as e:
-            self.logger.error(f"❌ 保存配置文件失败: {e}")
+            self.logger.error("❌ 保存配置文件失败: %s", e)
 
     def _log_config_status(self):
         """记录配置状态"""
@@ -202,29 +828,148 @@ class EnhancedStockAnalyzer:
                 available_apis.append(api_name)
         
         if available_apis:
-            self.logger.info(f"🤖 可用AI API: {', '.join(available_apis)}")
+            self.logger.info("🤖 可用AI API: %s", ', '.join(available_apis))
         else:
             self.logger.warning("⚠️ 未配置任何AI API密钥")
         
-        self.logger.info(f"📊 财务指标数量: {self.analysis_params['financial_indicators_count']}")
-        self.logger.info(f"📰 最大新闻数量: {self.analysis_params['max_news_count']}")
+        self.logger.info("📊 财务指标数量: %s", self.analysis_params['financial_indicators_count'])
+        self.logger.info("📰 最大新闻数量: %s", self.analysis_params['max_news_count'])
         self.logger.info("=" * 35)
 
+    def _disk_cache_path(self, kind, key):
+        """磁盘缓存文件路径：DataFrame类别为parquet文件，其余为JSON文件"""
+        extension = 'parquet' if kind in _DATAFRAME_CACHE_KINDS else 'json'
+        return os.path.join(self.disk_cache_dir, kind, f"{key}.{extension}")
+
+    def _load_disk_cache(self, kind, key, ttl):
+        """读取未过期的磁盘缓存，返回 (缓存时间, 数据)，没有可用缓存时返回None
+        
+        缓存时间换算为time.monotonic()时间轴，可直接放入内存缓存
+        """
+        if kind in _DATAFRAME_CACHE_KINDS and pyarrow is None:
+            return None
+        path = self._disk_cache_path(kind, key)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            if age >= ttl:
+                return None
+            if kind in _DATAFRAME_CACHE_KINDS:
+                data = pd.read_parquet(path, engine='pyarrow')
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = _load_cache_json(f.read())
+            return time.monotonic() - age, data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning("读取磁盘缓存失败 %s: %s", path, e)
+            return None
+
+    def _save_disk_cache(self, kind, key, data):
+        """写入磁盘缓存，文件修改时间即缓存时间"""
+        if kind in _DATAFRAME_CACHE_KINDS and pyarrow is None:
+            return
+        path = self._disk_cache_path(kind, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 先写临时文件再替换，避免其他进程读到写了一半的文件
+            tmp_path = f"{path}.tmp"
+            if kind in _DATAFRAME_CACHE_KINDS:
+                data.to_parquet(tmp_path, engine='pyarrow')
+            else:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(_dump_cache_json(data))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.logger.warning("写入磁盘缓存失败 %s: %s", path, e)
+
+    def _report_config_hash(self):
+        """影响分析结果的配置（权重、分析参数、AI配置）的摘要"""
+        relevant = {
+            'analysis_weights': self.analysis_weights,
+            'analysis_params': self.analysis_params,
+            'ai': self.config.get('ai', {}),
+        }
+        raw = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
+
+    def _connect_report_cache(self):
+        """打开报告缓存数据库（每次调用新建连接，供多个线程同时使用）"""
+        os.makedirs(self.disk_cache_dir, exist_ok=True)
+        conn = sqlite3.connect(self.report_cache_path, timeout=10)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            "stock_code TEXT, date TEXT, cfg_hash TEXT, report TEXT, ts INTEGER, "
+            "PRIMARY KEY (stock_code, date, cfg_hash))"
+        )
+        return conn
+
+    def _load_cached_report(self, stock_code, date, cfg_hash):
+        """读取当天相同配置下的分析报告，没有时返回None"""
+        try:
+            with closing(self._connect_report_cache()) as conn:
+                row = conn.execute(
+                    "SELECT report FROM reports WHERE stock_code = ? AND date = ? AND cfg_hash = ?",
+                    (stock_code, date, cfg_hash)
+                ).fetchone()
+            return _load_cache_json(row[0]) if row is not None else None
+        except Exception as e:
+            self.logger.warning("读取报告缓存失败: %s", e)
+            return None
+
+    def _save_cached_report(self, stock_code, date, cfg_hash, report):
+        """写入分析报告缓存"""
+        try:
+            data = _dump_cache_json(report)
+            with closing(self._connect_report_cache()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO reports (stock_code, date, cfg_hash, report, ts) VALUES (?, ?, ?, ?, ?)",
+                    (stock_code, date, cfg_hash, data, int(time.time()))
+                )
+        except Exception as e:
+            self.logger.warning("写入报告缓存失败: %s", e)
+
+    def _get_cached(self, cache, key, ttl):
+        """读取未过期的内存缓存并标记为最近使用，没有可用缓存时返回None"""
+        with self._cache_lock:
+            entry = cache.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                cache.move_to_end(key)
+                return entry[1]
+        return None
+
+    def _put_cached(self, cache, key, entry, max_entries):
+        """写入内存缓存 (缓存时间, 数据)，超出上限时淘汰最久未使用的条目"""
+        with self._cache_lock:
+            cache[key] = entry
+            cache.move_to_end(key)
+            while len(cache) > max_entries:
+                cache.popitem(last=False)
+
     def get_stock_data(self, stock_code, period='1y'):
         """获取股票价格数据"""
-        if stock_code in self.price_cache:
-            cache_time, data = self.price_cache[stock_code]
-            if datetime.now() - cache_time < self.cache_duration:
-                self.logger.info(f"使用缓存的价格数据: {stock_code}")
-                return data
+        # 缓存键包含历史数据天数，修改分析参数后不会复用长度不同的数据
+        cache_key = f"{stock_code}_{self.analysis_params['technical_period_days']}"
+        data = self._get_cached(self.price_cache, cache_key, self._price_cache_ttl)
+        if data is not None:
+            self.logger.info("使用缓存的价格数据: %s", stock_code)
+            return data
+        
+        cached = self._load_disk_cache('price', cache_key, self._price_cache_ttl)
+        if cached is not None:
+            self._put_cached(self.price_cache, cache_key, cached, self._price_cache_max)
+            self.logger.info("使用磁盘缓存的价格数据: %s", stock_code)
+            return cached[1]
 
         try:
-            import akshare as ak
+            if ak is None:
+                raise ImportError("未安装akshare，无法获取数据")
             
-            end_date = datetime.now().strftime('%Y%m%d')
-            start_date = (datetime.now() - timedelta(days=self.analysis_params['technical_period_days'])).strftime('%Y%m%d')
+            now = datetime.now()
+            end_date = now.strftime('%Y%m%d')
+            start_date = (now - timedelta(days=self.analysis_params['technical_period_days'])).strftime('%Y%m%d')
             
-            self.logger.info(f"正在获取 {stock_code} 的历史数据...")
+            self.logger.info("正在获取 %s 的历史数据...", stock_code)
             
             stock_data = ak.stock_zh_a_hist(
                 symbol=stock_code,
@@ -240,47 +985,41 @@ class EnhancedStockAnalyzer:
             # 智能处理列名映射 - 修复版本
             try:
                 actual_columns = len(stock_data.columns)
-                self.logger.info(f"获取到 {actual_columns} 列数据，列名: {list(stock_data.columns)}")
+                self.logger.info("获取到 %s 列数据，列名: %s", actual_columns, list(stock_data.columns))
                 
                 # 根据实际返回的列数进行映射
-                if actual_columns == 13:  # 包含code列的完整格式
-                    standard_columns = ['date', 'code', 'open', 'close', 'high', 'low', 'volume', 'turnover', 'amplitude', 'change_pct', 'change_amount', 'turnover_rate', 'extra']
-                elif actual_columns == 12:  # 包含code列
-                    standard_columns = ['date', 'code', 'open', 'close', 'high', 'low', 'volume', 'turnover', 'amplitude', 'change_pct', 'change_amount', 'turnover_rate']
-                elif actual_columns == 11:  # 不包含code列的标准格式
-                    standard_columns = ['date', 'open', 'close', 'high', 'low', 'volume', 'turnover', 'amplitude', 'change_pct', 'change_amount', 'turnover_rate']
-                elif actual_columns == 10:  # 简化格式
-                    standard_columns = ['date', 'open', 'close', 'high', 'low', 'volume', 'turnover', 'amplitude', 'change_pct', 'change_amount']
-                else:
+                standard_columns = _COLUMN_MAPS.get(actual_columns)
+                if standard_columns is None:
                     # 对于未知格式，尝试智能识别
                     standard_columns = [f'col_{i}' for i in range(actual_columns)]
-                    self.logger.warning(f"未知的列数格式 ({actual_columns} 列)，使用通用列名")
+                    self.logger.warning("未知的列数格式 (%s 列)，使用通用列名", actual_columns)
                 
-                # 创建列名映射
-                column_mapping = dict(zip(stock_data.columns, standard_columns))
-                stock_data = stock_data.rename(columns=column_mapping)
+                # 直接替换列名（原地修改，不复制数据）
+                stock_data.columns = list(standard_columns)
                 
-                self.logger.info(f"列名映射完成: {column_mapping}")
+                self.logger.info("列名映射完成: %s", list(standard_columns))
                 
             except Exception as e:
-                self.logger.warning(f"列名标准化失败: {e}，保持原列名")
+                self.logger.warning("列名标准化失败: %s，保持原列名", e)
             
             # 确保必要的列存在并且映射正确
             required_columns = ['close', 'open', 'high', 'low', 'volume']
             missing_columns = []
+            # 列名的小写形式只计算一次
+            lower_cols = [(c, c.lower()) for c in stock_data.columns]
             
             for col in required_columns:
                 if col not in stock_data.columns:
                     # 尝试找到相似的列名
-                    similar_cols = [c for c in stock_data.columns if col in c.lower() or c.lower() in col]
+                    similar_cols = [c for c, cl in lower_cols if col in cl or cl in col]
                     if similar_cols:
                         stock_data[col] = stock_data[similar_cols[0]]
-                        self.logger.info(f"✓ 映射列 {similar_cols[0]} -> {col}")
+                        self.logger.info("✓ 映射列 %s -> %s", similar_cols[0], col)
                     else:
                         missing_columns.append(col)
             
             if missing_columns:
-                self.logger.warning(f"缺少必要的列: {missing_columns}")
+                self.logger.warning("缺少必要的列: %s", missing_columns)
                 # 如果缺少必要列，尝试使用位置索引映射
                 if len(stock_data.columns) >= 6:  # 至少有6列才能进行位置映射
                     cols = list(stock_data.columns)
@@ -309,7 +1048,7 @@ class EnhancedStockAnalyzer:
                     
                     # 应用位置映射
                     stock_data = stock_data.rename(columns=position_mapping)
-                    self.logger.info(f"✓ 应用位置映射: {position_mapping}")
+                    self.logger.info("✓ 应用位置映射: %s", position_mapping)
             
             # 处理日期列
             try:
@@ -319,63 +1058,92 @@ class EnhancedStockAnalyzer:
                 else:
                     stock_data.index = pd.to_datetime(stock_data.index)
             except Exception as e:
-                self.logger.warning(f"日期处理失败: {e}")
+                self.logger.warning("日期处理失败: %s", e)
             
             # 确保数值列为数值类型
-            numeric_columns = ['open', 'close', 'high', 'low', 'volume']
-            for col in numeric_columns:
-                if col in stock_data.columns:
-                    try:
-                        stock_data[col] = pd.to_numeric(stock_data[col], errors='coerce')
-                    except:
-                        pass
+            numeric_columns = [c for c in ('open', 'close', 'high', 'low', 'volume') if c in stock_data.columns]
+            if numeric_columns:
+                stock_data[numeric_columns] = stock_data[numeric_columns].apply(pd.to_numeric, errors='coerce')
             
             # 验证数据质量
             if 'close' in stock_data.columns:
                 latest_close = stock_data['close'].iloc[-1]
                 latest_open = stock_data['open'].iloc[-1] if 'open' in stock_data.columns else 0
-                self.logger.info(f"✓ 数据验证 - 最新收盘价: {latest_close}, 最新开盘价: {latest_open}")
+                self.logger.info("✓ 数据验证 - 最新收盘价: %s, 最新开盘价: %s", latest_close, latest_open)
                 
                 # 检查收盘价是否合理
-                if pd.isna(latest_close) or latest_close <= 0:
-                    self.logger.error(f"❌ 收盘价数据异常: {latest_close}")
+                if math.isnan(latest_close) or latest_close <= 0:
+                    self.logger.error("❌ 收盘价数据异常: %s", latest_close)
                     raise ValueError(f"股票 {stock_code} 的收盘价数据异常")
             
             # 缓存数据
-            self.price_cache[stock_code] = (datetime.now(), stock_data)
+            self._put_cached(self.price_cache, cache_key, (time.monotonic(), stock_data), self._price_cache_max)
+            self._save_disk_cache('price', cache_key, stock_data)
             
-            self.logger.info(f"✓ 成功获取 {stock_code} 的价格数据，共 {len(stock_data)} 条记录")
-            self.logger.info(f"✓ 数据列: {list(stock_data.columns)}")
+            self.logger.info("✓ 成功获取 %s 的价格数据，共 %s 条记录", stock_code, len(stock_data))
+            self.logger.info("✓ 数据列: %s", list(stock_data.columns))
             
             return stock_data
             
         except Exception as e:
-            self.logger.error(f"获取股票数据失败: {str(e)}")
+            self.logger.error("获取股票数据失败: %s", e)
             return pd.DataFrame()
 
     def get_comprehensive_fundamental_data(self, stock_code):
         """获取25项综合财务指标数据"""
-        if stock_code in self.fundamental_cache:
-            cache_time, data = self.fundamental_cache[stock_code]
-            if datetime.now() - cache_time < self.fundamental_cache_duration:
-                self.logger.info(f"使用缓存的基本面数据: {stock_code}")
-                return data
+        data = self._get_cached(self.fundamental_cache, stock_code, self._fundamental_cache_ttl)
+        if data is not None:
+            self.logger.info("使用缓存的基本面数据: %s", stock_code)
+            return data
+        
+        cached = self._load_disk_cache('fundamental', stock_code, self._fundamental_cache_ttl)
+        if cached is not None:
+            self._put_cached(self.fundamental_cache, stock_code, cached, self._fundamental_cache_max)
+            self.logger.info("使用磁盘缓存的基本面数据: %s", stock_code)
+            return cached[1]
         
         try:
-            import akshare as ak
+            if ak is None:
+                raise ImportError("未安装akshare，无法获取数据")
             
             fundamental_data = {}
-            self.logger.info(f"开始获取 {stock_code} 的25项综合财务指标...")
+            self.logger.info("开始获取 %s 的25项综合财务指标...", stock_code)
+            
+            # 各数据源都是独立的网络请求，先全部并发发出，下面按原顺序逐项取结果处理
+            fetchers = {
+                'basic_info': lambda: ak.stock_individual_info_em(symbol=stock_code),
+                'income_statement': lambda: ak.stock_financial_abstract_ths(symbol=stock_code, indicator="按报告期"),
+                'analysis_indicator': lambda: ak.stock_financial_analysis_indicator(symbol=stock_code),
+                'cash_flow': lambda: ak.stock_cash_flow_sheet_by_report_em(symbol=stock_code),
+                'valuation': lambda: ak.stock_a_indicator_lg(symbol=stock_code),
+                'performance_forecast': lambda: ak.stock_yjbb_em(symbol=stock_code),
+                'dividend_info': lambda: ak.stock_fhpg_em(symbol=stock_code),
+                'industry_analysis': lambda: self._get_industry_analysis(stock_code),
+                'shareholders': lambda: ak.stock_zh_a_gdhs(symbol=stock_code),
+                'institutional_holdings': lambda: ak.stock_institutional_holding_detail(symbol=stock_code),
+            }
+            futures = {name: _FUNDAMENTAL_EXECUTOR.submit(fetch) for name, fetch in fetchers.items()}
+            # 所有数据项共用同一个截止时间，卡住的请求不会让整个分析无限等待
+            deadline = time.monotonic() + _FUNDAMENTAL_FETCH_TIMEOUT
+            timed_out = []
+            
+            def result(name):
+                """等待一个数据项的结果，超过截止时间时抛出TimeoutError（由各数据项按获取失败处理）"""
+                try:
+                    return futures[name].result(timeout=max(deadline - time.monotonic(), 0))
+                except FutureTimeoutError:
+                    timed_out.append(name)
+                    raise
             
             # 1. 基本信息
             try:
                 self.logger.info("正在获取股票基本信息...")
-                stock_info = ak.stock_individual_info_em(symbol=stock_code)
+                stock_info = result('basic_info')
                 info_dict = dict(zip(stock_info['item'], stock_info['value']))
                 fundamental_data['basic_info'] = info_dict
                 self.logger.info("✓ 股票基本信息获取成功")
             except Exception as e:
-                self.logger.warning(f"获取基本信息失败: {e}")
+                self.logger.warning("获取基本信息失败: %s", e)
                 fundamental_data['basic_info'] = {}
             
             # 2. 详细财务指标 - 25项核心指标
@@ -386,125 +1154,133 @@ class EnhancedStockAnalyzer:
                 # 获取主要财务数据
                 try:
                     # 利润表数据
-                    income_statement = ak.stock_financial_abstract_ths(symbol=stock_code, indicator="按报告期")
+                    income_statement = result('income_statement')
                     if not income_statement.empty:
-                        latest_income = income_statement.iloc[0].to_dict()
+                        latest_income = _row_to_dict(income_statement, 0)
                         financial_indicators.update(latest_income)
                 except Exception as e:
-                    self.logger.warning(f"获取利润表数据失败: {e}")
+                    self.logger.warning("获取利润表数据失败: %s", e)
                 
                 # 获取财务分析指标
                 try:
-                    balance_sheet = ak.stock_financial_analysis_indicator(symbol=stock_code)
+                    balance_sheet = result('analysis_indicator')
                     if not balance_sheet.empty:
-                        latest_balance = balance_sheet.iloc[-1].to_dict()
+                        latest_balance = _row_to_dict(balance_sheet, -1)
                         financial_indicators.update(latest_balance)
                 except Exception as e:
-                    self.logger.warning(f"获取财务分析指标失败: {e}")
+                    self.logger.warning("获取财务分析指标失败: %s", e)
                 
                 # 获取现金流量表
                 try:
-                    cash_flow = ak.stock_cash_flow_sheet_by_report_em(symbol=stock_code)
+                    cash_flow = result('cash_flow')
                     if not cash_flow.empty:
-                        latest_cash = cash_flow.iloc[-1].to_dict()
+                        latest_cash = _row_to_dict(cash_flow, -1)
                         financial_indicators.update(latest_cash)
                 except Exception as e:
-                    self.logger.warning(f"获取现金流量表失败: {e}")
+                    self.logger.warning("获取现金流量表失败: %s", e)
                 
                 # 计算25项核心财务指标
                 core_indicators = self._calculate_core_financial_indicators(financial_indicators)
                 fundamental_data['financial_indicators'] = core_indicators
                 
-                self.logger.info(f"✓ 获取到 {len(core_indicators)} 项财务指标")
+                self.logger.info("✓ 获取到 %s 项财务指标", len(core_indicators))
                 
             except Exception as e:
-                self.logger.warning(f"获取财务指标失败: {e}")
+                self.logger.warning("获取财务指标失败: %s", e)
                 fundamental_data['financial_indicators'] = {}
             
             # 3. 估值指标
             try:
                 self.logger.info("正在获取估值指标...")
-                valuation_data = ak.stock_a_indicator_lg(symbol=stock_code)
+                valuation_data = result('valuation')
                 if not valuation_data.empty:
-                    latest_valuation = valuation_data.iloc[-1].to_dict()
+                    latest_valuation = _row_to_dict(valuation_data, -1)
                     fundamental_data['valuation'] = latest_valuation
                     self.logger.info("✓ 估值指标获取成功")
                 else:
                     fundamental_data['valuation'] = {}
             except Exception as e:
-                self.logger.warning(f"获取估值指标失败: {e}")
+                self.logger.warning("获取估值指标失败: %s", e)
                 fundamental_data['valuation'] = {}
             
             # 4. 业绩预告和业绩快报
             try:
                 self.logger.info("正在获取业绩预告...")
-                performance_forecast = ak.stock_yjbb_em(symbol=stock_code)
+                performance_forecast = result('performance_forecast')
                 if not performance_forecast.empty:
-                    fundamental_data['performance_forecast'] = performance_forecast.head(10).to_dict('records')
+                    fundamental_data['performance_forecast'] = _df_to_records(performance_forecast, 10)
                     self.logger.info("✓ 业绩预告获取成功")
                 else:
                     fundamental_data['performance_forecast'] = []
             except Exception as e:
-                self.logger.warning(f"获取业绩预告失败: {e}")
+                self.logger.warning("获取业绩预告失败: %s", e)
                 fundamental_data['performance_forecast'] = []
             
             # 5. 分红配股信息
             try:
                 self.logger.info("正在获取分红配股信息...")
-                dividend_info = ak.stock_fhpg_em(symbol=stock_code)
+                dividend_info = result('dividend_info')
                 if not dividend_info.empty:
-                    fundamental_data['dividend_info'] = dividend_info.head(10).to_dict('records')
+                    fundamental_data['dividend_info'] = _df_to_records(dividend_info, 10)
                     self.logger.info("✓ 分红配股信息获取成功")
                 else:
                     fundamental_data['dividend_info'] = []
             except Exception as e:
-                self.logger.warning(f"获取分红配股信息失败: {e}")
+                self.logger.warning("获取分红配股信息失败: %s", e)
                 fundamental_data['dividend_info'] = []
             
             # 6. 行业分析
             try:
                 self.logger.info("正在获取行业分析数据...")
-                industry_analysis = self._get_industry_analysis(stock_code)
+                industry_analysis = result('industry_analysis')
                 fundamental_data['industry_analysis'] = industry_analysis
                 self.logger.info("✓ 行业分析数据获取成功")
             except Exception as e:
-                self.logger.warning(f"获取行业分析失败: {e}")
+                self.logger.warning("获取行业分析失败: %s", e)
                 fundamental_data['industry_analysis'] = {}
             
             # 7. 股东信息
             try:
                 self.logger.info("正在获取股东信息...")
-                shareholder_info = ak.stock_zh_a_gdhs(symbol=stock_code)
+                shareholder_info = result('shareholders')
                 if not shareholder_info.empty:
-                    fundamental_data['shareholders'] = shareholder_info.head(20).to_dict('records')
+                    fundamental_data['shareholders'] = _df_to_records(shareholder_info, 20)
                     self.logger.info("✓ 股东信息获取成功")
                 else:
                     fundamental_data['shareholders'] = []
             except Exception as e:
-                self.logger.warning(f"获取股东信息失败: {e}")
+                self.logger.warning("获取股东信息失败: %s", e)
                 fundamental_data['shareholders'] = []
             
             # 8. 机构持股
             try:
                 self.logger.info("正在获取机构持股信息...")
-                institutional_holdings = ak.stock_institutional_holding_detail(symbol=stock_code)
+                institutional_holdings = result('institutional_holdings')
                 if not institutional_holdings.empty:
-                    fundamental_data['institutional_holdings'] = institutional_holdings.head(20).to_dict('records')
+                    fundamental_data['institutional_holdings'] = _df_to_records(institutional_holdings, 20)
                     self.logger.info("✓ 机构持股信息获取成功")
                 else:
                     fundamental_data['institutional_holdings'] = []
             except Exception as e:
-                self.logger.warning(f"获取机构持股失败: {e}")
+                self.logger.warning("获取机构持股失败: %s", e)
                 fundamental_data['institutional_holdings'] = []
             
+            if timed_out:
+                # 还没开始执行的请求不再发出；数据不完整，不缓存，下次分析重新获取
+                for future in futures.values():
+                    future.cancel()
+                self.logger.warning("%s 以下基本面数据获取超时: %s", stock_code, ", ".join(timed_out))
+                return fundamental_data
+            
             # 缓存数据
-            self.fundamental_cache[stock_code] = (datetime.now(), fundamental_data)
-            self.logger.info(f"✓ {stock_code} 综合基本面数据获取完成并已缓存")
+            self._put_cached(self.fundamental_cache, stock_code, (time.monotonic(), fundamental_data), self._fundamental_cache_max)
+            self._save_disk_cache('fundamental', stock_code, fundamental_data)
+            self.logger.info("✓ %s 综合基本面数据获取完成并已缓存", stock_code)
             
             return fundamental_data
             
         except Exception as e:
-            self.logger.error(f"获取综合基本面数据失败: {str(e)}")
+            self.logger.error("获取综合基本面数据失败: %s", e)
             return {
                 'basic_info': {},
                 'financial_indicators': {},
@@ -519,58 +1295,17 @@ class EnhancedStockAnalyzer:
     def _calculate_core_financial_indicators(self, raw_data):
         """计算25项核心财务指标"""
         try:
-            indicators = {}
-            
-            # 从原始数据中安全获取数值
-            def safe_get(key, default=0):
-                value = raw_data.get(key, default)
-                try:
-                    return float(value) if value not in [None, '', 'nan'] else default
-                except:
-                    return default
-            
-            # 1-5: 盈利能力指标
-            indicators['净利润率'] = safe_get('净利润率')
-            indicators['净资产收益率'] = safe_get('净资产收益率')
-            indicators['总资产收益率'] = safe_get('总资产收益率')
-            indicators['毛利率'] = safe_get('毛利率')
-            indicators['营业利润率'] = safe_get('营业利润率')
-            
-            # 6-10: 偿债能力指标
-            indicators['流动比率'] = safe_get('流动比率')
-            indicators['速动比率'] = safe_get('速动比率')
-            indicators['资产负债率'] = safe_get('资产负债率')
-            indicators['产权比率'] = safe_get('产权比率')
-            indicators['利息保障倍数'] = safe_get('利息保障倍数')
-            
-            # 11-15: 营运能力指标
-            indicators['总资产周转率'] = safe_get('总资产周转率')
-            indicators['存货周转率'] = safe_get('存货周转率')
-            indicators['应收账款周转率'] = safe_get('应收账款周转率')
-            indicators['流动资产周转率'] = safe_get('流动资产周转率')
-            indicators['固定资产周转率'] = safe_get('固定资产周转率')
-            
-            # 16-20: 发展能力指标
-            indicators['营收同比增长率'] = safe_get('营收同比增长率')
-            indicators['净利润同比增长率'] = safe_get('净利润同比增长率')
-            indicators['总资产增长率'] = safe_get('总资产增长率')
-            indicators['净资产增长率'] = safe_get('净资产增长率')
-            indicators['经营现金流增长率'] = safe_get('经营现金流增长率')
-            
-            # 21-25: 市场表现指标
-            indicators['市盈率'] = safe_get('市盈率')
-            indicators['市净率'] = safe_get('市净率')
-            indicators['市销率'] = safe_get('市销率')
-            indicators['PEG比率'] = safe_get('PEG比率')
-            indicators['股息收益率'] = safe_get('股息收益率')
+            # 核心指标与衍生计算所需的基础数据一次性转换为数值，无法转换的视为0
+            keys = _CORE_KEYS + _DERIVED_BASE_KEYS
+            values = pd.to_numeric(
+                pd.Series([raw_data.get(k) for k in keys], dtype=object), errors='coerce'
+            ).fillna(0.0).to_numpy(dtype=float)
+            indicators = dict(zip(_CORE_KEYS, values[:len(_CORE_KEYS)].tolist()))
             
             # 计算一些衍生指标
             try:
                 # 如果有基础数据，计算一些关键比率
-                revenue = safe_get('营业收入')
-                net_income = safe_get('净利润')
-                total_assets = safe_get('总资产')
-                shareholders_equity = safe_get('股东权益')
+                revenue, net_income, total_assets, shareholders_equity = values[len(_CORE_KEYS):].tolist()
                 
                 if revenue > 0 and net_income > 0:
                     if indicators['净利润率'] == 0:
@@ -585,35 +1320,91 @@ class EnhancedStockAnalyzer:
                         indicators['净资产收益率'] = (net_income / shareholders_equity) * 100
                         
             except Exception as e:
-                self.logger.warning(f"计算衍生指标失败: {e}")
+                self.logger.warning("计算衍生指标失败: %s", e)
             
             # 过滤掉无效的指标
-            valid_indicators = {k: v for k, v in indicators.items() if v not in [0, None, 'nan']}
+            valid_indicators = {k: v for k, v in indicators.items() if v != 0}
             
-            self.logger.info(f"✓ 成功计算 {len(valid_indicators)} 项有效财务指标")
+            self.logger.info("✓ 成功计算 %s 项有效财务指标", len(valid_indicators))
             return valid_indicators
             
         except Exception as e:
-            self.logger.error(f"计算核心财务指标失败: {e}")
+            self.logger.error("计算核心财务指标失败: %s", e)
             return {}
 
+    def _get_industry_index(self):
+        """获取 股票代码 -> 行业板块名称 的索引
+        
+        首次使用时并发获取所有行业板块的成分股构建，类级共享并写入磁盘缓存，24小时内复用；
+        有行业获取失败时索引不完整，不写入磁盘，只在内存中保留 _INDUSTRY_INDEX_PARTIAL_TTL 秒
+        """
+        entry = EnhancedStockAnalyzer._INDUSTRY_INDEX
+        if entry is not None and time.monotonic() - entry[0] < _INDUSTRY_INDEX_TTL:
+            return entry[1]
+        
+        with _INDUSTRY_INDEX_LOCK:
+            # 等锁期间可能已由其他线程构建完成
+            entry = EnhancedStockAnalyzer._INDUSTRY_INDEX
+            if entry is not None and time.monotonic() - entry[0] < _INDUSTRY_INDEX_TTL:
+                return entry[1]
+            
+            entry = self._load_disk_cache('industry', 'index', _INDUSTRY_INDEX_TTL)
+            if entry is None:
+                self.logger.info("正在构建行业成分股索引...")
+                boards = ak.stock_board_industry_name_em()['板块名称'].tolist()
+                
+                # 各行业的成分股并发获取，按板块顺序合并（同一只股票归入排在前面的板块）
+                executor = ThreadPoolExecutor(max_workers=_INDUSTRY_INDEX_WORKERS)
+                futures = [executor.submit(ak.stock_board_industry_cons_em, symbol=board) for board in boards]
+                executor.shutdown(wait=False)
+                
+                index = {}
+                complete = True
+                for board, future in zip(boards, futures):
+                    try:
+                        constituents = future.result()
+                    except Exception as e:
+                        self.logger.warning("获取行业 %s 成分股失败: %s", board, e)
+                        complete = False
+                        continue
+                    for code in constituents['代码'].astype(str).tolist():
+                        index.setdefault(code, board)
+                
+                if complete and index:
+                    self._save_disk_cache('industry', 'index', index)
+                    entry = (time.monotonic(), index)
+                    self.logger.info("✓ 行业成分股索引构建完成，共 %s 只股票", len(index))
+                else:
+                    # 不完整的索引不写入磁盘，只在内存中短暂复用，到期后重新构建
+                    entry = (time.monotonic() - _INDUSTRY_INDEX_TTL + _INDUSTRY_INDEX_PARTIAL_TTL, index)
+                    self.logger.warning("行业成分股索引不完整（%s 只股票），%s 秒后重新构建",
+                                        len(index), _INDUSTRY_INDEX_PARTIAL_TTL)
+            
+            EnhancedStockAnalyzer._INDUSTRY_INDEX = entry
+            return entry[1]
+
     def _get_industry_analysis(self, stock_code):
         """获取行业分析数据"""
         try:
-            import akshare as ak
+            if ak is None:
+                raise ImportError("未安装akshare，无法获取数据")
             
             industry_data = {}
             
-            # 获取行业信息
+            # 获取行业信息：通过成分股索引找到所属板块，再取该板块的行情数据
             try:
-                industry_info = ak.stock_board_industry_name_em()
-                stock_industry = industry_info[industry_info.iloc[:, 0].astype(str).str.contains(stock_code, na=False)]
-                if not stock_industry.empty:
-                    industry_data['industry_info'] = stock_industry.iloc[0].to_dict()
+                board = self._get_industry_index().get(stock_code)
+                if board:
+                    industry_info = ak.stock_board_industry_name_em()
+                    board_rows = industry_info[industry_info['板块名称'] == board]
+                    if not board_rows.empty:
+                        industry_data['industry_info'] = _row_to_dict(board_rows, 0)
+                    else:
+                        industry_data['industry_info'] = {'板块名称': board}
                 else:
                     industry_data['industry_info'] = {}
             except Exception as e:
-                self.logger.warning(f"获取行业信息失败: {e}")
+                self.logger.warning("获取行业信息失败: %s", e)
                 industry_data['industry_info'] = {}
             
             # 获取行业排名
@@ -622,36 +1413,46 @@ class EnhancedStockAnalyzer:
                 if not industry_rank.empty:
                     stock_rank = industry_rank[industry_rank.iloc[:, 1].astype(str).str.contains(stock_code, na=False)]
                     if not stock_rank.empty:
-                        industry_data['industry_rank'] = stock_rank.iloc[0].to_dict()
+                        industry_data['industry_rank'] = _row_to_dict(stock_rank, 0)
                     else:
                         industry_data['industry_rank'] = {}
                 else:
                     industry_data['industry_rank'] = {}
             except Exception as e:
-                self.logger.warning(f"获取行业排名失败: {e}")
+                self.logger.warning("获取行业排名失败: %s", e)
                 industry_data['industry_rank'] = {}
             
             return industry_data
             
         except Exception as e:
-            self.logger.warning(f"行业分析失败: {e}")
+            self.logger.warning("行业分析失败: %s", e)
             return {}
 
     def get_comprehensive_news_data(self, stock_code, days=30):
         """获取综合新闻数据（大幅增强）"""
         cache_key = f"{stock_code}_{days}"
-        if cache_key in self.news_cache:
-            cache_time, data = self.news_cache[cache_key]
-            if datetime.now() - cache_time < self.news_cache_duration:
-                self.logger.info(f"使用缓存的新闻数据: {stock_code}")
-                return data
+        data = self._get_cached(self.news_cache, cache_key, self._news_cache_ttl)
+        if data is not None:
+            self.logger.info("使用缓存的新闻数据: %s", stock_code)
+            return data
+        
+        # 旧版缓存中的新闻条目是dict，换用新的缓存目录避免读到旧格式
+        cached = self._load_disk_cache('news_items', cache_key, self._news_cache_ttl)
+        if cached is not None:
+            self._put_cached(self.news_cache, cache_key, cached, self._news_cache_max)
+            self.logger.info("使用磁盘缓存的新闻数据: %s", stock_code)
+            return cached[1]
         
-        self.logger.info(f"开始获取 {stock_code} 的综合新闻数据（最近{days}天）...")
+        self.logger.info("开始获取 %s 的综合新闻数据（最近%s天）...", stock_code, days)
         
         try:
-            import akshare as ak
+            if ak is None:
+                raise ImportError("未安装akshare，无法获取数据")
             
             stock_name = self.get_stock_name(stock_code)
+            # 本次获取只取一次当前时间：缺失日期的默认值和数据时间戳共用
+            fetch_time = datetime.now()
+            today = fetch_time.strftime('%Y-%m-%d')
             all_news_data = {
                 'company_news': [],
                 'announcements': [],
@@ -667,76 +1468,76 @@ class EnhancedStockAnalyzer:
                 company_news = ak.stock_news_em(symbol=stock_code)
                 if not company_news.empty:
                     # 处理新闻数据
-                    processed_news = []
-                    for _, row in company_news.head(50).iterrows():
-                        news_item = {
-                            'title': str(row.get(row.index[0], '')),  # 第一列通常是标题
-                            'content': str(row.get(row.index[1], '')) if len(row.index) > 1 else '',
-                            'date': str(row.get(row.index[2], '')) if len(row.index) > 2 else datetime.now().strftime('%Y-%m-%d'),
-                            'source': 'eastmoney',
-                            'url': str(row.get(row.index[3], '')) if len(row.index) > 3 else '',
-                            'relevance_score': 1.0
-                        }
-                        processed_news.append(news_item)
+                    # 按列整体取值，第一列通常是标题
+                    company_news = company_news.head(50)
+                    processed_news = [
+                        NewsItem(title, content, date, 'eastmoney', url, 1.0)
+                        for title, content, date, url in zip(
+                            _str_column(company_news, 0, ''),
+                            _str_column(company_news, 1, ''),
+                            _str_column(company_news, 2, today),
+                            _str_column(company_news, 3, '')
+                        )
+                    ]
                     
                     all_news_data['company_news'] = processed_news
-                    self.logger.info(f"✓ 获取公司新闻 {len(processed_news)} 条")
+                    self.logger.info("✓ 获取公司新闻 %s 条", len(processed_news))
                 else:
                     self.logger.info("公司新闻数据为空")
             except Exception as e:
-                self.logger.warning(f"获取公司新闻失败: {e}")
+                self.logger.warning("获取公司新闻失败: %s", e)
             
             # 2. 公司公告
             try:
                 self.logger.info("正在获取公司公告...")
                 announcements = ak.stock_zh_a_alerts_cls(symbol=stock_code)
                 if not announcements.empty:
-                    processed_announcements = []
-                    for _, row in announcements.head(30).iterrows():
-                        announcement = {
-                            'title': str(row.get(row.index[0], '')),
-                            'content': str(row.get(row.index[1], '')) if len(row.index) > 1 else '',
-                            'date': str(row.get(row.index[2], '')) if len(row.index) > 2 else datetime.now().strftime('%Y-%m-%d'),
-                            'type': str(row.get(row.index[3], '')) if len(row.index) > 3 else '公告',
-                            'relevance_score': 1.0
-                        }
-                        processed_announcements.append(announcement)
+                    announcements = announcements.head(30)
+                    processed_announcements = [
+                        AnnouncementItem(title, content, date, announcement_type, 1.0)
+                        for title, content, date, announcement_type in zip(
+                            _str_column(announcements, 0, ''),
+                            _str_column(announcements, 1, ''),
+                            _str_column(announcements, 2, today),
+                            _str_column(announcements, 3, '公告')
+                        )
+                    ]
                     
                     all_news_data['announcements'] = processed_announcements
-                    self.logger.info(f"✓ 获取公司公告 {len(processed_announcements)} 条")
+                    self.logger.info("✓ 获取公司公告 %s 条", len(processed_announcements))
             except Exception as e:
-                self.logger.warning(f"获取公司公告失败: {e}")
+                self.logger.warning("获取公司公告失败: %s", e)
             
             # 3. 研究报告
             try:
                 self.logger.info("正在获取研究报告...")
                 research_reports = ak.stock_research_report_em(symbol=stock_code)
                 if not research_reports.empty:
-                    processed_reports = []
-                    for _, row in research_reports.head(20).iterrows():
-                        report = {
-                            'title': str(row.get(row.index[0], '')),
-                            'institution': str(row.get(row.index[1], '')) if len(row.index) > 1 else '',
-                            'rating': str(row.get(row.index[2], '')) if len(row.index) > 2 else '',
-                            'target_price': str(row.get(row.index[3], '')) if len(row.index) > 3 else '',
-                            'date': str(row.get(row.index[4], '')) if len(row.index) > 4 else datetime.now().strftime('%Y-%m-%d'),
-                            'relevance_score': 0.9
-                        }
-                        processed_reports.append(report)
+                    research_reports = research_reports.head(20)
+                    processed_reports = [
+                        ResearchReportItem(title, institution, rating, target_price, date, 0.9)
+                        for title, institution, rating, target_price, date in zip(
+                            _str_column(research_reports, 0, ''),
+                            _str_column(research_reports, 1, ''),
+                            _str_column(research_reports, 2, ''),
+                            _str_column(research_reports, 3, ''),
+                            _str_column(research_reports, 4, today)
+                        )
+                    ]
                     
                     all_news_data['research_reports'] = processed_reports
-                    self.logger.info(f"✓ 获取研究报告 {len(processed_reports)} 条")
+                    self.logger.info("✓ 获取研究报告 %s 条", len(processed_reports))
             except Exception as e:
-                self.logger.warning(f"获取研究报告失败: {e}")
+                self.logger.warning("获取研究报告失败: %s", e)
             
             # 4. 行业新闻
             try:
                 self.logger.info("正在获取行业新闻...")
                 industry_news = self._get_comprehensive_industry_news(stock_code, days)
                 all_news_data['industry_news'] = industry_news
-                self.logger.info(f"✓ 获取行业新闻 {len(industry_news)} 条")
+                self.logger.info("✓ 获取行业新闻 %s 条", len(industry_news))
             except Exception as e:
-                self.logger.warning(f"获取行业新闻失败: {e}")
+                self.logger.warning("获取行业新闻失败: %s", e)
             
             # 5. 新闻摘要统计
             try:
@@ -751,20 +1552,21 @@ class EnhancedStockAnalyzer:
                     'announcements_count': len(all_news_data['announcements']),
                     'research_reports_count': len(all_news_data['research_reports']),
                     'industry_news_count': len(all_news_data['industry_news']),
-                    'data_freshness': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    'data_freshness': fetch_time.strftime('%Y-%m-%d %H:%M:%S')
                 }
                 
             except Exception as e:
-                self.logger.warning(f"生成新闻摘要失败: {e}")
+                self.logger.warning("生成新闻摘要失败: %s", e)
             
             # 缓存数据
-            self.news_cache[cache_key] = (datetime.now(), all_news_data)
+            self._put_cached(self.news_cache, cache_key, (time.monotonic(), all_news_data), self._news_cache_max)
+            self._save_disk_cache('news_items', cache_key, all_news_data)
             
-            self.logger.info(f"✓ 综合新闻数据获取完成，总计 {all_news_data['news_summary'].get('total_news_count', 0)} 条")
+            self.logger.info("✓ 综合新闻数据获取完成，总计 %s 条", all_news_data['news_summary'].get('total_news_count', 0))
             return all_news_data
             
         except Exception as e:
-            self.logger.error(f"获取综合新闻数据失败: {str(e)}")
+            self.logger.error("获取综合新闻数据失败: %s", e)
             return {
                 'company_news': [],
                 'announcements': [],
@@ -778,18 +1580,18 @@ class EnhancedStockAnalyzer:
         """获取详细的行业新闻"""
         try:
             # 这里可以根据实际需要扩展行业新闻获取逻辑
-            # 目前返回一个示例结构
+            # 目前返回一个示例结构，条目使用 NewsItem
             industry_news = []
             
             # 可以添加更多的行业新闻源
             # 比如获取同行业其他公司的新闻
             # 获取行业政策新闻等
             
-            self.logger.info(f"行业新闻获取完成，共 {len(industry_news)} 条")
+            self.logger.info("行业新闻获取完成，共 %s 条", len(industry_news))
             return industry_news
             
         except Exception as e:
-            self.logger.warning(f"获取行业新闻失败: {e}")
+            self.logger.warning("获取行业新闻失败: %s", e)
             return []
 
     def calculate_advanced_sentiment_analysis(self, comprehensive_news_data):
@@ -797,95 +1599,58 @@ class EnhancedStockAnalyzer:
         self.logger.info("开始高级情绪分析...")
         
         try:
-            # 准备所有新闻文本
-            all_texts = []
-            
-            # 收集所有新闻文本
-            for news in comprehensive_news_data.get('company_news', []):
-                text = f"{news.get('title', '')} {news.get('content', '')}"
-                all_texts.append({'text': text, 'type': 'company_news', 'weight': 1.0})
-            
-            for announcement in comprehensive_news_data.get('announcements', []):
-                text = f"{announcement.get('title', '')} {announcement.get('content', '')}"
-                all_texts.append({'text': text, 'type': 'announcement', 'weight': 1.2})  # 公告权重更高
-            
-            for report in comprehensive_news_data.get('research_reports', []):
-                text = f"{report.get('title', '')} {report.get('rating', '')}"
-                all_texts.append({'text': text, 'type': 'research_report', 'weight': 0.9})
-            
-            for news in comprehensive_news_data.get('industry_news', []):
-                text = f"{news.get('title', '')} {news.get('content', '')}"
-                all_texts.append({'text': text, 'type': 'industry_news', 'weight': 0.7})
+            # 收集所有新闻文本: (文本, 类型下标, 权重)
+            all_texts = [
+                (f"{item.title} {getattr(item, detail_field)}", type_index, weight)
+                for type_index, (news_key, detail_field, weight) in enumerate(_SENTIMENT_SOURCES)
+                for item in comprehensive_news_data.get(news_key, [])
+            ]
             
             if not all_texts:
-                return {
-                    'overall_sentiment': 0.0,
-                    'sentiment_by_type': {},
-                    'sentiment_trend': '中性',
-                    'confidence_score': 0.0,
-                    'total_analyzed': 0
-                }
-            
-            # 扩展的情绪词典
-            positive_words = {
-                '上涨', '涨停', '利好', '突破', '增长', '盈利', '收益', '回升', '强势', '看好',
-                '买入', '推荐', '优秀', '领先', '创新', '发展', '机会', '潜力', '稳定', '改善',
-                '提升', '超预期', '积极', '乐观', '向好', '受益', '龙头', '热点', '爆发', '翻倍',
-                '业绩', '增收', '扩张', '合作', '签约', '中标', '获得', '成功', '完成', '达成'
-            }
-            
-            negative_words = {
-                '下跌', '跌停', '利空', '破位', '下滑', '亏损', '风险', '回调', '弱势', '看空',
-                '卖出', '减持', '较差', '落后', '滞后', '困难', '危机', '担忧', '悲观', '恶化',
-                '下降', '低于预期', '消极', '压力', '套牢', '被套', '暴跌', '崩盘', '踩雷', '退市',
-                '违规', '处罚', '调查', '停牌', '亏损', '债务', '违约', '诉讼', '纠纷', '问题'
-            }
-            
-            # 分析每类新闻的情绪
-            sentiment_by_type = {}
-            overall_scores = []
-            
-            for text_data in all_texts:
-                try:
-                    text = text_data['text']
-                    text_type = text_data['type']
-                    weight = text_data['weight']
-                    
-                    if not text.strip():
-                        continue
-                    
-                    # 简单分词（可以用jieba替换）
-                    words = list(text)  # 简化版分词
-                    
-                    positive_count = sum(1 for word in positive_words if word in text)
-                    negative_count = sum(1 for word in negative_words if word in text)
-                    
-                    # 计算情绪得分
-                    total_sentiment_words = positive_count + negative_count
-                    if total_sentiment_words > 0:
-                        sentiment_score = (positive_count - negative_count) / total_sentiment_words
-                    else:
-                        sentiment_score = 0.0
-                    
-                    # 应用权重
-                    weighted_score = sentiment_score * weight
-                    overall_scores.append(weighted_score)
-                    
-                    # 按类型统计
-                    if text_type not in sentiment_by_type:
-                        sentiment_by_type[text_type] = []
-                    sentiment_by_type[text_type].append(weighted_score)
-                    
-                except Exception as e:
+                return _empty_sentiment_result('中性')
+            
+            # 分析每类新闻的情绪：按类型在线累加得分和条数，不保存逐条得分
+            type_sums = [0.0] * len(_SENTIMENT_TYPES)
+            type_counts = [0] * len(_SENTIMENT_TYPES)
+            total_score = 0.0
+            positive_items = 0
+            negative_items = 0
+            
+            for text, type_index, weight in all_texts:
+                # 标题和内容都为空白的条目不参与评分（仍计入分析总数）
+                # 拼接的文本至少包含一个空格，不会是空字符串，isspace即可判断
+                if text.isspace():
                     continue
+                
+                # 一次扫描统计出现的正面/负面情绪词
+                positive_count, negative_count = sentiment.count_sentiment_words(text)
+                
+                # 计算情绪得分
+                total_sentiment_words = positive_count + negative_count
+                if total_sentiment_words > 0:
+                    sentiment_score = (positive_count - negative_count) / total_sentiment_words
+                else:
+                    sentiment_score = 0.0
+                
+                # 应用权重
+                weighted_score = sentiment_score * weight
+                type_sums[type_index] += weighted_score
+                type_counts[type_index] += 1
+                total_score += weighted_score
+                if weighted_score > 0:
+                    positive_items += 1
+                elif weighted_score < 0:
+                    negative_items += 1
             
             # 计算总体情绪
-            overall_sentiment = sum(overall_scores) / len(overall_scores) if overall_scores else 0.0
+            analyzed = sum(type_counts)
+            overall_sentiment = total_score / analyzed if analyzed else 0.0
             
             # 计算各类型平均情绪
-            avg_sentiment_by_type = {}
-            for text_type, scores in sentiment_by_type.items():
-                avg_sentiment_by_type[text_type] = sum(scores) / len(scores) if scores else 0.0
+            avg_sentiment_by_type = {
+                text_type: type_sums[i] / type_counts[i]
+                for i, text_type in enumerate(_SENTIMENT_TYPES) if type_counts[i]
+            }
             
             # 判断情绪趋势
             if overall_sentiment > 0.3:
@@ -908,145 +1673,120 @@ class EnhancedStockAnalyzer:
                 'sentiment_trend': sentiment_trend,
                 'confidence_score': confidence_score,
                 'total_analyzed': len(all_texts),
-                'type_distribution': {k: len(v) for k, v in sentiment_by_type.items()},
-                'positive_ratio': len([s for s in overall_scores if s > 0]) / len(overall_scores) if overall_scores else 0,
-                'negative_ratio': len([s for s in overall_scores if s < 0]) / len(overall_scores) if overall_scores else 0
+                'type_distribution': {
+                    text_type: type_counts[i]
+                    for i, text_type in enumerate(_SENTIMENT_TYPES) if type_counts[i]
+                },
+                'positive_ratio': positive_items / analyzed if analyzed else 0,
+                'negative_ratio': negative_items / analyzed if analyzed else 0
             }
             
-            self.logger.info(f"✓ 高级情绪分析完成: {sentiment_trend} (得分: {overall_sentiment:.3f})")
+            self.logger.info("✓ 高级情绪分析完成: %s (得分: %.3f)", sentiment_trend, overall_sentiment)
             return result
             
         except Exception as e:
-            self.logger.error(f"高级情绪分析失败: {e}")
-            return {
-                'overall_sentiment': 0.0,
-                'sentiment_by_type': {},
-                'sentiment_trend': '分析失败',
-                'confidence_score': 0.0,
-                'total_analyzed': 0
-            }
+            self.logger.error("高级情绪分析失败: %s", e)
+            return _empty_sentiment_result('分析失败')
 
-    def calculate_technical_indicators(self, price_data):
-        """计算技术指标"""
+    def calculate_technical_indicators(self, price_data, stock_code=None):
+        """计算技术指标
+        
+        传入 stock_code 时按 (股票代码, K线数量, 最后一根K线的日期和收盘价) 缓存结果，
+        同一份行情重复分析（如收盘后多次分析同一只股票）时不再重新计算。
+        """
         try:
             if price_data.empty:
                 return self._get_default_technical_analysis()
             
-            technical_analysis = {}
+            cache_key = None
+            if stock_code is not None:
+                cache_key = (stock_code, len(price_data), str(price_data.index[-1]),
+                             float(price_data['close'].iat[-1]))
+                cached = self._get_cached(self.technical_cache, cache_key, self._price_cache_ttl)
+                if cached is not None:
+                    return dict(cached)
+            
+            # 收盘价/成交量只转换一次为float64数组，一次内核调用得到所有指标的最新值
+            close = price_data['close'].to_numpy(dtype=np.float64)
+            if 'volume' in price_data.columns:
+                volume = price_data['volume'].to_numpy(dtype=np.float64)
+            else:
+                volume = np.full(len(close), np.nan)
+            (ma5, ma10, ma20, rsi_value, current_hist, prev_hist,
+             bb_upper_val, bb_lower_val, avg_volume) = indicators.technical_snapshot(close, volume)
             
             # 移动平均线
-            try:
-                price_data['ma5'] = price_data['close'].rolling(window=5, min_periods=1).mean()
-                price_data['ma10'] = price_data['close'].rolling(window=10, min_periods=1).mean()
-                price_data['ma20'] = price_data['close'].rolling(window=20, min_periods=1).mean()
-                price_data['ma60'] = price_data['close'].rolling(window=60, min_periods=1).mean()
-                
-                latest_price = float(price_data['close'].iloc[-1])
-                ma5 = float(price_data['ma5'].iloc[-1]) if not pd.isna(price_data['ma5'].iloc[-1]) else latest_price
-                ma10 = float(price_data['ma10'].iloc[-1]) if not pd.isna(price_data['ma10'].iloc[-1]) else latest_price
-                ma20 = float(price_data['ma20'].iloc[-1]) if not pd.isna(price_data['ma20'].iloc[-1]) else latest_price
-                
-                if latest_price > ma5 > ma10 > ma20:
-                    technical_analysis['ma_trend'] = '多头排列'
-                elif latest_price < ma5 < ma10 < ma20:
-                    technical_analysis['ma_trend'] = '空头排列'
-                else:
-                    technical_analysis['ma_trend'] = '震荡整理'
-                
-            except Exception as e:
-                technical_analysis['ma_trend'] = '计算失败'
+            latest_price = float(close[-1])
+            ma5 = float(ma5) if not math.isnan(ma5) else latest_price
+            ma10 = float(ma10) if not math.isnan(ma10) else latest_price
+            ma20 = float(ma20) if not math.isnan(ma20) else latest_price
+            
+            if latest_price > ma5 > ma10 > ma20:
+                ma_trend = '多头排列'
+            elif latest_price < ma5 < ma10 < ma20:
+                ma_trend = '空头排列'
+            else:
+                ma_trend = '震荡整理'
             
             # RSI指标
-            try:
-                def calculate_rsi(prices, window=14):
-                    delta = prices.diff()
-                    gain = (delta.where(delta > 0, 0)).rolling(window=window, min_periods=1).mean()
-                    loss = (-delta.where(delta < 0, 0)).rolling(window=window, min_periods=1).mean()
-                    rs = gain / loss
-                    rsi = 100 - (100 / (1 + rs))
-                    return rsi
-                
-                rsi_series = calculate_rsi(price_data['close'])
-                technical_analysis['rsi'] = float(rsi_series.iloc[-1]) if not pd.isna(rsi_series.iloc[-1]) else 50.0
-                
-            except Exception as e:
-                technical_analysis['rsi'] = 50.0
+            rsi = float(rsi_value) if not math.isnan(rsi_value) else 50.0
             
             # MACD指标
-            try:
-                ema12 = price_data['close'].ewm(span=12, min_periods=1).mean()
-                ema26 = price_data['close'].ewm(span=26, min_periods=1).mean()
-                macd_line = ema12 - ema26
-                signal_line = macd_line.ewm(span=9, min_periods=1).mean()
-                histogram = macd_line - signal_line
-                
-                if len(histogram) >= 2:
-                    current_hist = float(histogram.iloc[-1])
-                    prev_hist = float(histogram.iloc[-2])
-                    
-                    if current_hist > prev_hist and current_hist > 0:
-                        technical_analysis['macd_signal'] = '金叉向上'
-                    elif current_hist < prev_hist and current_hist < 0:
-                        technical_analysis['macd_signal'] = '死叉向下'
-                    else:
-                        technical_analysis['macd_signal'] = '横盘整理'
+            if len(close) >= 2:
+                if current_hist > prev_hist and current_hist > 0:
+                    macd_signal = '金叉向上'
+                elif current_hist < prev_hist and current_hist < 0:
+                    macd_signal = '死叉向下'
                 else:
-                    technical_analysis['macd_signal'] = '数据不足'
-                
-            except Exception as e:
-                technical_analysis['macd_signal'] = '计算失败'
+                    macd_signal = '横盘整理'
+            else:
+                macd_signal = '数据不足'
             
             # 布林带
-            try:
-                bb_window = min(20, len(price_data))
-                bb_middle = price_data['close'].rolling(window=bb_window, min_periods=1).mean()
-                bb_std = price_data['close'].rolling(window=bb_window, min_periods=1).std()
-                bb_upper = bb_middle + 2 * bb_std
-                bb_lower = bb_middle - 2 * bb_std
-                
-                latest_close = float(price_data['close'].iloc[-1])
-                bb_upper_val = float(bb_upper.iloc[-1])
-                bb_lower_val = float(bb_lower.iloc[-1])
-                
-                if bb_upper_val != bb_lower_val:
-                    bb_position = (latest_close - bb_lower_val) / (bb_upper_val - bb_lower_val)
-                else:
-                    bb_position = 0.5
-                
-                technical_analysis['bb_position'] = bb_position
-                
-            except Exception as e:
-                technical_analysis['bb_position'] = 0.5
+            if bb_upper_val != bb_lower_val:
+                bb_position = (latest_price - bb_lower_val) / (bb_upper_val - bb_lower_val)
+            else:
+                bb_position = 0.5
             
             # 成交量分析
             try:
-                volume_window = min(20, len(price_data))
-                avg_volume = price_data['volume'].rolling(window=volume_window, min_periods=1).mean().iloc[-1]
-                recent_volume = float(price_data['volume'].iloc[-1])
+                if 'volume' not in price_data.columns:
+                    raise KeyError('volume')
+                recent_volume = float(volume[-1])
                 
                 if 'change_pct' in price_data.columns:
-                    price_change = float(price_data['change_pct'].iloc[-1])
-                elif len(price_data) >= 2:
-                    current_price = float(price_data['close'].iloc[-1])
-                    prev_price = float(price_data['close'].iloc[-2])
-                    price_change = ((current_price - prev_price) / prev_price) * 100
+                    price_change = float(price_data['change_pct'].iat[-1])
+                elif len(close) >= 2:
+                    prev_price = float(close[-2])
+                    price_change = ((latest_price - prev_price) / prev_price) * 100
                 else:
                     price_change = 0
                 
                 if recent_volume > avg_volume * 1.5:
-                    technical_analysis['volume_status'] = '放量上涨' if price_change > 0 else '放量下跌'
+                    volume_status = '放量上涨' if price_change > 0 else '放量下跌'
                 elif recent_volume < avg_volume * 0.5:
-                    technical_analysis['volume_status'] = '缩量调整'
+                    volume_status = '缩量调整'
                 else:
-                    technical_analysis['volume_status'] = '温和放量'
+                    volume_status = '温和放量'
                 
             except Exception as e:
-                technical_analysis['volume_status'] = '数据不足'
+                volume_status = '数据不足'
             
-            return technical_analysis
+            # 固定字段的结果在最后一次构建；结果会写入报告并序列化为JSON，保持为dict
+            result = {
+                'ma_trend': ma_trend,
+                'rsi': rsi,
+                'macd_signal': macd_signal,
+                'bb_position': float(bb_position),
+                'volume_status': volume_status
+            }
+            if cache_key is not None:
+                self._put_cached(self.technical_cache, cache_key, (time.monotonic(), dict(result)),
+                                 self._price_cache_max)
+            return result
             
         except Exception as e:
-            self.logger.error(f"技术指标计算失败: {str(e)}")
+            self.logger.error("技术指标计算失败: %s", e)
             return self._get_default_technical_analysis()
 
     def _get_default_technical_analysis(self):
@@ -1062,47 +1802,18 @@ class EnhancedStockAnalyzer:
     def calculate_technical_score(self, technical_analysis):
         """计算技术分析得分"""
         try:
-            score = 50
-            
-            ma_trend = technical_analysis.get('ma_trend', '数据不足')
-            if ma_trend == '多头排列':
-                score += 20
-            elif ma_trend == '空头排列':
-                score -= 20
-            
-            rsi = technical_analysis.get('rsi', 50)
-            if 30 <= rsi <= 70:
-                score += 10
-            elif rsi < 30:
-                score += 5
-            elif rsi > 70:
-                score -= 5
-            
-            macd_signal = technical_analysis.get('macd_signal', '横盘整理')
-            if macd_signal == '金叉向上':
-                score += 15
-            elif macd_signal == '死叉向下':
-                score -= 15
-            
-            bb_position = technical_analysis.get('bb_position', 0.5)
-            if 0.2 <= bb_position <= 0.8:
-                score += 5
-            elif bb_position < 0.2:
-                score += 10
-            elif bb_position > 0.8:
-                score -= 5
-            
-            volume_status = technical_analysis.get('volume_status', '数据不足')
-            if '放量上涨' in volume_status:
-                score += 10
-            elif '放量下跌' in volume_status:
-                score -= 10
+            score = (50
+                     + _MA_TREND_DELTA.get(technical_analysis.get('ma_trend'), 0)
+                     + _rsi_delta(technical_analysis.get('rsi', 50))
+                     + _MACD_SIGNAL_DELTA.get(technical_analysis.get('macd_signal'), 0)
+                     + _bb_delta(technical_analysis.get('bb_position', 0.5))
+                     + _VOLUME_STATUS_DELTA.get(technical_analysis.get('volume_status'), 0))
             
             score = max(0, min(100, score))
             return score
             
         except Exception as e:
-            self.logger.error(f"技术分析评分失败: {str(e)}")
+            self.logger.error("技术分析评分失败: %s", e)
             return 50
 
     def calculate_fundamental_score(self, fundamental_data):
@@ -1154,58 +1865,49 @@ class EnhancedStockAnalyzer:
             return score
             
         except Exception as e:
-            self.logger.error(f"基本面评分失败: {str(e)}")
+            self.logger.error("基本面评分失败: %s", e)
             return 50
 
     def calculate_sentiment_score(self, sentiment_analysis):
         """计算情绪分析得分"""
         try:
-            overall_sentiment = sentiment_analysis.get('overall_sentiment', 0.0)
-            confidence_score = sentiment_analysis.get('confidence_score', 0.0)
-            total_analyzed = sentiment_analysis.get('total_analyzed', 0)
-            
-            # 基础得分：将情绪得分从[-1,1]映射到[0,100]
-            base_score = (overall_sentiment + 1) * 50
-            
-            # 置信度调整
-            confidence_adjustment = confidence_score * 10
-            
-            # 新闻数量调整
-            news_adjustment = min(total_analyzed / 100, 1.0) * 10
-            
-            final_score = base_score + confidence_adjustment + news_adjustment
-            final_score = max(0, min(100, final_score))
-            
-            return final_score
+            # 字典取值留在Python中，纯数值计算交给编译内核
+            return indicators.sentiment_score(
+                float(sentiment_analysis.get('overall_sentiment', 0.0)),
+                float(sentiment_analysis.get('confidence_score', 0.0)),
+                float(sentiment_analysis.get('total_analyzed', 0))
+            )
             
         except Exception as e:
-            self.logger.error(f"情绪得分计算失败: {e}")
+            self.logger.error("情绪得分计算失败: %s", e)
             return 50
 
     def calculate_comprehensive_score(self, scores):
         """计算综合得分"""
         try:
-            technical_score = scores.get('technical', 50)
-            fundamental_score = scores.get('fundamental', 50)
-            sentiment_score = scores.get('sentiment', 50)
-            
-            comprehensive_score = (
-                technical_score * self.analysis_weights['technical'] +
-                fundamental_score * self.analysis_weights['fundamental'] +
-                sentiment_score * self.analysis_weights['sentiment']
+            weights = self.analysis_weights
+            return indicators.comprehensive_score(
+                float(scores.get('technical', 50)),
+                float(scores.get('fundamental', 50)),
+                float(scores.get('sentiment', 50)),
+                float(weights['technical']),
+                float(weights['fundamental']),
+                float(weights['sentiment'])
             )
             
-            comprehensive_score = max(0, min(100, comprehensive_score))
-            return comprehensive_score
-            
         except Exception as e:
-            self.logger.error(f"计算综合得分失败: {e}")
+            self.logger.error("计算综合得分失败: %s", e)
             return 50
 
     def get_stock_name(self, stock_code):
-        """获取股票名称"""
+        """获取股票名称（成功获取的名称缓存24小时）"""
+        stock_name = self._get_cached(self.name_cache, stock_code, _STOCK_NAME_TTL)
+        if stock_name is not None:
+            return stock_name
+        
         try:
-            import akshare as ak
+            if ak is None:
+                raise ImportError("未安装akshare，无法获取数据")
             
             try:
                 stock_info = ak.stock_individual_info_em(symbol=stock_code)
@@ -1213,14 +1915,15 @@ class EnhancedStockAnalyzer:
                     info_dict = dict(zip(stock_info['item'], stock_info['value']))
                     stock_name = info_dict.get('股票简称', stock_code)
                     if stock_name and stock_name != stock_code:
+                        self._put_cached(self.name_cache, stock_code, (time.monotonic(), stock_name), _STOCK_NAME_CACHE_MAX)
                         return stock_name
             except Exception as e:
-                self.logger.warning(f"获取股票名称失败: {e}")
+                self.logger.warning("获取股票名称失败: %s", e)
             
             return stock_code
             
         except Exception as e:
-            self.logger.warning(f"获取股票名称时出错: {e}")
+            self.logger.warning("获取股票名称时出错: %s", e)
             return stock_code
 
     def get_price_info(self, price_data):
@@ -1235,23 +1938,26 @@ class EnhancedStockAnalyzer:
                     'volatility': 0.0
                 }
             
-            # 获取最新数据
-            latest = price_data.iloc[-1]
+            # 收盘价只转换一次为数组，最新/前一日价格直接按位置取值，不再构造整行Series
+            close_values = price_data['close'].to_numpy(dtype=np.float64)
             
             # 确保使用收盘价作为当前价格
-            current_price = float(latest['close'])
-            self.logger.info(f"✓ 当前价格(收盘价): {current_price}")
+            current_price = float(close_values[-1])
+            self.logger.info("✓ 当前价格(收盘价): %s", current_price)
             
             # 如果收盘价异常，尝试使用其他价格
-            if pd.isna(current_price) or current_price <= 0:
-                if 'open' in price_data.columns and not pd.isna(latest['open']) and latest['open'] > 0:
-                    current_price = float(latest['open'])
-                    self.logger.warning(f"⚠️ 收盘价异常，使用开盘价: {current_price}")
-                elif 'high' in price_data.columns and not pd.isna(latest['high']) and latest['high'] > 0:
-                    current_price = float(latest['high'])
-                    self.logger.warning(f"⚠️ 收盘价异常，使用最高价: {current_price}")
+            if math.isnan(current_price) or current_price <= 0:
+                # open/high 已在获取数据时转换为数值列
+                latest_open = float(price_data['open'].iat[-1]) if 'open' in price_data.columns else math.nan
+                latest_high = float(price_data['high'].iat[-1]) if 'high' in price_data.columns else math.nan
+                if not math.isnan(latest_open) and latest_open > 0:
+                    current_price = float(latest_open)
+                    self.logger.warning("⚠️ 收盘价异常，使用开盘价: %s", current_price)
+                elif not math.isnan(latest_high) and latest_high > 0:
+                    current_price = float(latest_high)
+                    self.logger.warning("⚠️ 收盘价异常，使用最高价: %s", current_price)
                 else:
-                    self.logger.error(f"❌ 所有价格数据都异常")
+                    self.logger.error("❌ 所有价格数据都异常")
                     return {
                         'current_price': 0.0,
                         'price_change': 0.0,
@@ -1262,43 +1968,47 @@ class EnhancedStockAnalyzer:
             # 计算价格变化
             price_change = 0.0
             try:
-                if 'change_pct' in price_data.columns and not pd.isna(latest['change_pct']):
-                    price_change = float(latest['change_pct'])
-                    self.logger.info(f"✓ 使用现成的涨跌幅: {price_change}%")
-                elif len(price_data) > 1:
-                    prev = price_data.iloc[-2]
-                    prev_price = float(prev['close'])
-                    if prev_price > 0 and not pd.isna(prev_price):
+                latest_change = price_data['change_pct'].iat[-1] if 'change_pct' in price_data.columns else np.nan
+                if not pd.isna(latest_change):
+                    price_change = float(latest_change)
+                    self.logger.info("✓ 使用现成的涨跌幅: %s%%", price_change)
+                elif len(close_values) > 1:
+                    prev_price = float(close_values[-2])
+                    if prev_price > 0 and not math.isnan(prev_price):
                         price_change = ((current_price - prev_price) / prev_price * 100)
-                        self.logger.info(f"✓ 计算涨跌幅: {price_change}%")
+                        self.logger.info("✓ 计算涨跌幅: %s%%", price_change)
             except Exception as e:
-                self.logger.warning(f"计算价格变化失败: {e}")
+                self.logger.warning("计算价格变化失败: %s", e)
                 price_change = 0.0
             
             # 计算成交量比率
             volume_ratio = 1.0
             try:
                 if 'volume' in price_data.columns:
-                    volume_data = price_data['volume'].dropna()
+                    volume_data = price_data['volume'].to_numpy(dtype=np.float64)
+                    volume_data = volume_data[~np.isnan(volume_data)]
                     if len(volume_data) >= 5:
-                        recent_volume = volume_data.tail(5).mean()
+                        recent_volume = volume_data[-5:].mean()
                         avg_volume = volume_data.mean()
                         if avg_volume > 0:
-                            volume_ratio = recent_volume / avg_volume
+                            volume_ratio = float(recent_volume / avg_volume)
             except Exception as e:
-                self.logger.warning(f"计算成交量比率失败: {e}")
+                self.logger.warning("计算成交量比率失败: %s", e)
                 volume_ratio = 1.0
             
             # 计算波动率
             volatility = 0.0
             try:
-                close_prices = price_data['close'].dropna()
+                close_prices = close_values[~np.isnan(close_values)]
                 if len(close_prices) >= 20:
-                    returns = close_prices.pct_change().dropna()
+                    # 只用到最后20个收益率，按数组切片计算，不再构造整列的pct_change
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        returns = close_prices[1:] / close_prices[:-1] - 1.0
+                    returns = returns[~np.isnan(returns)]
                     if len(returns) >= 20:
-                        volatility = returns.tail(20).std() * 100
+                        volatility = float(returns[-20:].std(ddof=1) * 100)
             except Exception as e:
-                self.logger.warning(f"计算波动率失败: {e}")
+                self.logger.warning("计算波动率失败: %s", e)
                 volatility = 0.0
             
             result = {
@@ -1308,11 +2018,11 @@ class EnhancedStockAnalyzer:
                 'volatility': volatility
             }
             
-            self.logger.info(f"✓ 价格信息提取完成: {result}")
+            self.logger.info("✓ 价格信息提取完成: %s", result)
             return result
             
         except Exception as e:
-            self.logger.error(f"获取价格信息失败: {e}")
+            self.logger.error("获取价格信息失败: %s", e)
             return {
                 'current_price': 0.0,
                 'price_change': 0.0,
@@ -1346,21 +2056,31 @@ class EnhancedStockAnalyzer:
                 return "建议卖出"
                 
         except Exception as e:
-            self.logger.warning(f"生成投资建议失败: {e}")
+            self.logger.warning("生成投资建议失败: %s", e)
             return "数据不足，建议谨慎"
 
     def _build_enhanced_ai_analysis_prompt(self, stock_code, stock_name, scores, technical_analysis, 
-                                        fundamental_data, sentiment_analysis, price_info):
-        """构建增强版AI分析提示词，包含所有详细数据"""
+                                        fundamental_data, sentiment_analysis, price_info, compact=False):
+        """构建增强版AI分析提示词，包含所有详细数据
+        
+        compact 为True时构建精简版：只保留关键财务指标，新闻和研报各取前3条
+        """
+        news_limit = 3 if compact else 5
         
         # 提取25项财务指标
         financial_indicators = fundamental_data.get('financial_indicators', {})
         financial_text = ""
         if financial_indicators:
-            financial_text = "**25项核心财务指标：**\n"
-            for i, (key, value) in enumerate(financial_indicators.items(), 1):
-                if isinstance(value, (int, float)) and value != 0:
-                    financial_text += f"{i}. {key}: {value}\n"
+            # 先筛选再编号，精简版跳过的指标不会在序号中留下空缺
+            items = [
+                (key, value) for key, value in financial_indicators.items()
+                if (not compact or key in _KEY_FINANCIAL_INDICATORS)
+                and isinstance(value, (int, float)) and value != 0
+            ]
+            parts = ["**关键财务指标：**\n" if compact else "**25项核心财务指标：**\n"]
+            for i, (key, value) in enumerate(items, 1):
+                parts.append(f"{i}. {key}: {value}\n")
+            financial_text = "".join(parts)
         
         # 提取新闻详细信息
         news_summary = sentiment_analysis.get('news_summary', {})
@@ -1368,121 +2088,66 @@ class EnhancedStockAnalyzer:
         announcements = sentiment_analysis.get('announcements', [])
         research_reports = sentiment_analysis.get('research_reports', [])
         
-        news_text = f"""
+        parts = [f"""
 **新闻数据详情：**
 - 公司新闻：{len(company_news)}条
 - 公司公告：{len(announcements)}条  
 - 研究报告：{len(research_reports)}条
 - 总新闻数：{news_summary.get('total_news_count', 0)}条
 
-**重要新闻标题（前10条）：**
-"""
+**重要新闻标题（前{news_limit * 2}条）：**
+"""]
         
-        for i, news in enumerate(company_news[:5], 1):
-            news_text += f"{i}. {news.get('title', '未知标题')}\n"
+        for i, news in enumerate(company_news[:news_limit], 1):
+            parts.append(f"{i}. {news.title}\n")
         
-        for i, announcement in enumerate(announcements[:5], 1):
-            news_text += f"{i+5}. [公告] {announcement.get('title', '未知标题')}\n"
+        for i, announcement in enumerate(announcements[:news_limit], 1):
+            parts.append(f"{i + news_limit}. [公告] {announcement.title}\n")
+        news_text = "".join(parts)
         
         # 提取研究报告信息
         research_text = ""
         if research_reports:
-            research_text = "\n**研究报告摘要：**\n"
-            for i, report in enumerate(research_reports[:5], 1):
-                research_text += f"{i}. {report.get('institution', '未知机构')}: {report.get('rating', '未知评级')} - {report.get('title', '未知标题')}\n"
+            parts = ["\n**研究报告摘要：**\n"]
+            for i, report in enumerate(research_reports[:news_limit], 1):
+                parts.append(f"{i}. {report.institution}: {report.rating} - {report.title}\n")
+            research_text = "".join(parts)
+        
+        performance_forecast = fundamental_data.get('performance_forecast', [])
+        dividend_info = fundamental_data.get('dividend_info', [])
         
         # 构建完整的提示词
-        prompt = f"""请作为一位资深的股票分析师，基于以下详细数据对股票进行深度分析：
-
-**股票基本信息：**
-- 股票代码：{stock_code}
-- 股票名称：{stock_name}
-- 当前价格：{price_info.get('current_price', 0):.2f}元
-- 涨跌幅：{price_info.get('price_change', 0):.2f}%
-- 成交量比率：{price_info.get('volume_ratio', 1):.2f}
-- 波动率：{price_info.get('volatility', 0):.2f}%
-
-**技术分析详情：**
-- 均线趋势：{technical_analysis.get('ma_trend', '未知')}
-- RSI指标：{technical_analysis.get('rsi', 50):.1f}
-- MACD信号：{technical_analysis.get('macd_signal', '未知')}
-- 布林带位置：{technical_analysis.get('bb_position', 0.5):.2f}
-- 成交量状态：{technical_analysis.get('volume_status', '未知')}
-
-{financial_text}
-
-**估值指标：**
-{self._format_dict_data(fundamental_data.get('valuation', {}))}
-
-**业绩预告：**
-共{len(fundamental_data.get('performance_forecast', []))}条业绩预告
-{self._format_list_data(fundamental_data.get('performance_forecast', [])[:3])}
-
-**分红配股：**
-共{len(fundamental_data.get('dividend_info', []))}条分红配股信息
-{self._format_list_data(fundamental_data.get('dividend_info', [])[:3])}
-
-**股东结构：**
-前10大股东信息：{len(fundamental_data.get('shareholders', []))}条
-机构持股：{len(fundamental_data.get('institutional_holdings', []))}条
-
-{news_text}
-
-{research_text}
-
-**市场情绪分析：**
-- 整体情绪得分：{sentiment_analysis.get('overall_sentiment', 0):.3f}
-- 情绪趋势：{sentiment_analysis.get('sentiment_trend', '中性')}
-- 置信度：{sentiment_analysis.get('confidence_score', 0):.2f}
-- 各类新闻情绪：{sentiment_analysis.get('sentiment_by_type', {})}
-
-**综合评分：**
-- 技术面得分：{scores.get('technical', 50):.1f}/100
-- 基本面得分：{scores.get('fundamental', 50):.1f}/100
-- 情绪面得分：{scores.get('sentiment', 50):.1f}/100
-- 综合得分：{scores.get('comprehensive', 50):.1f}/100
-
-**分析要求：**
-
-请基于以上详细数据，从以下维度进行深度分析：
-
-1. **财务健康度深度解读**：
-   - 基于25项财务指标，全面评估公司财务状况
-   - 识别财务优势和风险点
-   - 与行业平均水平对比分析
-   - 预测未来财务发展趋势
-
-2. **技术面精准分析**：
-   - 结合多个技术指标，判断短中长期趋势
-   - 识别关键支撑位和阻力位
-   - 分析成交量与价格的配合关系
-   - 评估当前位置的风险收益比
-
-3. **市场情绪深度挖掘**：
-   - 分析公司新闻、公告、研报的影响
-   - 评估市场对公司的整体预期
-   - 识别情绪拐点和催化剂
-   - 判断情绪对股价的推动或拖累作用
-
-4. **基本面价值判断**：
-   - 评估公司内在价值和成长潜力
-   - 分析行业地位和竞争优势
-   - 评估业绩预告和分红政策
-   - 判断当前估值的合理性
-
-5. **综合投资策略**：
-   - 给出明确的买卖建议和理由
-   - 设定目标价位和止损点
-   - 制定分批操作策略
-   - 评估投资时间周期
-
-6. **风险机会识别**：
-   - 列出主要投资风险和应对措施
-   - 识别潜在催化剂和成长机会
-   - 分析宏观环境和政策影响
-   - 提供动态调整建议
-
-请用专业、客观的语言进行分析，确保逻辑清晰、数据支撑充分、结论明确可执行。"""
+        prompt = _ENHANCED_PROMPT_TEMPLATE.format(
+            stock_code=stock_code,
+            stock_name=stock_name,
+            current_price=price_info.get('current_price', 0),
+            price_change=price_info.get('price_change', 0),
+            volume_ratio=price_info.get('volume_ratio', 1),
+            volatility=price_info.get('volatility', 0),
+            ma_trend=technical_analysis.get('ma_trend', '未知'),
+            rsi=technical_analysis.get('rsi', 50),
+            macd_signal=technical_analysis.get('macd_signal', '未知'),
+            bb_position=technical_analysis.get('bb_position', 0.5),
+            volume_status=technical_analysis.get('volume_status', '未知'),
+            financial_text=financial_text,
+            valuation_text=self._format_dict_data(fundamental_data.get('valuation', {})),
+            performance_forecast_count=len(performance_forecast),
+            performance_forecast_text=self._format_list_data(performance_forecast[:3]),
+            dividend_count=len(dividend_info),
+            dividend_text=self._format_list_data(dividend_info[:3]),
+            shareholders_count=len(fundamental_data.get('shareholders', [])),
+            institutional_holdings_count=len(fundamental_data.get('institutional_holdings', [])),
+            news_text=news_text,
+            research_text=research_text,
+            overall_sentiment=sentiment_analysis.get('overall_sentiment', 0),
+            sentiment_trend=sentiment_analysis.get('sentiment_trend', '中性'),
+            confidence_score=sentiment_analysis.get('confidence_score', 0),
+            sentiment_by_type=sentiment_analysis.get('sentiment_by_type', {}),
+            technical_score=scores.get('technical', 50),
+            fundamental_score=scores.get('fundamental', 50),
+            sentiment_score=scores.get('sentiment', 50),
+            comprehensive_score=scores.get('comprehensive', 50),
+        )
 
         return prompt
 
@@ -1517,8 +2182,16 @@ class EnhancedStockAnalyzer:
         
         return formatted if formatted else "无有效数据"
 
-    def generate_ai_analysis(self, analysis_data, enable_streaming=False):
-        """生成AI增强分析"""
+    def generate_ai_analysis(self, analysis_data, enable_streaming=False, stream_callback=None):
+        """生成AI增强分析
+        
+        enable_streaming 且提供了 stream_callback 时，AI服务的输出按片段实时传给 stream_callback，
+        返回值仍是完整的分析文本
+        """
+        return self._generate_ai_analysis(analysis_data, enable_streaming, stream_callback)[0]
+
+    def _generate_ai_analysis(self, analysis_data, enable_streaming=False, stream_callback=None):
+        """生成AI增强分析，返回 (分析文本, 是否由AI生成)；AI不可用时为规则分析的结果"""
         try:
             self.logger.info("🤖 开始AI深度分析...")
             
@@ -1535,137 +2208,328 @@ class EnhancedStockAnalyzer:
                 stock_code, stock_name, scores, technical_analysis, 
                 fundamental_data, sentiment_analysis, price_info
             )
+            prompt_tokens = _count_tokens(prompt)
+            if prompt_tokens > _AI_PROMPT_TOKEN_BUDGET:
+                # 提示词过长时改用精简版，输入token数直接决定响应延迟和费用
+                prompt = self._build_enhanced_ai_analysis_prompt(
+                    stock_code, stock_name, scores, technical_analysis,
+                    fundamental_data, sentiment_analysis, price_info, compact=True
+                )
+                self.logger.info("提示词 %s tokens 超出预算，精简为 %s tokens", prompt_tokens, _count_tokens(prompt))
+            else:
+                self.logger.info("AI分析提示词 %s tokens", prompt_tokens)
             
-            # 调用AI API
-            ai_response = self._call_ai_api(prompt, enable_streaming)
+            # 相同模型、参数和提示词的结果直接复用（流式输出不缓存，高温度时只短时间复用）
+            temperature = self.config.get('ai', {}).get('temperature', 0.7)
+            if temperature <= _AI_CACHE_MAX_TEMPERATURE:
+                ai_cache_ttl = self._fundamental_cache_ttl
+            else:
+                ai_cache_ttl = _AI_HIGH_TEMPERATURE_CACHE_TTL
+            cache_key = None
+            if not enable_streaming:
+                cache_key = self._ai_response_cache_key(prompt)
+                ai_response = self._get_cached(self.ai_cache, cache_key, ai_cache_ttl)
+                if ai_response is None:
+                    cached = self._load_disk_cache('ai_response', cache_key, ai_cache_ttl)
+                    if cached is not None:
+                        self._put_cached(self.ai_cache, cache_key, cached, self._ai_cache_max)
+                        ai_response = cached[1]
+                if ai_response is not None:
+                    self.logger.info("✅ 使用缓存的AI分析结果: %s", stock_code)
+                    return ai_response, True
+            
+            # 精确缓存未命中时查找同一股票当天相似的历史提示词，只比较数据部分
+            embedding = None
+            semantic_scope = f"{stock_code}|{datetime.now().strftime('%Y-%m-%d')}"
+            if cache_key is not None and self.semantic_cache is not None:
+                try:
+                    ai_response, embedding = self.semantic_cache.get(
+                        _prompt_data_section(prompt), semantic_scope, ttl=ai_cache_ttl)
+                except Exception as e:
+                    self.logger.warning("语义缓存查询失败: %s", e)
+                    ai_response = None
+                if ai_response is not None:
+                    self.logger.info("✅ 使用语义缓存的AI分析结果: %s", stock_code)
+                    return ai_response, True
+            
+            # 调用AI API（相同提示词的并发请求只发出一次；流式输出推送给各自的回调，不合并）
+            if enable_streaming and stream_callback is not None:
+                ai_response, is_owner = self._call_ai_api(prompt, True, stream_callback), True
+            else:
+                ai_response, is_owner = self._call_ai_api_single_flight(
+                    cache_key or self._ai_response_cache_key(prompt), prompt, enable_streaming)
             
             if ai_response:
+                if cache_key is not None and is_owner:
+                    self._put_cached(self.ai_cache, cache_key, (time.monotonic(), ai_response), self._ai_cache_max)
+                    self._save_disk_cache('ai_response', cache_key, ai_response)
+                    if embedding is not None:
+                        try:
+                            self.semantic_cache.put(embedding, ai_response, semantic_scope)
+                        except Exception as e:
+                            self.logger.warning("写入语义缓存失败: %s", e)
                 self.logger.info("✅ AI深度分析完成")
-                return ai_response
+                return ai_response, True
             else:
                 self.logger.warning("⚠️ AI API不可用，使用高级分析模式")
-                return self._advanced_rule_based_analysis(analysis_data)
+                return self._advanced_rule_based_analysis(analysis_data), False
                 
         except Exception as e:
-            self.logger.error(f"AI分析失败: {e}")
-            return self._advanced_rule_based_analysis(analysis_data)
+            self.logger.error("AI分析失败: %s", e)
+            return self._advanced_rule_based_analysis(analysis_data), False
 
-    def _call_ai_api(self, prompt, enable_streaming=False):
-        """调用AI API"""
+    def _ai_response_cache_key(self, prompt):
+        """AI分析结果的缓存键：首选服务、模型、温度、最大token数和提示词的SHA-256"""
+        ai_config = self.config.get('ai', {})
+        preference = ai_config.get('model_preference', 'openai')
+        model = ai_config.get('models', {}).get(preference, '')
+        raw = "{}|{}|{}|{}|{}".format(
+            preference, model, ai_config.get('temperature', 0.7), ai_config.get('max_tokens', 6000), prompt)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _call_ai_api_single_flight(self, key, prompt, enable_streaming=False):
+        """同一提示词同时只发出一次AI请求，其他线程等待并共享结果
+        
+        返回 (AI分析结果, 是否由本线程发出请求)
+        """
+        with self._ai_inflight_lock:
+            future = self._ai_inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._ai_inflight[key] = future
+        
+        if not is_owner:
+            self.logger.info("相同的AI分析请求正在进行，等待其结果...")
+            return future.result(), False
+        
         try:
-            model_preference = self.config.get('ai', {}).get('model_preference', 'openai')
-            
-            if model_preference == 'openai' and self.api_keys.get('openai'):
-                result = self._call_openai_api(prompt, enable_streaming)
-                if result:
-                    return result
+            result = self._call_ai_api(prompt, enable_streaming)
+            future.set_result(result)
+            return result, True
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._ai_inflight_lock:
+                self._ai_inflight.pop(key, None)
+
+    def _call_ai_api(self, prompt, enable_streaming=False, stream_callback=None):
+        """调用AI API
+        
+        首选服务先发起，失败后再发起下一个已配置的服务。配置了 ai.fallback_delay 时，
+        首选服务超过该秒数仍未返回也会并发发起备用服务，先返回有效结果的服务胜出。
+        流式输出时只在当前服务失败后才发起备用服务，避免多个服务的输出交错推送给回调。
+        """
+        try:
+            ai_config = self.config.get('ai', {})
+            model_preference = ai_config.get('model_preference', 'openai')
+            fallback_delay = ai_config.get('fallback_delay', _AI_FALLBACK_DELAY)
+            streaming = enable_streaming and stream_callback is not None
+            # 每个实际发出的请求都计入限速
+            request_tokens = _count_tokens(prompt) + ai_config.get('max_tokens', 6000)
+            
+            # 已配置密钥的服务，首选服务排在最前，其余保持原有的尝试顺序
+            providers = [
+                (name, call) for name, call in (
+                    ('openai', self._call_openai_api),
+                    ('anthropic', self._call_claude_api),
+                    ('zhipu', self._call_zhipu_api),
+                ) if self.api_keys.get(name)
+            ]
+            providers.sort(key=lambda provider: provider[0] != model_preference)
+            if not providers:
+                return None
             
-            elif model_preference == 'anthropic' and self.api_keys.get('anthropic'):
-                result = self._call_claude_api(prompt, enable_streaming)
-                if result:
-                    return result
-                    
-            elif model_preference == 'zhipu' and self.api_keys.get('zhipu'):
-                result = self._call_zhipu_api(prompt, enable_streaming)
-                if result:
-                    return result
-            
-            # 尝试其他可用的服务
-            if self.api_keys.get('openai') and model_preference != 'openai':
-                self.logger.info("尝试备用OpenAI API...")
-                result = self._call_openai_api(prompt, enable_streaming)
-                if result:
-                    return result
-                    
-            if self.api_keys.get('anthropic') and model_preference != 'anthropic':
-                self.logger.info("尝试备用Claude API...")
-                result = self._call_claude_api(prompt, enable_streaming)
-                if result:
-                    return result
+            executor = ThreadPoolExecutor(max_workers=len(providers))
+            try:
+                pending = set()
+                for index, (name, call) in enumerate(providers):
+                    if index > 0 or name != model_preference:
+                        self.logger.info("尝试备用%s API...", _AI_PROVIDER_NAMES[name])
+                    if self._ai_rate_limiter is not None:
+                        self._ai_rate_limiter.acquire(request_tokens)
+                    pending.add(executor.submit(call, prompt, enable_streaming, stream_callback))
                     
-            if self.api_keys.get('zhipu') and model_preference != 'zhipu':
-                self.logger.info("尝试备用智谱AI API...")
-                result = self._call_zhipu_api(prompt, enable_streaming)
-                if result:
-                    return result
-            
-            return None
+                    # 等到有服务返回有效结果，或已返回的服务都失败（或超过 fallback_delay）后再发起下一个
+                    is_last = index == len(providers) - 1
+                    hedge = not (is_last or streaming or fallback_delay is None)
+                    while pending:
+                        done, pending = wait(pending, timeout=fallback_delay if hedge else None,
+                                             return_when=FIRST_COMPLETED)
+                        for future in done:
+                            result = future.result()
+                            if result:
+                                return result
+                        if not is_last:
+                            break
+                
+                return None
+            finally:
+                # 落选的请求在后台执行完，结果直接丢弃
+                executor.shutdown(wait=False)
                 
         except Exception as e:
-            self.logger.error(f"AI API调用失败: {e}")
+            self.logger.error("AI API调用失败: %s", e)
             return None
 
-    def _call_openai_api(self, prompt, enable_streaming=False):
+    def _ai_limits(self):
+        """AI请求的 (超时秒数, 失败重试次数)"""
+        limits = self.config.get('ai', {}).get('limits', {})
+        return (float(limits.get('timeout', _AI_REQUEST_TIMEOUT)),
+                int(limits.get('max_retries', _AI_MAX_RETRIES)))
+
+    def _ai_max_tokens(self, provider, prompt):
+        """本次请求的最大输出token数：配置的 max_tokens，且不超过上下文窗口扣除提示词后的剩余空间"""
+        ai_config = self.config.get('ai', {})
+        context_window = ai_config.get('context_windows', {}).get(provider, _AI_CONTEXT_WINDOWS[provider])
+        available = context_window - _count_tokens(prompt) - _AI_CONTEXT_RESERVE
+        return max(1, min(ai_config.get('max_tokens', 6000), available))
+
+    def _call_with_backoff(self, name, call, retryable, max_attempts, deadline):
+        """调用 call()，遇到 retryable 中的异常时按带随机抖动的指数退避重试同一服务
+        
+        最多调用 max_attempts 次；等待后会超过截止时间 deadline（time.monotonic()）时不再重试，
+        直接抛出最后一次的异常，保证总耗时不超过请求超时
+        """
+        attempt = 0
+        while True:
+            try:
+                return call()
+            except retryable as e:
+                attempt += 1
+                delay = random.uniform(0, min(_AI_RETRY_MAX_DELAY, _AI_RETRY_BASE_DELAY * 2 ** attempt))
+                if attempt >= max_attempts or time.monotonic() + delay >= deadline:
+                    raise
+                self.logger.warning("%s 请求失败（%s），%.1f秒后第%s次重试", name, e, delay, attempt)
+                time.sleep(delay)
+
+    def _get_ai_client(self, provider, settings, factory):
+        """返回缓存的AI客户端；密钥、地址等创建参数变化时重新创建"""
+        with self._ai_clients_lock:
+            cached = self._ai_clients.get(provider)
+            if cached is not None and cached[0] == settings:
+                return cached[1]
+            client = factory()
+            self._ai_clients[provider] = (settings, client)
+            return client
+
+    def _build_openai_http_client(self, timeout):
+        """OpenAI客户端使用的httpx连接池，未安装httpx时返回None由SDK自行创建"""
+        if httpx is None:
+            return None
+        return httpx.Client(
+            http2=h2 is not None,
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=_AI_HTTP_KEEPALIVE_CONNECTIONS,
+                                max_connections=_AI_HTTP_MAX_CONNECTIONS)
+        )
+
+    def _call_openai_api(self, prompt, enable_streaming=False, stream_callback=None):
         """调用OpenAI API"""
         try:
-            import openai
+            if openai is None or not hasattr(openai, 'OpenAI'):
+                self.logger.warning("未安装openai>=1.0，跳过OpenAI API")
+                return None
             
             api_key = self.api_keys.get('openai')
             if not api_key:
                 return None
-                
-            openai.api_key = api_key
             
             api_base = self.config.get('ai', {}).get('api_base_urls', {}).get('openai')
-            if api_base:
-                openai.api_base = api_base
-            
             model = self.config.get('ai', {}).get('models', {}).get('openai', 'gpt-4o-mini')
-            max_tokens = self.config.get('ai', {}).get('max_tokens', 6000)
+            max_tokens = self._ai_max_tokens('openai', prompt)
             temperature = self.config.get('ai', {}).get('temperature', 0.7)
-            
-            self.logger.info(f"正在调用OpenAI {model} 进行深度分析...")
-            
-            response = openai.ChatCompletion.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "你是一位资深的股票分析师，具有丰富的市场经验和深厚的金融知识。请提供专业、客观、有深度的股票分析。"},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature
+            timeout, max_retries = self._ai_limits()
+            messages = [
+                {"role": "system", "content": _AI_SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ]
+            
+            self.logger.info("正在调用OpenAI %s 进行深度分析...", model)
+            
+            # 客户端按密钥和地址缓存复用，不再修改 openai 模块的全局状态，多线程并发调用互不影响
+            client = self._get_ai_client(
+                'openai', (api_key, api_base, timeout, max_retries),
+                lambda: openai.OpenAI(api_key=api_key, base_url=api_base or None,
+                                      timeout=timeout, max_retries=max_retries,
+                                      http_client=self._build_openai_http_client(timeout))
             )
             
+            if enable_streaming and stream_callback is not None:
+                # 逐段接收输出并实时推送给回调
+                parts = []
+                for chunk in client.chat.completions.create(
+                        model=model, messages=messages, max_tokens=max_tokens,
+                        temperature=temperature, stream=True):
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if text:
+                        parts.append(text)
+                        stream_callback(text)
+                return "".join(parts)
+            
+            response = client.chat.completions.create(model=model, messages=messages, max_tokens=max_tokens,
+                                                      temperature=temperature)
             return response.choices[0].message.content
                 
         except Exception as e:
-            self.logger.error(f"OpenAI API调用失败: {e}")
+            self.logger.error("OpenAI API调用失败: %s", e)
             return None
 
-    def _call_claude_api(self, prompt, enable_streaming=False):
+    def _call_claude_api(self, prompt, enable_streaming=False, stream_callback=None):
         """调用Claude API"""
         try:
-            import anthropic
+            if anthropic is None:
+                self.logger.warning("未安装anthropic库，跳过Claude API")
+                return None
             
             api_key = self.api_keys.get('anthropic')
             if not api_key:
                 return None
             
-            client = anthropic.Anthropic(api_key=api_key)
+            timeout, max_retries = self._ai_limits()
+            client = self._get_ai_client(
+                'anthropic', (api_key, timeout, max_retries),
+                lambda: anthropic.Anthropic(api_key=api_key, timeout=timeout, max_retries=max_retries)
+            )
             
             model = self.config.get('ai', {}).get('models', {}).get('anthropic', 'claude-3-haiku-20240307')
-            max_tokens = self.config.get('ai', {}).get('max_tokens', 6000)
+            max_tokens = self._ai_max_tokens('anthropic', prompt)
             
-            self.logger.info(f"正在调用Claude {model} 进行深度分析...")
+            self.logger.info("正在调用Claude %s 进行深度分析...", model)
             
-            response = client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                messages=[
+            request = {
+                'model': model,
+                'max_tokens': max_tokens,
+                'messages': [
                     {"role": "user", "content": prompt}
                 ]
-            )
+            }
             
+            if enable_streaming and stream_callback is not None:
+                # 逐段接收输出并实时推送给回调
+                parts = []
+                with client.messages.stream(**request) as stream:
+                    for text in stream.text_stream:
+                        parts.append(text)
+                        stream_callback(text)
+                return "".join(parts)
+            
+            response = client.messages.create(**request)
             return response.content[0].text
             
         except Exception as e:
-            self.logger.error(f"Claude API调用失败: {e}")
+            self.logger.error("Claude API调用失败: %s", e)
             return None
 
-    def _call_zhipu_api(self, prompt, enable_streaming=False):
-        """调用智谱AI API"""
+    def _call_zhipu_api(self, prompt, enable_streaming=False, stream_callback=None):
+        """调用智谱AI API（旧版接口不支持流式输出，总是返回完整结果）"""
         try:
-            import zhipuai
+            if zhipuai is None:
+                self.logger.warning("未安装zhipuai库，跳过智谱AI API")
+                return None
             
             api_key = self.api_keys.get('zhipu')
             if not api_key:
@@ -1674,24 +2538,41 @@ class EnhancedStockAnalyzer:
             zhipuai.api_key = api_key
             
             model = self.config.get('ai', {}).get('models', {}).get('zhipu', 'chatglm_turbo')
-            max_tokens = self.config.get('ai', {}).get('max_tokens', 6000)
+            max_tokens = self._ai_max_tokens('zhipu', prompt)
             temperature = self.config.get('ai', {}).get('temperature', 0.7)
-            
-            self.logger.info(f"正在调用智谱AI {model} 进行深度分析...")
-            
-            response = zhipuai.model_api.invoke(
-                model=model,
-                prompt=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+            timeout, max_retries = self._ai_limits()
+            # 所有重试共用同一个截止时间
+            deadline = time.monotonic() + timeout
+            
+            self.logger.info("正在调用智谱AI %s 进行深度分析...", model)
+            
+            def invoke():
+                # 旧版智谱接口不支持超时参数，放到工作线程中调用并限制等待时间
+                executor = ThreadPoolExecutor(max_workers=1)
+                future = executor.submit(
+                    zhipuai.model_api.invoke,
+                    model=model,
+                    prompt=[
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                executor.shutdown(wait=False)
+                response = future.result(timeout=max(deadline - time.monotonic(), 0))
+                if not response.get('success', True) and response.get('code') in _ZHIPU_RETRYABLE_CODES:
+                    raise _TransientAIError(response.get('msg', response.get('code')))
+                return response
+            
+            # 旧版接口没有内置重试（OpenAI/Claude客户端由 max_retries 自动退避重试），
+            # 网络错误和限流在同一服务内重试，不必立即切换到备用服务
+            response = self._call_with_backoff('智谱AI', invoke, (OSError, _TransientAIError),
+                                               max_retries + 1, deadline)
             
             return response['data']['choices'][0]['content']
             
         except Exception as e:
-            self.logger.error(f"智谱AI API调用失败: {e}")
+            self.logger.error("智谱AI API调用失败: %s", e)
             return None
 
     def _advanced_rule_based_analysis(self, analysis_data):
@@ -1705,86 +2586,59 @@ class EnhancedStockAnalyzer:
             technical_analysis = analysis_data.get('technical_analysis', {})
             fundamental_data = analysis_data.get('fundamental_data', {})
             sentiment_analysis = analysis_data.get('sentiment_analysis', {})
-            price_info = analysis_data.get('price_info', {})
             
-            analysis_sections = []
-            
-            # 1. 综合评估
+            # 各项得分只取一次，后面多个段落共用
             comprehensive_score = scores.get('comprehensive', 50)
-            analysis_sections.append(f"""## 📊 综合评估
-
-基于技术面、基本面和市场情绪的综合分析，{stock_name}({stock_code})的综合得分为{comprehensive_score:.1f}分。
-
-- 技术面得分：{scores.get('technical', 50):.1f}/100
-- 基本面得分：{scores.get('fundamental', 50):.1f}/100  
-- 情绪面得分：{scores.get('sentiment', 50):.1f}/100""")
+            technical_score = scores.get('technical', 50)
+            fundamental_score = scores.get('fundamental', 50)
+            
+            # 所有段落的字段放入同一个上下文，由整份报告模板一次格式化
+            context = {
+                # 1. 综合评估
+                'stock_name': stock_name,
+                'stock_code': stock_code,
+                'comprehensive_score': comprehensive_score,
+                'technical_score': technical_score,
+                'fundamental_score': fundamental_score,
+                'sentiment_score': scores.get('sentiment', 50),
+                # 3. 技术面分析
+                'ma_trend': technical_analysis.get('ma_trend', '未知'),
+                'rsi': technical_analysis.get('rsi', 50),
+                'macd_signal': technical_analysis.get('macd_signal', '未知'),
+                'volume_status': technical_analysis.get('volume_status', '未知'),
+                'assessment': _score_label(technical_score, _TECHNICAL_ASSESSMENT_LEVELS, '偏弱'),
+                # 4. 市场情绪
+                'total_analyzed': sentiment_analysis.get('total_analyzed', 0),
+                'sentiment_trend': sentiment_analysis.get('sentiment_trend', '中性'),
+                'overall_sentiment': sentiment_analysis.get('overall_sentiment', 0),
+                'confidence_score': sentiment_analysis.get('confidence_score', 0),
+                'company_news_count': len(sentiment_analysis.get('company_news', ())),
+                'announcements_count': len(sentiment_analysis.get('announcements', ())),
+                'research_reports_count': len(sentiment_analysis.get('research_reports', ())),
+                # 5. 投资建议
+                'recommendation': self.generate_recommendation(scores),
+                'strategy': _score_label(comprehensive_score, _STRATEGY_LEVELS,
+                                         '**规避风险**：多项指标显示风险较大，建议减仓或观望。'),
+            }
             
             # 2. 财务分析
             financial_indicators = fundamental_data.get('financial_indicators', {})
-            if financial_indicators:
-                key_metrics = []
-                for key, value in list(financial_indicators.items())[:10]:
-                    if isinstance(value, (int, float)) and value != 0:
-                        key_metrics.append(f"- {key}: {value}")
-                
-                financial_text = f"""## 💰 财务健康度分析
-
-获取到{len(financial_indicators)}项财务指标，主要指标如下：
-
-{chr(10).join(key_metrics[:8])}
-
-财务健康度评估：{'优秀' if scores.get('fundamental', 50) >= 70 else '良好' if scores.get('fundamental', 50) >= 50 else '需关注'}"""
-                analysis_sections.append(financial_text)
-            
-            # 3. 技术面分析
-            tech_analysis = f"""## 📈 技术面分析
-
-当前技术指标显示：
-- 均线趋势：{technical_analysis.get('ma_trend', '未知')}
-- RSI指标：{technical_analysis.get('rsi', 50):.1f}
-- MACD信号：{technical_analysis.get('macd_signal', '未知')}
-- 成交量状态：{technical_analysis.get('volume_status', '未知')}
-
-技术面评估：{'强势' if scores.get('technical', 50) >= 70 else '中性' if scores.get('technical', 50) >= 50 else '偏弱'}"""
-            analysis_sections.append(tech_analysis)
-            
-            # 4. 市场情绪
-            sentiment_desc = f"""## 📰 市场情绪分析
-
-基于{sentiment_analysis.get('total_analyzed', 0)}条新闻的分析：
-- 整体情绪：{sentiment_analysis.get('sentiment_trend', '中性')}
-- 情绪得分：{sentiment_analysis.get('overall_sentiment', 0):.3f}
-- 置信度：{sentiment_analysis.get('confidence_score', 0):.2%}
-
-新闻分布：
-- 公司新闻：{len(sentiment_analysis.get('company_news', []))}条
-- 公司公告：{len(sentiment_analysis.get('announcements', []))}条  
-- 研究报告：{len(sentiment_analysis.get('research_reports', []))}条"""
-            analysis_sections.append(sentiment_desc)
-            
-            # 5. 投资建议
-            recommendation = self.generate_recommendation(scores)
-            strategy = f"""## 🎯 投资策略建议
-
-**投资建议：{recommendation}**
-
-根据综合分析，建议如下：
-
-{'**积极配置**：各项指标表现优异，可适当加大仓位。' if comprehensive_score >= 80 else 
- '**谨慎买入**：整体表现良好，但需要关注风险点。' if comprehensive_score >= 60 else
- '**观望为主**：当前风险收益比一般，建议等待更好时机。' if comprehensive_score >= 40 else
- '**规避风险**：多项指标显示风险较大，建议减仓或观望。'}
-
-操作建议：
-- 买入时机：技术面突破关键位置时
-- 止损位置：跌破重要技术支撑
-- 持有周期：中长期为主"""
-            analysis_sections.append(strategy)
-            
-            return "\n\n".join(analysis_sections)
+            if not financial_indicators:
+                return _RULE_ANALYSIS_NO_FINANCIAL_TEMPLATE.format_map(context)
+            
+            # 前10项中取最多8项非零数值指标，直接在字典视图上迭代，不复制整个条目列表
+            key_metrics = islice((
+                f"- {key}: {value}"
+                for key, value in islice(financial_indicators.items(), 10)
+                if isinstance(value, (int, float)) and value != 0
+            ), 8)
+            context['indicator_count'] = len(financial_indicators)
+            context['key_metrics'] = "\n".join(key_metrics)
+            context['health'] = _score_label(fundamental_score, _FINANCIAL_HEALTH_LEVELS, '需关注')
+            return _RULE_ANALYSIS_TEMPLATE.format_map(context)
             
         except Exception as e:
-            self.logger.error(f"高级规则分析失败: {e}")
+            self.logger.error("高级规则分析失败: %s", e)
             return "分析系统暂时不可用，请稍后重试。"
 
     def set_streaming_config(self, enabled=True, show_thinking=True):
@@ -1794,35 +2648,55 @@ class EnhancedStockAnalyzer:
             'show_thinking': show_thinking
         })
 
-    def analyze_stock(self, stock_code, enable_streaming=None):
-        """分析股票的主方法（增强版）"""
+    def analyze_stock(self, stock_code, enable_streaming=None, stream_callback=None, force=False):
+        """分析股票的主方法（增强版）
+        
+        启用报告缓存时，同一天相同配置下已分析过的股票直接返回缓存的报告；force=True 时重新分析
+        """
         if enable_streaming is None:
             enable_streaming = self.streaming_config.get('enabled', False)
         
         try:
-            self.logger.info(f"开始增强版股票分析: {stock_code}")
+            self.logger.info("开始增强版股票分析: %s", stock_code)
+            
+            # 报告缓存以日期为键，换日后自然失效
+            if self.report_cache_enabled:
+                report_date = datetime.now().strftime('%Y-%m-%d')
+                cfg_hash = self._report_config_hash()
+                if not force:
+                    report = self._load_cached_report(stock_code, report_date, cfg_hash)
+                    if report is not None:
+                        self.logger.info("使用缓存的分析报告: %s", stock_code)
+                        return report
             
             # 获取股票名称
             stock_name = self.get_stock_name(stock_code)
             
+            # 价格、基本面、新闻三类数据相互独立，先并发获取，下面按原顺序取结果分析
+            executor = ThreadPoolExecutor(max_workers=3)
+            price_future = executor.submit(self.get_stock_data, stock_code)
+            fundamental_future = executor.submit(self.get_comprehensive_fundamental_data, stock_code)
+            news_future = executor.submit(self.get_comprehensive_news_data, stock_code, 30)
+            executor.shutdown(wait=False)
+            
             # 1. 获取价格数据和技术分析
             self.logger.info("正在进行技术分析...")
-            price_data = self.get_stock_data(stock_code)
+            price_data = price_future.result()
             if price_data.empty:
                 raise ValueError(f"无法获取股票 {stock_code} 的价格数据")
             
             price_info = self.get_price_info(price_data)
-            technical_analysis = self.calculate_technical_indicators(price_data)
+            technical_analysis = self.calculate_technical_indicators(price_data, stock_code)
             technical_score = self.calculate_technical_score(technical_analysis)
             
             # 2. 获取25项财务指标和综合基本面分析
             self.logger.info("正在进行25项财务指标分析...")
-            fundamental_data = self.get_comprehensive_fundamental_data(stock_code)
+            fundamental_data = fundamental_future.result()
             fundamental_score = self.calculate_fundamental_score(fundamental_data)
             
             # 3. 获取综合新闻数据和高级情绪分析
             self.logger.info("正在进行综合新闻和情绪分析...")
-            comprehensive_news_data = self.get_comprehensive_news_data(stock_code, days=30)
+            comprehensive_news_data = news_future.result()
             sentiment_analysis = self.calculate_advanced_sentiment_analysis(comprehensive_news_data)
             sentiment_score = self.calculate_sentiment_score(sentiment_analysis)
             
@@ -1845,7 +2719,7 @@ class EnhancedStockAnalyzer:
             recommendation = self.generate_recommendation(scores)
             
             # 6. AI增强分析（包含所有详细数据）
-            ai_analysis = self.generate_ai_analysis({
+            ai_analysis, ai_succeeded = self._generate_ai_analysis({
                 'stock_code': stock_code,
                 'stock_name': stock_name,
                 'price_info': price_info,
@@ -1853,7 +2727,7 @@ class EnhancedStockAnalyzer:
                 'fundamental_data': fundamental_data,
                 'sentiment_analysis': sentiment_analysis,
                 'scores': scores
-            }, enable_streaming)
+            }, enable_streaming, stream_callback)
             
             # 7. 生成最终报告
             report = {
@@ -1876,15 +2750,19 @@ class EnhancedStockAnalyzer:
                 }
             }
             
-            self.logger.info(f"✓ 增强版股票分析完成: {stock_code}")
-            self.logger.info(f"  - 财务指标: {len(fundamental_data.get('financial_indicators', {}))} 项")
-            self.logger.info(f"  - 新闻数据: {sentiment_analysis.get('total_analyzed', 0)} 条")
-            self.logger.info(f"  - 综合得分: {scores['comprehensive']:.1f}")
+            self.logger.info("✓ 增强版股票分析完成: %s", stock_code)
+            self.logger.info("  - 财务指标: %s 项", len(fundamental_data.get('financial_indicators', {})))
+            self.logger.info("  - 新闻数据: %s 条", sentiment_analysis.get('total_analyzed', 0))
+            self.logger.info("  - 综合得分: %.1f", scores['comprehensive'])
+            
+            # AI不可用时的规则分析报告不缓存，AI服务恢复后重新分析
+            if self.report_cache_enabled and ai_succeeded:
+                self._save_cached_report(stock_code, report_date, cfg_hash, report)
             
             return report
             
         except Exception as e:
-            self.logger.error(f"增强版股票分析失败 {stock_code}: {str(e)}")
+            self.logger.error("增强版股票分析失败 %s: %s", stock_code, e)
             raise
 
     # 兼容旧版本的方法名
@@ -1913,11 +2791,28 @@ def main():
     # 测试分析
     test_stocks = ['000001', '600036', '300019', '000525']
     
-    for stock_code in test_stocks:
+    # --force：忽略报告缓存，重新分析
+    force = '--force' in sys.argv[1:]
+    
+    def analyze_one(stock_code):
+        """在线程池中分析单只股票，失败时返回异常对象"""
+        try:
+            return analyzer.analyze_stock(stock_code, force=force)
+        except Exception as e:
+            return e
+    
+    # 各股票的分析相互独立，按配置的并发数同时分析，结果按原顺序输出
+    workers = max(1, min(analyzer.analysis_params['concurrency'], len(test_stocks)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(analyze_one, test_stocks))
+    
+    for stock_code, report in zip(test_stocks, results):
+        print(f"\n=== 增强版分析 {stock_code} ===")
+        if isinstance(report, Exception):
+            print(f"分析 {stock_code} 失败: {report}")
+            continue
+        
         try:
-            print(f"\n=== 开始增强版分析 {stock_code} ===")
-            report = analyzer.analyze_stock(stock_code)
-            
             print(f"股票代码: {report['stock_code']}")
             print(f"股票名称: {report['stock_name']}")
             print(f"当前价格: {report['price_info']['current_price']:.2f}元")
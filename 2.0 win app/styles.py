@@ -0,0 +1,360 @@
+"""
+现代股票分析系统 - 全局样式表
+所有自定义组件的样式集中在此处，由QApplication统一设置一次，
+组件只通过 objectName / 动态属性选择样式。
+警告/错误对话框的样式以常量提供，由对话框各自设置。
+"""
+
+GLOBAL_QSS = """
+ModernStockAnalyzerGUI {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #667eea, stop:1 #764ba2);
+}
+
+/* 面板 */
+ModernFrame {
+    background-color: #ffffff;
+    border-radius: 12px;
+    border: 1px solid #e3f2fd;
+}
+
+/* 按钮 */
+QPushButton#primary {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #667eea, stop:1 #764ba2);
+    color: white;
+    border: none;
+    border-radius: 8px;
+    padding: 12px 24px;
+    font-weight: 600;
+    font-size: 14px;
+}
+QPushButton#primary:hover {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #5a6fd8, stop:1 #6a4190);
+}
+QPushButton#primary:pressed {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #4e5bc6, stop:1 #5e377e);
+}
+QPushButton#primary:disabled {
+    background: #cccccc;
+    color: #666666;
+}
+QPushButton#secondary {
+    background-color: #f8f9fa;
+    color: #495057;
+    border: 2px solid #e9ecef;
+    border-radius: 8px;
+    padding: 12px 24px;
+    font-weight: 600;
+    font-size: 14px;
+}
+QPushButton#secondary:hover {
+    background-color: #e9ecef;
+    border-color: #adb5bd;
+    color: #212529;
+}
+QPushButton#secondary:pressed {
+    background-color: #dee2e6;
+}
+QPushButton#secondary:disabled {
+    color: #6c757d;
+    border-color: #dee2e6;
+}
+QPushButton#success {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #56ab2f, stop:1 #a8e6cf);
+    color: white;
+    border: none;
+    border-radius: 8px;
+    padding: 12px 24px;
+    font-weight: 600;
+    font-size: 14px;
+}
+QPushButton#success:hover {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #4e9a2a, stop:1 #96d4b5);
+}
+
+/* 输入框 */
+ModernLineEdit {
+    border: 2px solid #e9ecef;
+    border-radius: 8px;
+    padding: 12px 16px;
+    background-color: white;
+    font-size: 14px;
+    selection-background-color: #cce0ff;
+}
+ModernLineEdit:focus {
+    border-color: #667eea;
+    background-color: #f8f9ff;
+}
+ModernLineEdit:hover {
+    border-color: #adb5bd;
+}
+ModernTextEdit {
+    border: 2px solid #e9ecef;
+    border-radius: 8px;
+    padding: 12px;
+    background-color: white;
+    font-size: 14px;
+    selection-background-color: #cce0ff;
+    line-height: 1.5;
+}
+ModernTextEdit:focus {
+    border-color: #667eea;
+    background-color: #f8f9ff;
+}
+ModernTextEdit:hover {
+    border-color: #adb5bd;
+}
+
+/* 进度条 */
+ModernProgressBar {
+    border: none;
+    border-radius: 6px;
+    background-color: #e9ecef;
+    height: 12px;
+    text-align: center;
+    color: #495057;
+    font-weight: 600;
+}
+ModernProgressBar::chunk {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #667eea, stop:1 #764ba2);
+    border-radius: 6px;
+}
+
+/* 日志显示 */
+StreamingDisplay {
+    border: 2px solid #e9ecef;
+    border-radius: 8px;
+    padding: 16px;
+    background-color: #f8f9fa;
+    font-family: 'Consolas', 'Monaco', monospace;
+    font-size: 13px;
+    line-height: 1.4;
+}
+
+/* 评分卡片 */
+EnhancedScoreCard {
+    border-radius: 12px;
+    border: none;
+}
+EnhancedScoreCard[band="excellent"] {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #56ab2f, stop:1 #a8e6cf);
+}
+EnhancedScoreCard[band="good"] {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #667eea, stop:1 #764ba2);
+}
+EnhancedScoreCard[band="fair"] {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #f093fb, stop:1 #f5576c);
+}
+EnhancedScoreCard[band="poor"] {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #ff4b2b, stop:1 #ff416c);
+}
+EnhancedScoreCard QLabel {
+    color: white;
+    background: transparent;
+}
+EnhancedScoreCard QLabel#card_title {
+    font-size: 12px;
+    font-weight: 600;
+}
+EnhancedScoreCard QLabel#card_score {
+    font-size: 24px;
+    font-weight: bold;
+}
+EnhancedScoreCard QLabel#card_max {
+    color: rgba(255,255,255,0.8);
+    font-size: 10px;
+}
+EnhancedScoreCard QLabel#card_info {
+    color: rgba(255,255,255,0.9);
+    font-size: 9px;
+}
+
+/* 数据质量指示器 */
+DataQualityIndicator {
+    background-color: rgba(255,255,255,0.9);
+    border-radius: 8px;
+    border: 1px solid #e9ecef;
+}
+DataQualityIndicator QLabel {
+    background: transparent;
+}
+DataQualityIndicator QLabel#indicator_value {
+    color: #2c3e50;
+    font-size: 16px;
+    font-weight: bold;
+}
+DataQualityIndicator QLabel#indicator_title {
+    color: #6c757d;
+    font-size: 10px;
+}
+/* 标题与说明文字 */
+QLabel#app_title {
+    color: #2c3e50;
+    font-size: 26px;
+    font-weight: bold;
+    background: transparent;
+}
+QLabel#version_label {
+    color: #6c757d;
+    font-size: 12px;
+    background: transparent;
+}
+QLabel#log_title {
+    color: #495057;
+    font-size: 16px;
+    font-weight: bold;
+    background: transparent;
+}
+QLabel#result_title {
+    color: #2c3e50;
+    font-size: 20px;
+    font-weight: bold;
+    background: transparent;
+}
+QLabel#quality_title {
+    color: #495057;
+    font-size: 14px;
+    font-weight: bold;
+    background: transparent;
+    margin-right: 20px;
+}
+QLabel#current_stock_label {
+    color: #6c757d;
+    font-size: 12px;
+    font-style: italic;
+    background: transparent;
+}
+
+/* 输入区标签页 */
+QTabWidget#input_tabs::pane {
+    border: none;
+    background-color: white;
+    border-radius: 8px;
+}
+QTabWidget#input_tabs QTabBar::tab {
+    background: #f8f9fa;
+    border: 1px solid #dee2e6;
+    padding: 12px 24px;
+    margin: 2px;
+    border-radius: 6px;
+    font-weight: 600;
+}
+QTabWidget#input_tabs QTabBar::tab:selected {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #667eea, stop:1 #764ba2);
+    color: white;
+    border-color: #667eea;
+}
+QTabWidget#input_tabs QTabBar::tab:hover {
+    background: #e9ecef;
+}
+
+/* 输入分组 */
+QGroupBox[role="input"] {
+    font-weight: bold;
+    font-size: 14px;
+    color: #495057;
+    border: 2px solid #e9ecef;
+    border-radius: 8px;
+    margin-top: 12px;
+    padding-top: 12px;
+}
+QGroupBox[role="input"]::title {
+    subcontrol-origin: margin;
+    left: 12px;
+    padding: 0 8px 0 8px;
+    background-color: white;
+}
+
+QCheckBox#enable_streaming_cb {
+    font-size: 14px;
+    color: #495057;
+    spacing: 8px;
+}
+QCheckBox#enable_streaming_cb::indicator {
+    width: 18px;
+    height: 18px;
+    border-radius: 3px;
+    border: 2px solid #adb5bd;
+}
+QCheckBox#enable_streaming_cb::indicator:checked {
+    background-color: #667eea;
+    border-color: #667eea;
+}
+
+/* 结果显示 */
+QTextBrowser#result_browser {
+    border: 2px solid #e9ecef;
+    border-radius: 12px;
+    padding: 20px;
+    background-color: white;
+    font-size: 14px;
+    line-height: 1.6;
+}
+""".strip()
+
+# 警告/错误对话框各自的样式表（常量只构造一次，每次弹框直接复用）
+WARNING_DIALOG_QSS = """
+QMessageBox {
+    background-color: white;
+    border-radius: 8px;
+}
+QMessageBox QLabel {
+    color: #2c3e50;
+    min-width: 200px;
+    font-size: 14px;
+}
+QPushButton {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #667eea, stop:1 #764ba2);
+    color: white;
+    border: none;
+    border-radius: 6px;
+    padding: 8px 16px;
+    min-width: 80px;
+    font-weight: 600;
+}
+QPushButton:hover {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #5a6fd8, stop:1 #6a4190);
+}
+""".strip()
+
+ERROR_DIALOG_QSS = """
+QMessageBox {
+    background-color: white;
+    border-radius: 8px;
+}
+QMessageBox QLabel {
+    color: #e74c3c;
+    min-width: 200px;
+    font-size: 14px;
+}
+QPushButton {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #e74c3c, stop:1 #c0392b);
+    color: white;
+    border: none;
+    border-radius: 6px;
+    padding: 8px 16px;
+    min-width: 80px;
+    font-weight: 600;
+}
+QPushButton:hover {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #c0392b, stop:1 #a93226);
+}
+""".strip()
+
+# 结果区富文本（QTextDocument）的CSS，不是QSS
+REPORT_CSS = """
+table.summary {
+    border-collapse: collapse;
+    margin: 8px 0;
+}
+table.summary th {
+    background-color: #f1f3f5;
+    color: #495057;
+    font-weight: 600;
+    padding: 6px 10px;
+    border: 1px solid #dee2e6;
+}
+table.summary td {
+    padding: 6px 10px;
+    border: 1px solid #dee2e6;
+}
+""".strip()
@@ -2,9 +2,11 @@
 配置管理器GUI - 可视化配置编辑器
 """
 
+import copy
 import sys
 import os
 import json
+import logging
 from typing import Dict, Any
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -12,9 +14,45 @@ from PyQt6.QtWidgets import (
     QGroupBox, QFormLayout, QSpinBox, QDoubleSpinBox, QCheckBox,
     QComboBox, QMessageBox, QScrollArea, QFrame, QGridLayout
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QColor, QPalette
 
+# 快速JSON格式化 - 可选；未安装时使用标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 保存配置后延迟写入文件的毫秒数，期间的多次保存合并为一次写入
+_SAVE_DEBOUNCE_MS = 2000
+# 状态栏提示的显示时长（毫秒）
+_STATUS_MESSAGE_MS = 5000
+
+logger = logging.getLogger(__name__)
+
+# 默认配置，只在模块加载时构建一次；需要修改时先深拷贝
+_DEFAULT_CONFIG = {
+    "api_keys": {"openai": "", "anthropic": "", "zhipu": ""},
+    "ai": {
+        "model_preference": "openai",
+        "models": {
+            "openai": "gpt-4o-mini",
+            "anthropic": "claude-3-haiku-20240307",
+            "zhipu": "chatglm_turbo"
+        },
+        "max_tokens": 4000,
+        "temperature": 0.7,
+        "api_base_urls": {"openai": "https://api.openai.com/v1"}
+    },
+    "analysis_weights": {"technical": 0.4, "fundamental": 0.4, "sentiment": 0.2},
+    "cache": {"price_hours": 1, "fundamental_hours": 6, "news_hours": 2},
+    "streaming": {"enabled": True, "show_thinking": True, "delay": 0.1},
+    "analysis_params": {"max_news_count": 100, "technical_period_days": 365},
+    "logging": {"level": "INFO", "file": "stock_analyzer.log"},
+    "data_sources": {"akshare_token": ""},
+    "ui": {"theme": "default", "language": "zh_CN"}
+}
+
 class ConfigManagerWindow(QMainWindow):
     """配置管理器主窗口"""
     
@@ -26,6 +64,16 @@ class ConfigManagerWindow(QMainWindow):
         self.config = {}
         self.widgets = {}  # 存储配置控件
         
+        # 保存时只记录待写入的配置快照，由定时器合并写入文件；退出程序前写入未保存的修改
+        self._pending_config = None
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_SAVE_DEBOUNCE_MS)
+        self._save_timer.timeout.connect(self.flush_config)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self._flush_on_quit)
+        
         self.init_ui()
         self.load_config()
         
@@ -474,28 +522,8 @@ class ConfigManagerWindow(QMainWindow):
             QMessageBox.warning(self, "警告", f"填充配置数据时出错: {e}")
     
     def get_default_config(self):
-        """获取默认配置"""
-        return {
-            "api_keys": {"openai": "", "anthropic": "", "zhipu": ""},
-            "ai": {
-                "model_preference": "openai",
-                "models": {
-                    "openai": "gpt-4o-mini",
-                    "anthropic": "claude-3-haiku-20240307",
-                    "zhipu": "chatglm_turbo"
-                },
-                "max_tokens": 4000,
-                "temperature": 0.7,
-                "api_base_urls": {"openai": "https://api.openai.com/v1"}
-            },
-            "analysis_weights": {"technical": 0.4, "fundamental": 0.4, "sentiment": 0.2},
-            "cache": {"price_hours": 1, "fundamental_hours": 6, "news_hours": 2},
-            "streaming": {"enabled": True, "show_thinking": True, "delay": 0.1},
-            "analysis_params": {"max_news_count": 100, "technical_period_days": 365},
-            "logging": {"level": "INFO", "file": "stock_analyzer.log"},
-            "data_sources": {"akshare_token": ""},
-            "ui": {"theme": "default", "language": "zh_CN"}
-        }
+        """获取默认配置（深拷贝，调用方可以随意修改）"""
+        return copy.deepcopy(_DEFAULT_CONFIG)
     
     def collect_config_from_widgets(self):
         """从控件收集配置数据"""
@@ -535,7 +563,8 @@ class ConfigManagerWindow(QMainWindow):
                 'sentiment': self.widgets['sentiment_weight'].value() / total_weight
             }
         else:
-            config['analysis_weights'] = {'technical': 0.4, 'fundamental': 0.4, 'sentiment': 0.2}
+            # 只读取扁平的默认权重，浅拷贝即可，不必深拷贝整份默认配置
+            config['analysis_weights'] = dict(_DEFAULT_CONFIG['analysis_weights'])
         
         # 缓存配置
         config['cache'] = {
@@ -577,23 +606,57 @@ class ConfigManagerWindow(QMainWindow):
         return config
     
     def save_config(self):
-        """保存配置到文件"""
+        """保存配置：立即更新界面，文件在 _SAVE_DEBOUNCE_MS 毫秒内写入（见 flush_config）"""
         try:
             config = self.collect_config_from_widgets()
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=4)
+            # 写入的是此刻保存的配置快照，之后重置等未保存的修改不会被写入文件
+            self._pending_config = config
+            if not self._save_timer.isActive():
+                self._save_timer.start()
             
             self.config = config
             self.update_config_preview()
             self.update_status()
-            
-            QMessageBox.information(self, "成功", "配置已保存成功！\n重启程序后生效。")
-            self.config_updated.emit()
+            self.statusBar().showMessage("💾 配置已保存，重启程序后生效", _STATUS_MESSAGE_MS)
             
         except Exception as e:
             QMessageBox.critical(self, "错误", f"保存配置失败: {e}")
     
+    def flush_config(self, shutting_down=False):
+        """把待写入的配置快照写入文件；先写临时文件再替换，写入中途崩溃也不会损坏原配置文件
+        
+        shutting_down 为True时（窗口关闭或程序退出）不弹出对话框，写入失败只记录日志
+        """
+        config = self._pending_config
+        if config is None:
+            return
+        self._save_timer.stop()
+        self._pending_config = None
+        try:
+            tmp_file = f"{self.config_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(config, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_file, self.config_file)
+        except Exception as e:
+            logger.error("写入配置文件失败 %s: %s", self.config_file, e)
+            if not shutting_down:
+                QMessageBox.critical(self, "错误", f"写入配置文件失败: {e}")
+            return
+        
+        # 文件写入后再通知，监听方重新读取时拿到的是新配置
+        if not shutting_down:
+            self.statusBar().showMessage(f"✅ 配置已写入 {self.config_file}", _STATUS_MESSAGE_MS)
+        self.config_updated.emit()
+    
+    def _flush_on_quit(self):
+        """程序退出前写入未保存的修改"""
+        self.flush_config(shutting_down=True)
+    
+    def closeEvent(self, event):
+        """关闭窗口前写入未保存的修改（作为其他窗口的子窗口打开时程序不会退出）"""
+        self.flush_config(shutting_down=True)
+        super().closeEvent(event)
+    
     def reset_to_default(self):
         """重置为默认配置"""
         reply = QMessageBox.question(self, "确认", "确定要重置为默认配置吗？\n当前配置将丢失。")
@@ -654,7 +717,11 @@ class ConfigManagerWindow(QMainWindow):
     def update_config_preview(self):
         """更新配置预览"""
         try:
-            config_text = json.dumps(self.config, ensure_ascii=False, indent=2)
+            # orjson在C层完成缩进格式化，输出UTF-8，中文不会被转义
+            if orjson is not None:
+                config_text = orjson.dumps(self.config, option=orjson.OPT_INDENT_2).decode('utf-8')
+            else:
+                config_text = json.dumps(self.config, ensure_ascii=False, indent=2)
             self.config_preview.setPlainText(config_text)
         except Exception as e:
             self.config_preview.setPlainText(f"预览失败: {e}")
@@ -15,6 +15,7 @@ import os
 import sys
 import math
 import numpy as np
+import pandas as pd
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
 from functools import wraps
@@ -23,6 +24,12 @@ import secrets
 import uuid
 from queue import Queue, Empty
 
+# orjson在C层一次完成遍历和序列化，未安装时使用标准库json（先清理数据再序列化）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 导入我们的分析器
 try:
     from enhanced_web_stock_analyzer import EnhancedWebStockAnalyzer
@@ -88,13 +95,12 @@ class SSEManager:
         with self.lock:
             if client_id in self.clients:
                 try:
-                    # 清理数据确保JSON可序列化
-                    cleaned_data = clean_data_for_json(data)
-                    message = {
+                    # 入队时即序列化为JSON字符串，之后数据再被修改也不影响已发送的消息
+                    message = dumps_json({
                         'event': event_type,
-                        'data': cleaned_data,
+                        'data': data,
                         'timestamp': datetime.now().isoformat()
-                    }
+                    })
                     self.clients[client_id].put(message, block=False)
                     return True
                 except Exception as e:
@@ -105,13 +111,12 @@ class SSEManager:
     def broadcast(self, event_type, data):
         """广播消息给所有客户端"""
         with self.lock:
-            # 清理数据确保JSON可序列化
-            cleaned_data = clean_data_for_json(data)
-            message = {
+            # 只序列化一次，所有客户端共用同一个JSON字符串
+            message = dumps_json({
                 'event': event_type,
-                'data': cleaned_data,
+                'data': data,
                 'timestamp': datetime.now().isoformat()
-            }
+            })
             
             dead_clients = []
             for client_id, queue in self.clients.items():
@@ -129,8 +134,7 @@ class SSEManager:
 sse_manager = SSEManager()
 
 def clean_data_for_json(obj):
-    """清理数据中的NaN、Infinity、日期等无效值，使其能够正确序列化为JSON"""
-    import pandas as pd
+    """清理数据中的NaN、Infinity、日期等无效值，使其能够正确序列化为JSON（未安装orjson时使用）"""
     from datetime import datetime, date, time
     
     if isinstance(obj, dict):
@@ -188,6 +192,57 @@ def clean_data_for_json(obj):
         except (TypeError, ValueError):
             return str(obj)
 
+# orjson选项：numpy数组/标量走内置快速路径，非字符串的字典键转为字符串
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+def _orjson_default(obj):
+    """orjson无法直接序列化的对象，与 clean_data_for_json 的处理一致
+
+    orjson本身会把float的NaN/Infinity输出为null，这里只需处理其他类型
+    """
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, np.generic):
+        value = obj.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
+    if hasattr(obj, 'isoformat'):  # pandas.Timestamp等日期时间子类
+        return obj.isoformat()
+    if hasattr(obj, 'to_dict'):  # DataFrame或Series
+        try:
+            return obj.to_dict()
+        except Exception:
+            return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+def dumps_json(obj):
+    """把分析数据序列化为JSON字符串，NaN/Infinity输出为null，numpy、pandas和日期对象自动转换"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTIONS).decode('utf-8')
+    return json.dumps(clean_data_for_json(obj), ensure_ascii=False)
+
+def _json_object_pairs_hook(pairs):
+    """解码时直接用键值对构建对象，键名驻留后重复出现的键共用同一个字符串"""
+    return {sys.intern(key): value for key, value in pairs}
+
+def _json_parse_constant(name):
+    """请求体中的 NaN / Infinity / -Infinity 解码为None，与响应中的处理一致"""
+    return None
+
+def parse_request_json():
+    """解析请求体JSON，在解码构建对象的同时完成转换，不再对结果做第二次遍历；请求体为空时返回空字典"""
+    body = request.get_data(cache=True)
+    if not body:
+        return {}
+    return json.loads(body, object_pairs_hook=_json_object_pairs_hook, parse_constant=_json_parse_constant)
+
+def json_response(payload, status=200):
+    """用 dumps_json 序列化的JSON响应，代替需要预先清理数据的 jsonify"""
+    return app.response_class(dumps_json(payload), status=status, mimetype='application/json')
+
 def check_auth_config():
     """检查鉴权配置"""
     if not analyzer:
@@ -2590,23 +2645,10 @@ def sse_stream():
             
             while True:
                 try:
-                    # 获取消息（带超时，防止长时间阻塞）
-                    message = client_queue.get(timeout=30)
+                    # 获取消息（带超时，防止长时间阻塞），消息入队时已序列化为JSON
+                    json_data = client_queue.get(timeout=30)
+                    yield f"data: {json_data}\n\n"
                     
-                    # 确保消息可以JSON序列化
-                    try:
-                        json_data = json.dumps(message, ensure_ascii=False)
-                        yield f"data: {json_data}\n\n"
-                    except (TypeError, ValueError) as e:
-                        logger.error(f"SSE消息序列化失败: {e}, 消息类型: {type(message)}")
-                        # 发送错误消息
-                        error_message = {
-                            'event': 'error',
-                            'data': {'error': f'消息序列化失败: {str(e)}'},
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        yield f"data: {json.dumps(error_message)}\n\n"
-                        
                 except Empty:
                     # 发送心跳
                     yield f"data: {json.dumps({'event': 'heartbeat', 'data': {'timestamp': datetime.now().isoformat()}})}\n\n"
@@ -2675,18 +2717,15 @@ class StreamingAnalyzer:
     
     def send_partial_result(self, data):
         """发送部分结果"""
-        cleaned_data = clean_data_for_json(data)
-        sse_manager.send_to_client(self.client_id, 'partial_result', cleaned_data)
+        sse_manager.send_to_client(self.client_id, 'partial_result', data)
     
     def send_final_result(self, result):
         """发送最终结果"""
-        cleaned_result = clean_data_for_json(result)
-        sse_manager.send_to_client(self.client_id, 'final_result', cleaned_result)
+        sse_manager.send_to_client(self.client_id, 'final_result', result)
     
     def send_batch_result(self, results):
         """发送批量结果"""
-        cleaned_results = clean_data_for_json(results)
-        sse_manager.send_to_client(self.client_id, 'batch_result', cleaned_results)
+        sse_manager.send_to_client(self.client_id, 'batch_result', results)
     
     def send_completion(self, message=None):
         """发送完成信号"""
@@ -2983,7 +3022,7 @@ def analyze_stock_stream():
                 'error': '分析器未初始化'
             }), 500
         
-        data = request.json
+        data = parse_request_json()
         stock_code = data.get('stock_code', '').strip()
         enable_streaming = data.get('enable_streaming', False)
         client_id = data.get('client_id')
@@ -3067,7 +3106,7 @@ def batch_analyze_stream():
                 'error': '分析器未初始化'
             }), 500
         
-        data = request.json
+        data = parse_request_json()
         stock_codes = data.get('stock_codes', [])
         client_id = data.get('client_id')
         
@@ -3172,7 +3211,7 @@ def analyze_stock():
                 'error': '分析器未初始化'
             }), 500
         
-        data = request.json
+        data = parse_request_json()
         stock_code = data.get('stock_code', '').strip()
         enable_streaming = data.get('enable_streaming', False)
         
@@ -3209,14 +3248,12 @@ def analyze_stock():
             # 执行分析
             report = analyzer.analyze_stock(stock_code, enable_streaming)
             
-            # 清理数据中的NaN值
-            cleaned_report = clean_data_for_json(report)
-            
             logger.info(f"全球股票分析完成: {stock_code} ({report.get('market', 'Unknown').upper()})")
             
-            return jsonify({
+            # NaN等无效值在序列化时直接转换，不再预先遍历清理
+            return json_response({
                 'success': True,
-                'data': cleaned_report,
+                'data': report,
                 'message': f'股票 {stock_code} 全球分析完成'
             })
             
@@ -3245,7 +3282,7 @@ def batch_analyze():
                 'error': '分析器未初始化'
             }), 500
         
-        data = request.json
+        data = parse_request_json()
         stock_codes = data.get('stock_codes', [])
         
         if not stock_codes:
@@ -3301,9 +3338,6 @@ def batch_analyze():
                 failed_stocks.append(stock_code)
                 logger.error(f"❌ {stock_code} 分析失败: {e}")
         
-        # 清理数据中的NaN值
-        cleaned_results = clean_data_for_json(results)
-        
         success_count = len(results)
         total_count = len(stock_codes)
         
@@ -3317,7 +3351,7 @@ def batch_analyze():
         
         response_data = {
             'success': True,
-            'data': cleaned_results,
+            'data': results,
             'message': f'全球批量分析完成，成功分析 {success_count}/{total_count} 只股票',
             'market_distribution': market_distribution,
             'success_by_market': success_by_market
@@ -3327,7 +3361,8 @@ def batch_analyze():
             response_data['failed_stocks'] = failed_stocks
             response_data['message'] += f'，失败股票: {", ".join(failed_stocks)}'
         
-        return jsonify(response_data)
+        # NaN等无效值在序列化时直接转换，不再预先遍历清理
+        return json_response(response_data)
         
     except Exception as e:
         logger.error(f"全球批量分析失败: {e}")
@@ -3455,7 +3490,7 @@ def validate_stock():
                 'error': '分析器未初始化'
             }), 500
         
-        data = request.json
+        data = parse_request_json()
         stock_code = data.get('stock_code', '').strip()
         
         if not stock_code: